@@ -0,0 +1,117 @@
+"""Benchmark of the size, consumed capacity and CPU per item of storing a large document compressed
+
+Run with the serialization package to benchmark selected like the tests::
+
+    SERIALIZATION_PKG=marshmallow python benchmarks/compression.py
+
+The same document is stored in a plain ``Dict`` field, which becomes a dynamo map, and in ``Compressed`` fields with
+each of the registered codecs.  The size and capacity units of the item are from ``Model.estimate``, see
+:mod:`dynamorm.capacity`.
+
+"load" only loads the item, leaving the document compressed until it's accessed, while "load + access" also reads the
+document like application code would.
+"""
+
+import os
+import random
+import timeit
+
+from dynamorm import DynaModel
+from dynamorm.types.compression import CODECS
+
+if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+    from marshmallow import fields
+    from dynamorm.types._marshmallow import Compressed
+
+    def plain_field():
+        return fields.Dict()
+
+    def compressed_field(codec):
+        return Compressed(fields.Dict(), codec=codec)
+
+    id_field = fields.String
+
+else:
+    from schematics import types
+    from dynamorm.types._schematics import CompressedType
+
+    def plain_field():
+        return types.DictType(types.BaseType)
+
+    def compressed_field(codec):
+        return CompressedType(types.DictType(types.BaseType), codec=codec)
+
+    id_field = types.StringType
+
+
+def make_model(name, field):
+    class Schema:
+        pass
+
+    Schema.id = id_field(required=True)
+    Schema.document = field
+
+    class Table:
+        hash_key = "id"
+        read = 1
+        write = 1
+
+    Table.name = name
+    return type(name, (DynaModel,), {"Table": Table, "Schema": Schema})
+
+
+random.seed(1)
+DOCUMENT = {
+    "events": [
+        {
+            "type": random.choice(["click", "view", "purchase"]),
+            "page": "/products/{0}".format(random.randint(1, 50)),
+            "count": random.randint(1, 100),
+            "tags": random.sample(["new", "sale", "featured", "popular", "limited"], 2),
+        }
+        for _ in range(150)
+    ]
+}
+MODELS = [("plain", make_model("Plain", plain_field()))] + [
+    (name, make_model(name.title(), compressed_field(name))) for name in sorted(CODECS)
+]
+
+
+def bench(func, number=200):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    return seconds / number * 1e6
+
+
+if __name__ == "__main__":
+    print(
+        "{0:<8} {1:>9} {2:>5} {3:>5} {4:>9} {5:>12} {6:>12} {7:>14}".format(
+            "field",
+            "bytes",
+            "WCU",
+            "RCU",
+            "RCU (ev)",
+            "dump us",
+            "load us",
+            "load+access us",
+        )
+    )
+    for name, model in MODELS:
+        item = model.Schema.dynamorm_dump({"id": "one", "document": DOCUMENT})
+        estimate = model.estimate({"id": "one", "document": DOCUMENT})
+
+        print(
+            "{0:<8} {1:>9} {2:>5} {3:>5} {4:>9} {5:>12.1f} {6:>12.1f} {7:>14.1f}".format(
+                name,
+                estimate.size,
+                estimate.write_units,
+                estimate.read_units,
+                estimate.eventual_read_units,
+                bench(
+                    lambda: model.Schema.dynamorm_dump(
+                        {"id": "one", "document": DOCUMENT}
+                    )
+                ),
+                bench(lambda: model.new_from_raw(item)),
+                bench(lambda: model.new_from_raw(item).document),
+            )
+        )
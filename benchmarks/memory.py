@@ -0,0 +1,103 @@
+"""Benchmark of the memory used by a large result set of small models, with and without ``dynamorm_compact``
+
+Run with the serialization package to benchmark selected like the tests::
+
+    SERIALIZATION_PKG=marshmallow python benchmarks/memory.py [count]
+
+A page of raw items, like the ones a query returns, is loaded through ``new_from_raw_page`` and the memory that the
+resulting instances hold on to is measured with :mod:`tracemalloc`.  The raw items themselves are allocated before the
+measurement starts, so only what the instances add on top of the data is counted.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+from dynamorm import DynaModel
+
+if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+    from marshmallow import fields
+
+    string_field = fields.String
+    number_field = fields.Integer
+    bool_field = fields.Boolean
+
+else:
+    from schematics import types
+
+    string_field = types.StringType
+    number_field = types.IntType
+    bool_field = types.BooleanType
+
+
+def make_model(name, compact):
+    class Schema:
+        pass
+
+    Schema.id = string_field(required=True)
+    Schema.name = string_field()
+    Schema.count = number_field()
+    Schema.active = bool_field()
+
+    class Table:
+        hash_key = "id"
+        read = 1
+        write = 1
+
+    Table.name = name
+    return type(
+        name,
+        (DynaModel,),
+        {"Table": Table, "Schema": Schema, "dynamorm_compact": compact},
+    )
+
+
+MODELS = [
+    ("regular", make_model("Regular", False)),
+    ("compact", make_model("Compact", True)),
+]
+
+
+def measure(model, raws, trusted):
+    tracemalloc.start()
+    start = time.time()
+    instances = model.new_from_raw_page(raws, trusted=trusted)
+    seconds = time.time() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(instances) == len(raws)
+    return size, seconds
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    raws = [
+        {
+            "id": "item-{0}".format(i),
+            "name": "name {0}".format(i),
+            "count": Decimal(i),
+            "active": i % 2 == 0,
+        }
+        for i in range(count)
+    ]
+
+    print("{0} items".format(count))
+    print(
+        "{0:<8} {1:<10} {2:>10} {3:>14} {4:>10}".format(
+            "model", "load", "MB", "bytes/item", "seconds"
+        )
+    )
+    for name, model in MODELS:
+        for trusted in (False, True):
+            size, seconds = measure(model, raws, trusted)
+            print(
+                "{0:<8} {1:<10} {2:>10.1f} {3:>14.0f} {4:>10.2f}".format(
+                    name,
+                    "trusted" if trusted else "validated",
+                    size / 1024.0 / 1024.0,
+                    size / float(count),
+                    seconds,
+                )
+            )
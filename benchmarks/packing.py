@@ -0,0 +1,127 @@
+"""Benchmark of the size and serialization time of a nested configuration document stored packed with MessagePack
+
+Run with the serialization package to benchmark selected like the tests::
+
+    SERIALIZATION_PKG=marshmallow python benchmarks/packing.py
+
+The same document is stored in a plain ``Dict`` field, which becomes nested dynamo maps & lists, as JSON in a
+``Compressed`` field that doesn't compress, and in ``Packed`` fields with & without compression.  The packed fields
+use the ``msgpack`` package when it's installed and the pure python fallback otherwise, which is reported in the first
+line.
+
+"dump" is the time to dump the item and convert it to the wire format with boto3's ``TypeSerializer``, "load" the time
+to convert it back with ``TypeDeserializer``, load it and access the document.
+"""
+
+import os
+import random
+import timeit
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from dynamorm import DynaModel
+from dynamorm.types import packing
+
+if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+    from marshmallow import fields
+    from dynamorm.types._marshmallow import Compressed, Packed
+
+    FIELDS = [
+        ("plain", lambda: fields.Dict()),
+        ("json", lambda: Compressed(fields.Dict(), codec="none")),
+        ("packed", lambda: Packed(fields.Dict())),
+        ("packed+zlib", lambda: Packed(fields.Dict(), codec="zlib")),
+    ]
+    id_field = fields.String
+
+else:
+    from schematics import types
+    from dynamorm.types._schematics import CompressedType, PackedType
+
+    FIELDS = [
+        ("plain", lambda: types.DictType(types.BaseType)),
+        ("json", lambda: CompressedType(types.DictType(types.BaseType), codec="none")),
+        ("packed", lambda: PackedType(types.DictType(types.BaseType))),
+        (
+            "packed+zlib",
+            lambda: PackedType(types.DictType(types.BaseType), codec="zlib"),
+        ),
+    ]
+    id_field = types.StringType
+
+
+def make_model(name, field):
+    class Schema:
+        pass
+
+    Schema.id = id_field(required=True)
+    Schema.config = field
+
+    class Table:
+        hash_key = "id"
+        read = 1
+        write = 1
+
+    Table.name = name
+    return type(name, (DynaModel,), {"Table": Table, "Schema": Schema})
+
+
+random.seed(1)
+CONFIG = {
+    "services": {
+        "service{0}".format(i): {
+            "replicas": random.randint(1, 10),
+            "enabled": random.choice([True, False]),
+            "env": {"KEY_{0}".format(j): str(random.random()) for j in range(5)},
+            "ports": [{"port": 8000 + j, "protocol": "tcp"} for j in range(3)],
+            "limits": {"cpu": random.randint(1, 4), "memory": random.randint(1, 16)},
+        }
+        for i in range(40)
+    }
+}
+MODELS = [
+    (name, make_model(name.title().replace("+", ""), field())) for name, field in FIELDS
+]
+
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+
+def to_wire(item):
+    return dict((name, serializer.serialize(value)) for name, value in item.items())
+
+
+def from_wire(item):
+    return dict((name, deserializer.deserialize(value)) for name, value in item.items())
+
+
+def bench(func, number=100):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    return seconds / number * 1e6
+
+
+if __name__ == "__main__":
+    print(
+        "msgpack: {0}".format(
+            "installed" if packing.msgpack else "pure python fallback"
+        )
+    )
+    print(
+        "{0:<12} {1:>9} {2:>5} {3:>12} {4:>12}".format(
+            "field", "bytes", "WCU", "dump us", "load us"
+        )
+    )
+    for name, model in MODELS:
+        data = {"id": "one", "config": CONFIG}
+        wire = to_wire(model.Schema.dynamorm_dump(data))
+        estimate = model.estimate(data)
+
+        print(
+            "{0:<12} {1:>9} {2:>5} {3:>12.1f} {4:>12.1f}".format(
+                name,
+                estimate.size,
+                estimate.write_units,
+                bench(lambda: to_wire(model.Schema.dynamorm_dump(data))),
+                bench(lambda: model.new_from_raw(from_wire(wire)).config),
+            )
+        )
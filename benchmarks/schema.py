@@ -0,0 +1,176 @@
+"""Microbenchmark of the schema work done by ``Model.get`` key checking, ``to_dict`` and loading items
+
+Run with the serialization package to benchmark selected like the tests::
+
+    SERIALIZATION_PKG=marshmallow python benchmarks/schema.py
+
+For marshmallow the "uncached" numbers build a new schema instance for every call, which is what DynamORM did before
+schema instances and fields were cached.
+
+The "generic" numbers validate through the serialization library, while the "generated" numbers use the load & dump
+functions generated for the schema by the model metaclass.  Schematics schemas with compound fields, like the ``tags``
+of ``Thing``, are left to the library so ``Flat`` shows the difference for schematics.  ``Simple`` is ``Flat`` with
+the lightweight :mod:`dynamorm.types.simple` backend, which is the same whichever package is selected.
+"""
+
+import os
+import timeit
+from decimal import Decimal
+
+from dynamorm import DynaModel
+from dynamorm.types.simple import Field
+
+if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+    from marshmallow import fields
+
+    class Thing(DynaModel):
+        class Table:
+            name = "things"
+            hash_key = "id"
+            range_key = "created"
+            read = 1
+            write = 1
+
+        class Schema:
+            id = fields.String(required=True)
+            created = fields.Integer(required=True)
+            name = fields.String()
+            count = fields.Integer()
+            tags = fields.List(fields.String())
+
+    class Flat(DynaModel):
+        class Table:
+            name = "flat"
+            hash_key = "id"
+            range_key = "created"
+            read = 1
+            write = 1
+
+        class Schema:
+            id = fields.String(required=True)
+            created = fields.Integer(required=True)
+            name = fields.String()
+            count = fields.Integer()
+            score = fields.Float()
+            active = fields.Boolean()
+
+    def uncached_fields():
+        return Thing.Schema().fields
+
+    def uncached_dump(obj):
+        return Thing.Schema(unknown="EXCLUDE").dump(obj)
+
+else:
+    from schematics import types
+
+    class Thing(DynaModel):
+        class Table:
+            name = "things"
+            hash_key = "id"
+            range_key = "created"
+            read = 1
+            write = 1
+
+        class Schema:
+            id = types.StringType(required=True)
+            created = types.IntType(required=True)
+            name = types.StringType()
+            count = types.IntType()
+            tags = types.ListType(types.StringType())
+
+    class Flat(DynaModel):
+        class Table:
+            name = "flat"
+            hash_key = "id"
+            range_key = "created"
+            read = 1
+            write = 1
+
+        class Schema:
+            id = types.StringType(required=True)
+            created = types.IntType(required=True)
+            name = types.StringType()
+            count = types.IntType()
+            score = types.FloatType()
+            active = types.BooleanType()
+
+    def uncached_fields():
+        return Thing.Schema.fields
+
+    def uncached_dump(obj):
+        return Thing.Schema(obj, strict=False, validate=True).to_primitive()
+
+
+class Simple(DynaModel):
+    class Table:
+        name = "simple"
+        hash_key = "id"
+        range_key = "created"
+        read = 1
+        write = 1
+
+    class Schema:
+        id = Field(str, required=True)
+        created = Field(int, required=True)
+        name = Field(str)
+        count = Field(int)
+        score = Field(float)
+        active = Field(bool)
+
+
+def check_keys():
+    """The key checking done by ``DynamoTable3.get``"""
+    key = Thing._normalize_keys_in_kwargs({"id": "one", "created": 1})
+    for name in key:
+        assert name in Thing.Schema.dynamorm_fields()
+
+
+def check_keys_uncached():
+    key = Thing._normalize_keys_in_kwargs({"id": "one", "created": 1})
+    for name in key:
+        assert name in uncached_fields()
+
+
+ITEM = {"id": "one", "created": 1, "name": "thing", "count": 10, "tags": ["a", "b"]}
+THING = Thing(**ITEM)
+
+# items read from dynamo have Decimal numbers
+RAW = dict(ITEM, created=Decimal(1), count=Decimal(10))
+
+FLAT = {
+    "id": "one",
+    "created": 1,
+    "name": "flat",
+    "count": 10,
+    "score": 0.5,
+    "active": True,
+}
+FLAT_RAW = dict(FLAT, created=Decimal(1), count=Decimal(10), score=Decimal("0.5"))
+
+
+def bench(name, func, number=5000):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    print("{0:<24} {1:8.1f} us/call".format(name, seconds / number * 1e6))
+
+
+if __name__ == "__main__":
+    bench("get keys (uncached)", check_keys_uncached)
+    bench("get keys", check_keys)
+    bench("to_dict (uncached)", lambda: uncached_dump(ITEM))
+    bench("to_dict", THING.to_dict)
+    bench("load (validated)", lambda: Thing.new_from_raw(RAW))
+    bench("load (trusted)", lambda: Thing.new_from_raw(RAW, trusted=True))
+
+    for model, item, raw in ((Thing, ITEM, RAW), (Flat, FLAT, FLAT_RAW)):
+        schema = model.Schema
+        name = model.__name__
+        bench(
+            "{0} load (generic)".format(name),
+            lambda: schema.dynamorm_validate(raw, native=True),
+        )
+        bench("{0} load (generated)".format(name), lambda: schema.dynamorm_load(raw))
+        bench("{0} dump (generic)".format(name), lambda: schema.dynamorm_validate(item))
+        bench("{0} dump (generated)".format(name), lambda: schema.dynamorm_dump(item))
+
+    bench("Simple load", lambda: Simple.Schema.dynamorm_load(FLAT_RAW))
+    bench("Simple dump", lambda: Simple.Schema.dynamorm_dump(FLAT))
@@ -6,6 +6,7 @@
 
 """
 from .model import DynaModel  # noqa
+from .batch import batch_get, batch_write, write_buffer  # noqa
 from .indexes import (
     GlobalIndex,
     LocalIndex,
@@ -14,4 +15,6 @@ from .indexes import (
     ProjectInclude,
 )  # noqa
 from .relationships import ManyToOne, OneToMany, OneToOne  # noqa
+from .session import Session  # noqa
 from .table import Q  # noqa
+from .transactions import transact_get, transaction  # noqa
@@ -0,0 +1,97 @@
+"""Command line tools for DynamORM, run ``python -m dynamorm --help`` for the details"""
+
+import argparse
+import logging
+import sys
+
+from .importer import FORMATS, import_file, load_model
+
+
+def print_progress(stats):
+    sys.stderr.write(
+        "written={0} rejected={1} retried={2} elapsed={3:.1f}s items_per_second={4:.1f}\n".format(
+            stats.written,
+            stats.failed_validation,
+            stats.retried,
+            stats.elapsed,
+            stats.items_per_second,
+        )
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m dynamorm")
+    subparsers = parser.add_subparsers(dest="command")
+
+    parser_import = subparsers.add_parser(
+        "import",
+        help="Import items into a model's table from a NDJSON or CSV file",
+        description="Import items into a model's table from a NDJSON or CSV file.  Exits with a status of 1 when any "
+        "rows were rejected.",
+    )
+    parser_import.add_argument(
+        "model", help="The model to import into, as module:Model"
+    )
+    parser_import.add_argument("path", help="The file to import, or - for stdin")
+    parser_import.add_argument(
+        "--format", choices=FORMATS, help="Guessed from the file extension by default"
+    )
+    parser_import.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="The number of batch write requests to keep in flight",
+    )
+    parser_import.add_argument(
+        "--processes",
+        type=int,
+        help="The number of processes to validate rows in, defaults to the number of CPUs",
+    )
+    parser_import.add_argument(
+        "--chunk-size",
+        type=int,
+        default=500,
+        help="The number of rows sent to a process at a time",
+    )
+    parser_import.add_argument(
+        "--rate-limit",
+        type=float,
+        help="The fraction of the table's provisioned write capacity to use",
+    )
+    parser_import.add_argument(
+        "--rejects", help="A file to write rows that fail to parse or validate to"
+    )
+    parser_import.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        help="How often, in seconds, to report progress",
+    )
+    parser_import.add_argument(
+        "--quiet", action="store_true", help="Don't report progress"
+    )
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    logging.basicConfig(level=logging.WARNING)
+
+    stats = import_file(
+        load_model(args.model),
+        args.path,
+        format=args.format,
+        concurrency=args.concurrency,
+        processes=args.processes,
+        chunk_size=args.chunk_size,
+        rejects_path=args.rejects,
+        rate_limit=args.rate_limit,
+        progress=None if args.quiet else print_progress,
+        progress_interval=args.progress_interval,
+    )
+    return 1 if stats.failed_validation else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
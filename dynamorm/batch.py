@@ -0,0 +1,694 @@
+"""Batch operations let you work with items from more than one model in as few round trips as possible.
+
+DynamoDB's ``BatchGetItem`` operation accepts keys for many tables in a single request.  :func:`batch_get` exposes that
+so that you can load everything a page needs at once:
+
+.. code-block:: python
+
+    from dynamorm import batch_get
+
+    results = batch_get({
+        User: [{"name": "alice"}, {"name": "bob"}],
+        Thread: [{"forum_name": "general", "subject": "Hello"}],
+    })
+
+    users = results[User]
+    threads = results[Thread]
+
+Similarly, ``BatchWriteItem`` accepts puts and deletes for many tables in a single request.  :func:`batch_write` provides
+a unit-of-work style context that collects writes for any model and sends them together when the context exits:
+
+.. code-block:: python
+
+    from dynamorm import batch_write
+
+    with batch_write() as batch:
+        batch.put(thread)
+        batch.put(Reply, {"forum_thread": "general\\nHello", "created": "2020-01-01", "user_name": "alice"})
+        batch.delete(old_reply)
+
+When the same items are saved over and over again in a short time, for example from event handlers, a
+:func:`write_buffer` holds on to the ``put`` & ``save`` calls of every model in the current thread for a short while,
+collapses repeated writes to the same key and sends the survivors in batches:
+
+.. code-block:: python
+
+    from dynamorm import write_buffer
+
+    with write_buffer(max_delay=0.5):
+        for event in events:
+            counter = Counter.get(name=event.name)
+            counter.total += event.value
+            counter.save()
+"""
+
+import logging
+import threading
+import time
+from collections import deque, OrderedDict
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+
+import six
+
+from .exceptions import InvalidSchemaField
+from .table import remove_nones
+
+log = logging.getLogger(__name__)
+
+#: The maximum number of keys DynamoDB accepts in a single BatchGetItem request
+BATCH_GET_LIMIT = 100
+
+#: The maximum number of put or delete requests DynamoDB accepts in a single BatchWriteItem request
+BATCH_WRITE_LIMIT = 25
+
+
+def resource_group_key(table):
+    """Return a hashable value that is equal for tables that share the same boto3 resource configuration
+
+    Batch requests can only span tables that live behind the same resource, so we group models by this value before
+    packing their keys into requests.
+    """
+    return (
+        repr(sorted(six.iteritems(table.session_kwargs or {}))),
+        repr(sorted(six.iteritems(table.resource_kwargs or {}))),
+    )
+
+
+def hashable_key(key):
+    """Return a hashable representation of a key dict, used to de-duplicate keys"""
+    return tuple(sorted(six.iteritems(key)))
+
+
+class Backoff(object):
+    """Exponential backoff used when DynamoDB hands back unprocessed keys or items
+
+    :param float initial: The first delay, in seconds
+    :param float maximum: The longest we will ever sleep, in seconds
+    """
+
+    def __init__(self, initial=0.05, maximum=5.0):
+        self.initial = initial
+        self.maximum = maximum
+        self.delay = None
+
+    def reset(self):
+        self.delay = None
+
+    def sleep(self):
+        if self.delay is None:
+            self.delay = self.initial
+        else:
+            self.delay = min(self.maximum, self.delay * 2)
+        log.debug("Backing off for %.2f seconds", self.delay)
+        time.sleep(self.delay)
+
+
+def acquire_capacity(mode, operation, tables, request_items):
+    """Wait for capacity on any of the rate limited tables in a batch request
+
+    :param dict tables: A mapping of table names to :class:`~dynamorm.table.DynamoTable3` objects
+    :param dict request_items: The RequestItems of the batch request
+    :returns: A dict of table names to the (estimated units, count) taken for each rate limited table
+    """
+    limited = {}
+    for table_name, requests in six.iteritems(request_items):
+        table = tables[table_name]
+        if table.rate_limiter is not None:
+            count = len(requests["Keys"]) if mode == "read" else len(requests)
+            estimated = table.rate_limiter.acquire(mode, operation, count=count)
+            limited[table_name] = (estimated, count)
+    return limited
+
+
+def record_capacity(mode, operation, tables, limited, response):
+    """Correct the rate limiters of the tables in a batch request based on the capacity they consumed"""
+    for consumed in response.get("ConsumedCapacity") or []:
+        try:
+            estimated, count = limited[consumed["TableName"]]
+        except KeyError:
+            continue
+        tables[consumed["TableName"]].rate_limiter.record(
+            mode, operation, estimated, consumed, count=count
+        )
+
+
+def batch_get(models_keys, consistent=False):
+    """Get items from one or more models, packing the keys from all models into shared ``BatchGetItem`` requests.
+
+    .. code-block:: python
+
+        results = batch_get({User: [{"name": "alice"}], Forum: [{"name": "general"}]})
+        for user in results[User]:
+            ...
+
+    Keys are normalized through each model's Schema, just like :meth:`~dynamorm.model.DynaModel.get_batch`, and
+    duplicate keys are only requested once.  Keys that DynamoDB reports as unprocessed are retried with an exponential
+    backoff.
+
+    :param dict models_keys: A mapping of model classes to an iterable of key dicts
+    :param bool consistent: If set to True the reads will be consistent
+    :returns: A dict of model classes to a list of model instances.  The items are not in any particular order and keys
+              that do not exist in the table are simply missing from the results.
+    """
+    results = OrderedDict((model, []) for model in models_keys)
+
+    # models are grouped by their resource, as a single request cannot span multiple resources
+    groups = OrderedDict()
+    for model, keys in six.iteritems(models_keys):
+        pending = deque()
+        seen = set()
+        for key in keys:
+            key = model._normalize_keys_in_kwargs(dict(key))
+            for k in key:
+                if k not in model.Schema.dynamorm_fields():
+                    raise InvalidSchemaField(
+                        "{0} does not exist in the schema fields".format(k)
+                    )
+
+            if hashable_key(key) in seen:
+                continue
+            seen.add(hashable_key(key))
+            pending.append(key)
+
+        groups.setdefault(resource_group_key(model.Table), []).append((model, pending))
+
+    for group in six.itervalues(groups):
+        resource = group[0][0].Table.resource
+        backoff = Backoff()
+
+        while any(pending for _, pending in group):
+            # Fill up a request with keys from as many models as we can.  Each table may only appear once per request,
+            # so if two models share a table the second one waits for the next request.
+            request_items = {}
+            request_models = {}
+            count = 0
+            for model, pending in group:
+                if count >= BATCH_GET_LIMIT:
+                    break
+                if not pending or model.Table.name in request_items:
+                    continue
+
+                keys = []
+                while pending and count < BATCH_GET_LIMIT:
+                    keys.append(pending.popleft())
+                    count += 1
+
+                request_items[model.Table.name] = {"Keys": keys}
+                if consistent:
+                    request_items[model.Table.name]["ConsistentRead"] = True
+                request_models[model.Table.name] = (model, pending)
+
+            tables = dict(
+                (table_name, model.Table)
+                for table_name, (model, _) in six.iteritems(request_models)
+            )
+            limited = acquire_capacity("read", "batch_get", tables, request_items)
+            request = {"RequestItems": request_items}
+            if limited:
+                request["ReturnConsumedCapacity"] = "INDEXES"
+
+            response = resource.batch_get_item(**request)
+            record_capacity("read", "batch_get", tables, limited, response)
+
+            for table_name, items in six.iteritems(response["Responses"]):
+                model = request_models[table_name][0]
+                results[model].extend(model.new_from_raw(item) for item in items)
+
+            unprocessed = response.get("UnprocessedKeys") or {}
+            for table_name, unprocessed_request in six.iteritems(unprocessed):
+                pending = request_models[table_name][1]
+                pending.extendleft(reversed(unprocessed_request["Keys"]))
+
+            if unprocessed:
+                backoff.sleep()
+            else:
+                backoff.reset()
+
+    return dict(results)
+
+
+def batch_write(concurrency=None):
+    """Return a :class:`BatchWriter` to be used as a context manager
+
+    .. code-block:: python
+
+        with batch_write() as batch:
+            batch.put(thread)
+            batch.delete(reply)
+
+    :param int concurrency: When supplied a :class:`ParallelBatchWriter` that keeps up to this many requests in flight
+                            is returned instead
+    """
+    if concurrency:
+        return ParallelBatchWriter(concurrency=concurrency)
+    return BatchWriter()
+
+
+def write_buffer(max_delay=1.0):
+    """Return a :class:`WriteBuffer` to be used as a context manager
+
+    .. code-block:: python
+
+        with write_buffer(max_delay=0.5) as buffer:
+            thing.save()
+            Thing.put({"id": "other"})
+
+    :param float max_delay: The longest, in seconds, that a write is held before it is sent
+    """
+    return WriteBuffer(max_delay=max_delay)
+
+
+_local = threading.local()
+
+
+def active_write_buffer():
+    """Return the :class:`WriteBuffer` that ``put`` & ``save`` calls in the current thread are going to, or None"""
+    try:
+        return _local.buffers[-1]
+    except (AttributeError, IndexError):
+        return None
+
+
+def count_requests(request_items):
+    """Return the number of put & delete requests in a BatchWriteItem RequestItems dict"""
+    return sum(len(requests) for requests in six.itervalues(request_items))
+
+
+class BatchStats(object):
+    """Counters describing the work done by a :class:`BatchWriter`
+
+    They are updated from the threads of a :class:`ParallelBatchWriter`, so updates go through :meth:`record`.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.written = 0
+        self.requests = 0
+        self.retried = 0
+        self.failed_validation = 0
+        self.coalesced = 0
+        self.started = time.time()
+        self.finished = None
+
+    def __repr__(self):
+        template = (
+            "{0}(written={1}, requests={2}, retried={3}, failed_validation={4}, coalesced={5}, "
+            "items_per_second={6:.1f})"
+        )
+        return template.format(
+            self.__class__.__name__,
+            self.written,
+            self.requests,
+            self.retried,
+            self.failed_validation,
+            self.coalesced,
+            self.items_per_second,
+        )
+
+    def record(
+        self, written=0, requests=0, retried=0, failed_validation=0, coalesced=0
+    ):
+        with self.lock:
+            self.written += written
+            self.requests += requests
+            self.retried += retried
+            self.failed_validation += failed_validation
+            self.coalesced += coalesced
+
+    def finish(self):
+        self.finished = time.time()
+
+    @property
+    def elapsed(self):
+        """The number of seconds the writer has been (or was) running"""
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def items_per_second(self):
+        try:
+            return self.written / self.elapsed
+        except ZeroDivisionError:
+            return 0.0
+
+
+class BatchWriter(object):
+    """Collects puts and deletes for any number of models and sends them in shared ``BatchWriteItem`` requests.
+
+    Items are validated through each model's Schema as they are added.  Once enough writes have been collected to fill
+    a request they are sent, and any remaining writes are sent when the context exits (or :meth:`flush` is called).  If
+    the context exits because of an exception the writes that have not been sent yet are discarded.
+
+    Writes to the same key are de-duplicated before being sent, with the most recent write winning, since DynamoDB
+    rejects requests that operate on the same key more than once.
+
+    Note that like ``BatchWriteItem`` itself this is not a transaction, writes that have already been sent are not
+    rolled back if a later write fails.
+
+    The ``stats`` attribute is a :class:`BatchStats` object with counters about the writes that have been sent.
+    """
+
+    def __init__(self):
+        self.pending = OrderedDict()
+        self.clients = {}
+        self.tables = {}
+        self.stats = BatchStats()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.pending.clear()
+        self.stats.finish()
+        log.debug("%s finished: %s", self.__class__.__name__, self.stats)
+
+    @staticmethod
+    def _model_and_item(model_or_instance, item):
+        """Given either an instance, or a model class and a dict, return the model class and the validated dict"""
+        if item is None:
+            return model_or_instance.__class__, model_or_instance.to_dict()
+        return model_or_instance, model_or_instance.Schema.dynamorm_dump(item)
+
+    @staticmethod
+    def _model_and_key(model_or_instance, key):
+        """Given either an instance, or a model class and a key dict, return the model class and the normalized key"""
+        if key is None:
+            key = {}
+            model_or_instance._add_hash_key_values(key)
+            model_or_instance = model_or_instance.__class__
+        return model_or_instance, model_or_instance._normalize_keys_in_kwargs(dict(key))
+
+    def put(self, model_or_instance, item=None, validate=True):
+        """Add a put request
+
+        :param model_or_instance: Either a model instance, or a model class when supplying ``item``
+        :param dict item: The item to put, when a model class is supplied as the first argument
+        :param bool validate: Set to False when the item has already been through ``Schema.dynamorm_validate``
+        """
+        if validate:
+            model, item = self._model_and_item(model_or_instance, item)
+        else:
+            model = model_or_instance
+        item = remove_nones(item)
+        key = dict(
+            (name, item.get(name))
+            for name in (model.Table.hash_key, model.Table.range_key)
+            if name
+        )
+        if model.Table.shard_items and model.Table.should_shard(item):
+            # sharded items are written in their own transaction right away, which replaces any earlier write to the
+            # same key that is still pending
+            self._discard(model, key)
+            model.Table.put(item)
+            return
+        self._add(model, key, {"PutRequest": {"Item": item}})
+
+    def delete(self, model_or_instance, key=None):
+        """Add a delete request
+
+        :param model_or_instance: Either a model instance, or a model class when supplying ``key``
+        :param dict key: The hash key, and range key if used, when a model class is supplied as the first argument
+        """
+        model, key = self._model_and_key(model_or_instance, key)
+        self._add(model, key, {"DeleteRequest": {"Key": key}})
+
+    def _add(self, model, key, request):
+        self.tables[model.Table.name] = model.Table
+        group = resource_group_key(model.Table)
+        pending = self.pending.setdefault(group, (model, OrderedDict()))[1]
+
+        # later writes to the same key replace earlier ones
+        pending_key = (model.Table.name, hashable_key(key))
+        if pending.pop(pending_key, None) is not None:
+            self.stats.record(coalesced=1)
+        pending[pending_key] = request
+
+        if len(pending) >= BATCH_WRITE_LIMIT:
+            self._flush_group(group)
+
+    def _discard(self, model, key):
+        """Drop the pending write to a key, before writing the key directly instead of through a request"""
+        try:
+            pending = self.pending[resource_group_key(model.Table)][1]
+        except KeyError:
+            return
+        if pending.pop((model.Table.name, hashable_key(key)), None) is not None:
+            self.stats.record(coalesced=1)
+
+    def flush(self):
+        """Send all pending writes"""
+        for group in list(self.pending):
+            self._flush_group(group)
+
+    def _client(self, group, model):
+        """Return the boto3 client used to send requests for a group of tables
+
+        Building a resource creates a new boto3 session, so we only do it once per group.  We use the resource's client
+        since, unlike the resource itself, it is safe to share between threads.
+        """
+        try:
+            return self.clients[group]
+        except KeyError:
+            self.clients[group] = model.Table.resource.meta.client
+            return self.clients[group]
+
+    def _flush_group(self, group):
+        model, pending = self.pending.pop(group)
+        client = self._client(group, model)
+
+        while pending:
+            sending = [
+                pending.popitem(last=False)
+                for _ in range(min(BATCH_WRITE_LIMIT, len(pending)))
+            ]
+            request_items = {}
+            for pending_key, request in sending:
+                request_items.setdefault(pending_key[0], []).append(request)
+
+            try:
+                self._send(
+                    client, request_items, [pending_key for pending_key, _ in sending]
+                )
+            except Exception:
+                # keep the writes that may not have been sent, so that the next flush sends them again
+                self._restore(group, model, sending + list(pending.items()))
+                raise
+
+    def _restore(self, group, model, requests):
+        """Put requests that failed to be sent back in front of the writes that are pending for their group"""
+        restored = OrderedDict(requests)
+        for pending_key, request in six.iteritems(
+            self.pending.get(group, (model, {}))[1]
+        ):
+            restored.pop(pending_key, None)
+            restored[pending_key] = request
+        self.pending[group] = (model, restored)
+
+    def _send(self, client, request_items, keys=()):
+        """Send a BatchWriteItem request, retrying any unprocessed items until they have all been processed
+
+        :param list keys: The ``(table_name, key)`` pairs written by the request
+        """
+        backoff = Backoff()
+        while request_items:
+            limited = acquire_capacity(
+                "write", "batch_write", self.tables, request_items
+            )
+            request = {"RequestItems": request_items}
+            if limited:
+                request["ReturnConsumedCapacity"] = "INDEXES"
+
+            response = client.batch_write_item(**request)
+            record_capacity("write", "batch_write", self.tables, limited, response)
+
+            sent = count_requests(request_items)
+            request_items = response.get("UnprocessedItems") or {}
+            unprocessed = count_requests(request_items)
+            self.stats.record(
+                written=sent - unprocessed, requests=1, retried=unprocessed
+            )
+            if request_items:
+                log.debug("Retrying %d unprocessed items", unprocessed)
+                backoff.sleep()
+
+
+class ParallelBatchWriter(BatchWriter):
+    """A :class:`BatchWriter` that keeps multiple ``BatchWriteItem`` requests in flight on a thread pool
+
+    This is useful for bulk loads, where a single writer is limited to one request (25 items) per round trip.  Each
+    request retries its own unprocessed items, with backoff, on the thread that sent it.
+
+    To keep memory bounded adding writes blocks once ``concurrency * 2`` requests are queued up.  Any exception raised
+    while sending a request is re-raised in the calling thread the next time it waits for requests to complete: when
+    adding a write has to wait for a free slot, or when the writes are flushed.
+
+    A write to a key that is still being written by an earlier request, which may be retrying unprocessed items, waits
+    for that request to complete before being sent.  This keeps the most recent write winning.
+
+    .. code-block:: python
+
+        with batch_write(concurrency=8) as batch:
+            for item in items:
+                batch.put(Thing, item)
+
+        print(batch.stats.items_per_second)
+
+    boto3 only keeps 10 connections open per client by default, if you use a concurrency above that you should also
+    raise ``max_pool_connections`` through the ``config`` in your Table's ``resource_kwargs``.
+
+    :param int concurrency: The number of requests to keep in flight
+    """
+
+    def __init__(self, concurrency=4):
+        super(ParallelBatchWriter, self).__init__()
+        self.concurrency = concurrency
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.in_flight = set()
+        self.keys_in_flight = {}
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            super(ParallelBatchWriter, self).__exit__(exc_type, exc_value, traceback)
+        finally:
+            self.executor.shutdown(wait=True)
+
+    def _wait(self, return_when, fs=None):
+        done, _ = futures.wait(
+            self.in_flight if fs is None else fs, return_when=return_when
+        )
+        self.in_flight -= done
+        self.keys_in_flight = dict(
+            (key, future)
+            for key, future in six.iteritems(self.keys_in_flight)
+            if future not in done
+        )
+        for future in done:
+            # re-raise any exception from the worker thread
+            future.result()
+
+    def _send(self, client, request_items, keys=()):
+        # wait for any earlier request that is still writing one of our keys, so that it can't overwrite us
+        earlier = set(
+            self.keys_in_flight[key] for key in keys if key in self.keys_in_flight
+        )
+        if earlier:
+            self._wait(futures.ALL_COMPLETED, earlier)
+
+        while len(self.in_flight) >= self.concurrency * 2:
+            self._wait(futures.FIRST_COMPLETED)
+
+        future = self.executor.submit(
+            super(ParallelBatchWriter, self)._send, client, request_items
+        )
+        self.in_flight.add(future)
+        for key in keys:
+            self.keys_in_flight[key] = future
+
+    def _discard(self, model, key):
+        super(ParallelBatchWriter, self)._discard(model, key)
+
+        # an earlier request that is still writing the key could otherwise overwrite the direct write
+        future = self.keys_in_flight.get((model.Table.name, hashable_key(key)))
+        if future is not None:
+            self._wait(futures.ALL_COMPLETED, [future])
+
+    def flush(self):
+        """Send all pending writes and wait for all in flight requests to complete"""
+        super(ParallelBatchWriter, self).flush()
+        self._wait(futures.ALL_COMPLETED)
+
+
+class WriteBuffer(BatchWriter):
+    """A :class:`BatchWriter` that ``put`` & ``save`` calls on any model are sent to while its context is active
+
+    Writes are held for at most ``max_delay`` seconds, during which later writes to the same key replace earlier ones,
+    and are then sent in ``BatchWriteItem`` requests from a background thread.  Full requests are sent right away and
+    :meth:`flush` sends everything that is pending.
+
+    Only plain writes are buffered: ``put`` & ``save`` calls with extra arguments for the table (such as conditions),
+    unique or partial saves, updates and deletes all go straight to the table as usual.  Reads are not served from the
+    buffer, so an item that was just saved may not be returned by ``get`` until it has been flushed.  The ``pre_save``
+    & ``post_save`` signals are sent when a write is added to the buffer.
+
+    If sending writes from the background thread fails the writes are kept, and sent again ``max_delay`` seconds later,
+    while the exception is re-raised by the next write.  :meth:`flush`, and exiting the context, send the pending writes
+    again and raise any exception from doing so.  Buffers are per thread, ``put`` & ``save`` calls in other threads are
+    not affected by a buffer.
+
+    :param float max_delay: The longest, in seconds, that a write is held before it is sent
+    """
+
+    def __init__(self, max_delay=1.0):
+        super(WriteBuffer, self).__init__()
+        self.max_delay = max_delay
+        self.lock = threading.RLock()
+        self.oldest = None
+        self.error = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name="dynamorm-write-buffer")
+        self.thread.daemon = True
+        self.thread.start()
+
+        if not hasattr(_local, "buffers"):
+            _local.buffers = []
+        _local.buffers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _local.buffers.remove(self)
+
+        self.stopped.set()
+        self.thread.join()
+
+        with self.lock:
+            super(WriteBuffer, self).__exit__(exc_type, exc_value, traceback)
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _add(self, model, key, request):
+        with self.lock:
+            self._raise_error()
+            if self.oldest is None:
+                self.oldest = time.time()
+            super(WriteBuffer, self)._add(model, key, request)
+
+    def _discard(self, model, key):
+        with self.lock:
+            super(WriteBuffer, self)._discard(model, key)
+
+    def flush(self):
+        """Send all pending writes"""
+        with self.lock:
+            self.error = None
+            self.oldest = None
+            super(WriteBuffer, self).flush()
+
+    def _run(self):
+        """Flush the pending writes whenever the oldest of them has been held for ``max_delay`` seconds"""
+        while True:
+            with self.lock:
+                if self.oldest is None:
+                    timeout = self.max_delay
+                else:
+                    timeout = self.oldest + self.max_delay - time.time()
+                    if timeout <= 0:
+                        try:
+                            self.flush()
+                        except Exception as exc:
+                            log.exception("Failed to flush buffered writes")
+                            self.error = exc
+                            self.oldest = time.time()
+                        timeout = self.max_delay
+
+            if self.stopped.wait(timeout):
+                return
@@ -0,0 +1,192 @@
+"""Estimate the size of items, and the capacity units that writing & reading them consumes, before they are sent to
+DynamoDB.
+
+Sizes are computed from the serialized form of the item, following the rules DynamoDB uses to meter items, so that
+items over the 400KB limit, or much larger than expected, are caught before they fail (or are billed) in production:
+
+.. code-block:: python
+
+    estimate = Thing.estimate({"id": "one", "document": document})
+    print(estimate.size, estimate.write_units, estimate.total_write_units)
+
+Tables can also check the size of every item that is ``put`` by setting thresholds, in bytes, on the inner ``Table``:
+
+.. code-block:: python
+
+    class Thing(DynaModel):
+        class Table:
+            name = "things"
+            hash_key = "id"
+            read = 5
+            write = 5
+
+            # log a warning for items over 100KB, and raise ItemTooLarge for items over 300KB
+            item_size_warning = 100 * 1024
+            item_size_limit = 300 * 1024
+
+The estimates are for writing new items.  Updates that change the key of a global index write to the index twice,
+once to remove the old entry and once to add the new one.
+"""
+
+import logging
+import math
+from decimal import Decimal
+
+import six
+from boto3.dynamodb.types import Binary
+
+from .exceptions import ItemTooLarge
+
+log = logging.getLogger(__name__)
+
+#: The maximum size of an item in DynamoDB
+ITEM_SIZE_LIMIT = 400 * 1024
+
+#: The number of bytes written for each write capacity unit
+WRITE_UNIT_SIZE = 1024
+
+#: The number of bytes read for each (strongly consistent) read capacity unit
+READ_UNIT_SIZE = 4 * 1024
+
+
+def number_size(value):
+    """Return the size of a number, which is 1 byte plus 1 byte for every 2 significant digits"""
+    if isinstance(value, float):
+        value = Decimal(repr(value))
+    sign, digits, _ = Decimal(value).normalize().as_tuple()
+    size = 1 + int(math.ceil(len(digits) / 2.0))
+    if sign:
+        size += 1
+    return size
+
+
+def attribute_size(value):
+    """Return the size of a serialized attribute value, as DynamoDB counts it"""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, six.string_types):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (six.integer_types, float, Decimal)):
+        return number_size(value)
+    if isinstance(value, Binary):
+        return len(value.value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return 3 + sum(
+            len(name.encode("utf-8")) + attribute_size(val) + 1
+            for name, val in six.iteritems(value)
+        )
+    if isinstance(value, (set, frozenset)):
+        return sum(attribute_size(val) for val in value)
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(attribute_size(val) + 1 for val in value)
+    raise TypeError("Unsupported attribute type {0}".format(type(value).__name__))
+
+
+def item_size(item):
+    """Return the size of a serialized item, which is the size of the names & values of its attributes"""
+    return sum(
+        len(name.encode("utf-8")) + attribute_size(value)
+        for name, value in six.iteritems(item)
+        if value is not None
+    )
+
+
+def units(size, unit_size):
+    """Return the number of capacity units needed to read or write size bytes, which is always at least one"""
+    return max(1, int(math.ceil(size / float(unit_size))))
+
+
+def index_entry_size(table, index, item):
+    """Return the size of the entry an item has in an index, or None when the item isn't in the index because it
+    doesn't have the keys of the index"""
+    keys = [index.hash_key] + ([index.range_key] if index.range_key else [])
+    if any(item.get(key) is None for key in keys):
+        return None
+
+    projection = index.projection.__class__.__name__
+    if projection == "ProjectAll":
+        return item_size(item)
+
+    names = set(keys)
+    names.add(table.hash_key)
+    if table.range_key:
+        names.add(table.range_key)
+    if projection == "ProjectInclude":
+        names.update(index.projection.include)
+    return item_size(dict((name, item.get(name)) for name in names))
+
+
+class ItemEstimate(object):
+    """The size of an item and the capacity units that writing & reading it consumes
+
+    :ivar int size: The size of the item in bytes
+    :ivar int write_units: The write capacity units consumed writing the item to the table
+    :ivar int read_units: The read capacity units consumed by a strongly consistent read of the item
+    :ivar float eventual_read_units: The read capacity units consumed by an eventually consistent read of the item
+    :ivar dict index_write_units: The write capacity units consumed writing the item to each index, by index name.
+                                  Local indexes consume the capacity of the table, global indexes their own.
+    """
+
+    def __init__(self, size, index_write_units=None):
+        self.size = size
+        self.write_units = units(size, WRITE_UNIT_SIZE)
+        self.read_units = units(size, READ_UNIT_SIZE)
+        self.eventual_read_units = self.read_units / 2.0
+        self.index_write_units = index_write_units or {}
+
+    def __repr__(self):
+        return (
+            "{0}(size={1}, write_units={2}, read_units={3}, eventual_read_units={4}, "
+            "index_write_units={5})".format(
+                self.__class__.__name__,
+                self.size,
+                self.write_units,
+                self.read_units,
+                self.eventual_read_units,
+                self.index_write_units,
+            )
+        )
+
+    @property
+    def total_write_units(self):
+        """The write capacity units consumed writing the item to the table and all of its indexes"""
+        return self.write_units + sum(six.itervalues(self.index_write_units))
+
+
+def estimate_item(table, item):
+    """Return the :class:`ItemEstimate` of a serialized item for a table
+
+    :param table: The :class:`~dynamorm.table.DynamoTable3` the item is written to
+    :param dict item: The item, as it is sent to DynamoDB
+    """
+    index_write_units = {}
+    for name, index in six.iteritems(table.indexes):
+        size = index_entry_size(table, index, item)
+        if size is not None:
+            index_write_units[name] = units(size, WRITE_UNIT_SIZE)
+    return ItemEstimate(item_size(item), index_write_units)
+
+
+def check_item_size(table, item):
+    """Check the size of an item that is about to be written against the ``item_size_warning`` and
+    ``item_size_limit`` thresholds of a table
+
+    :raises ItemTooLarge: When the item is larger than ``item_size_limit``
+    """
+    size = item_size(item)
+    if table.item_size_limit is not None and size > table.item_size_limit:
+        raise ItemTooLarge(
+            "Item is {0} bytes, which is more than the limit of {1} bytes for {2}".format(
+                size, table.item_size_limit, table.name
+            )
+        )
+    if table.item_size_warning is not None and size > table.item_size_warning:
+        log.warning(
+            "Item is %d bytes, which consumes %d write capacity units on %s",
+            size,
+            units(size, WRITE_UNIT_SIZE),
+            table.name,
+        )
+    return size
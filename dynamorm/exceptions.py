@@ -43,6 +43,10 @@ class MissingTableAttribute(DynamoTableException):
     """A required attribute is missing"""
 
 
+class InvalidTableAttribute(DynamoTableException):
+    """A Table attribute has an invalid value"""
+
+
 class InvalidSchemaField(DynamoTableException):
     """A field provided does not exist in the schema"""
 
@@ -61,3 +65,36 @@ class ConditionFailed(DynamoTableException):
 
 class TableNotActive(DynamoTableException):
     """The table is not ACTIVE, and you do not want to wait"""
+
+
+class ItemTooLarge(DynamoTableException):
+    """An item is larger than the ``item_size_limit`` of its table, or too large to be sharded"""
+
+
+class ShardedItemError(DynamoTableException):
+    """The chunk rows of a sharded item don't match the item, even when read as a consistent snapshot"""
+
+
+class TransactionCanceled(DynamoTableException):
+    """A transaction was cancelled
+
+    The ``reasons`` attribute is a list of ``(model, operation, reason)`` tuples, one for each operation in the
+    request, where reason is the ``CancellationReason`` dict returned by DynamoDB.
+    """
+
+    def __init__(self, reasons, *args, **kwargs):
+        super(TransactionCanceled, self).__init__(*args, **kwargs)
+        self.reasons = reasons
+
+    @property
+    def failed(self):
+        """The ``(model, operation, reason)`` tuples for the operations that caused the cancellation"""
+        return [
+            (model, operation, reason)
+            for model, operation, reason in self.reasons
+            if reason.get("Code", "None") != "None"
+        ]
+
+
+class TransactionConditionFailed(TransactionCanceled, ConditionFailed):
+    """A transaction was cancelled because a condition check failed"""
@@ -0,0 +1,282 @@
+"""Bulk import items into a model's table from newline delimited JSON or CSV files.
+
+Rows are streamed from the file and validated through the model's Schema in a pool of worker processes, while the
+valid items are written through a :class:`~dynamorm.batch.ParallelBatchWriter`.  Rows that fail to parse or validate
+are written to a rejects file, as newline delimited JSON, rather than stopping the import.
+
+.. code-block:: python
+
+    from dynamorm.importer import import_file
+
+    stats = import_file(Thing, "things.ndjson", rejects_path="things.rejects.ndjson", rate_limit=0.5)
+    print(stats)
+
+The same is available from the command line, where the model is given as ``module:Model``:
+
+.. code-block:: bash
+
+    python -m dynamorm import myapp.models:Thing things.ndjson --rejects things.rejects.ndjson --rate-limit 0.5
+
+Since the workers import the model themselves it must be importable, by the path returned from :func:`model_path`, in
+the worker processes.  Pass ``processes=0`` to validate in the importing process instead.
+"""
+
+import contextlib
+import csv
+import importlib
+import io
+import json
+import logging
+import multiprocessing
+import sys
+import time
+from collections import deque
+
+import six
+
+from .batch import batch_write
+from .exceptions import InvalidTableAttribute, ValidationError
+from .ratelimit import RateLimiter
+
+log = logging.getLogger(__name__)
+
+#: The file formats that can be imported
+FORMATS = ("ndjson", "csv")
+
+
+def load_model(path):
+    """Import and return a model given as ``module:Model`` (or ``module.Model``)"""
+    if ":" in path:
+        module_name, name = path.split(":", 1)
+    else:
+        module_name, _, name = path.rpartition(".")
+    model = importlib.import_module(module_name)
+    for part in name.split("."):
+        model = getattr(model, part)
+    return model
+
+
+def model_path(model):
+    """Return the ``module:Model`` path of a model, used to import it in the worker processes"""
+    return "{0}:{1}".format(model.__module__, model.__name__)
+
+
+def guess_format(path):
+    """Return the format of a file based on its extension, defaulting to ndjson"""
+    if path.lower().endswith(".csv"):
+        return "csv"
+    return "ndjson"
+
+
+def open_file(path, format):
+    """Open a file, or stdin when path is ``-``, for reading rows in the given format"""
+    if path == "-":
+        return sys.stdin
+    if six.PY2:
+        return open(path, "rb")
+    return io.open(path, newline="" if format == "csv" else None, encoding="utf-8")
+
+
+def read_rows(fd, format):
+    """Yield ``(line_number, row)`` tuples from a file
+
+    NDJSON rows are yielded as their raw lines so that parsing happens in the workers, CSV rows are yielded as dicts
+    with the empty values removed.
+    """
+    if format == "csv":
+        reader = csv.DictReader(fd)
+        for row in reader:
+            yield reader.line_num, dict(
+                (k, v) for k, v in six.iteritems(row) if v != ""
+            )
+    elif format == "ndjson":
+        for line_number, line in enumerate(fd, 1):
+            if line.strip():
+                yield line_number, line
+    else:
+        raise ValueError(
+            "Unknown format {0}, must be one of: {1}".format(format, ", ".join(FORMATS))
+        )
+
+
+def validate_rows(model, rows):
+    """Parse and validate a chunk of rows
+
+    :returns: A tuple of the valid items, as ``(line_number, item)``, and the rejected rows, as
+              ``(line_number, row, error)``
+    """
+    valid = []
+    rejected = []
+    for line_number, row in rows:
+        item = row
+        if isinstance(item, six.string_types):
+            try:
+                item = json.loads(item)
+            except ValueError as exc:
+                rejected.append((line_number, row, "Invalid JSON: {0}".format(exc)))
+                continue
+
+        if not isinstance(item, dict):
+            rejected.append((line_number, row, "Rows must be objects"))
+            continue
+
+        try:
+            valid.append((line_number, model.Schema.dynamorm_dump(item)))
+        except ValidationError as exc:
+            rejected.append((line_number, row, six.text_type(exc)))
+
+    return valid, rejected
+
+
+_worker_model = None
+
+
+def _init_worker(path):
+    global _worker_model
+    _worker_model = load_model(path)
+
+
+def _validate_chunk(rows):
+    return validate_rows(_worker_model, rows)
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items from an iterable"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def validated_chunks(model, chunks, processes):
+    """Yield the results of :func:`validate_rows` for each chunk, in order, using a pool of worker processes
+
+    Only ``processes * 2`` chunks are handed to the pool at any time so that memory stays bounded for large files.
+    """
+    if processes == 0:
+        for chunk in chunks:
+            yield validate_rows(model, chunk)
+        return
+
+    processes = processes or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(processes, _init_worker, (model_path(model),))
+    try:
+        pending = deque()
+        for chunk in chunks:
+            if len(pending) >= processes * 2:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(_validate_chunk, (chunk,)))
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+@contextlib.contextmanager
+def rate_limited(table, rate_limit):
+    """Temporarily set the ``rate_limit`` of a table, when rate_limit is not None"""
+    if rate_limit is None:
+        yield
+        return
+
+    if not 0 < rate_limit <= 1:
+        raise InvalidTableAttribute(
+            "rate_limit must be greater than 0 and at most 1, not {0}".format(
+                rate_limit
+            )
+        )
+
+    previous = (table.rate_limit, table.rate_limiter)
+    table.rate_limit = rate_limit
+    table.rate_limiter = RateLimiter(table)
+    try:
+        yield
+    finally:
+        table.rate_limit, table.rate_limiter = previous
+
+
+def import_file(
+    model,
+    path,
+    format=None,
+    concurrency=4,
+    processes=None,
+    chunk_size=500,
+    rejects_path=None,
+    rate_limit=None,
+    progress=None,
+    progress_interval=5.0,
+):
+    """Import the rows of a file into the table of a model
+
+    :param model: The model class to import into
+    :param str path: The file to import, or ``-`` to read from stdin
+    :param str format: Either ``ndjson`` or ``csv``, by default this is guessed from the file extension
+    :param int concurrency: The number of batch write requests to keep in flight
+    :param int processes: The number of worker processes to validate rows in, defaults to the number of CPUs.  Use 0
+                          to validate in this process.
+    :param int chunk_size: The number of rows sent to a worker at a time
+    :param str rejects_path: A file to write the rows that fail to parse or validate to, as newline delimited JSON with
+                             the ``line``, ``row`` and ``error`` of each
+    :param float rate_limit: Pace the writes to this fraction of the table's provisioned write capacity, see
+                             :mod:`dynamorm.ratelimit`
+    :param progress: An optional callable that is called with the :class:`~dynamorm.batch.BatchStats` every
+                     ``progress_interval`` seconds and once the import is complete
+    :returns: The :class:`~dynamorm.batch.BatchStats` of the import, where ``failed_validation`` is the number of
+              rejected rows
+    """
+    format = format or guess_format(path)
+    if format not in FORMATS:
+        raise ValueError(
+            "Unknown format {0}, must be one of: {1}".format(format, ", ".join(FORMATS))
+        )
+
+    fd = open_file(path, format)
+    rejects = io.open(rejects_path, "w", encoding="utf-8") if rejects_path else None
+    try:
+        with rate_limited(model.Table, rate_limit):
+            with batch_write(concurrency=concurrency) as batch:
+                reported = time.time()
+                chunks = chunked(read_rows(fd, format), chunk_size)
+                for valid, rejected in validated_chunks(model, chunks, processes):
+                    for _, item in valid:
+                        batch.put(model, item, validate=False)
+
+                    if rejected:
+                        batch.stats.record(failed_validation=len(rejected))
+                        for line_number, row, error in rejected:
+                            log.debug("Rejected line %d: %s", line_number, error)
+                            if rejects is not None:
+                                rejects.write(
+                                    six.text_type(
+                                        json.dumps(
+                                            {
+                                                "line": line_number,
+                                                "row": row,
+                                                "error": error,
+                                            }
+                                        )
+                                    )
+                                    + "\n"
+                                )
+
+                    if (
+                        progress is not None
+                        and time.time() - reported >= progress_interval
+                    ):
+                        progress(batch.stats)
+                        reported = time.time()
+    finally:
+        if fd is not sys.stdin:
+            fd.close()
+        if rejects is not None:
+            rejects.close()
+
+    if progress is not None:
+        progress(batch.stats)
+    return batch.stats
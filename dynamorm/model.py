@@ -5,12 +5,17 @@ or Schematics schema that is used for validating and marshalling your data.
 import inspect
 import logging
 import sys
+import types
 
+import botocore
 import six
 
-from .exceptions import DynaModelException
+from .batch import BATCH_WRITE_LIMIT, active_write_buffer, batch_write
+from .capacity import estimate_item
+from .exceptions import ConditionFailed, DynaModelException, ValidationError
 from .indexes import Index
 from .relationships import Relationship
+from .session import active_session
 from .signals import (
     model_prepared,
     pre_init,
@@ -21,8 +26,23 @@ from .signals import (
     post_update,
     pre_delete,
     post_delete,
+    pre_batch_save,
+    post_batch_save,
+    post_batch_delete,
+    post_page_load,
 )
-from .table import DynamoTable3, QueryIterator, ScanIterator
+from .table import (
+    UPDATE_FUNCTION_TEMPLATES,
+    DynamoTable3,
+    Q,
+    QueryIterator,
+    ScanIterator,
+    conditions_to_expression,
+    remove_nones,
+)
+from .tracking import ChangeTracker, track, tracked_delattr, tracked_setattr
+from .types import simple
+from .types.compression import LazyAttribute
 
 log = logging.getLogger(__name__)
 
@@ -37,6 +57,18 @@ class DynaModelMeta(type):
     transform it into a new class named <Name>Schema, extending from :class:`~marshmallow.Schema`.  For example, on a
     model named ``Foo`` the resulting ``Foo.Schema`` object would be an instance of a class named ``FooSchema``, rather
     than a class named ``Schema``
+
+    The load & dump functions for the Schema are also generated here, so that validating items doesn't need to walk
+    the fields of the Schema dynamically.  Set ``dynamorm_codegen = False`` on the inner Schema class to always go
+    through the serialization library instead.
+
+    Models that set ``dynamorm_compact = True`` get a compact instance layout: the attributes of the instances are
+    ``__slots__``, generated from the fields of the Schema, rather than a ``__dict__`` and the raw data an instance was
+    loaded from isn't kept once it has been loaded.  Instances of compact models can only have the attributes of their
+    fields, so use this for models that are read in bulk rather than ones that hold other state.
+
+    Models that set ``dynamorm_track_changes = True`` record the changes made to their instances, including inside
+    of their dict & list fields, so that partial saves only send the paths that changed.  See :mod:`dynamorm.tracking`.
     """
 
     def __new__(cls, name, parents, attrs):
@@ -78,7 +110,9 @@ class DynaModelMeta(type):
 
         # Transform the Schema.
         if should_transform("Schema"):
-            if "marshmallow" in sys.modules:
+            if simple.is_simple_schema(attrs["Schema"]):
+                Schema = simple.Schema
+            elif "marshmallow" in sys.modules:
                 from .types._marshmallow import Schema
             elif "schematics" in sys.modules:
                 from .types._schematics import Schema
@@ -87,7 +121,11 @@ class DynaModelMeta(type):
                     "Unknown Schema definitions, we couldn't find any supported fields/types"
                 )
 
-            if issubclass(attrs["Schema"], Schema.base_schema_type()):
+            if issubclass(attrs["Schema"], Schema):
+                SchemaClass = type(
+                    "{name}Schema".format(name=name), (attrs["Schema"],), {}
+                )
+            elif issubclass(attrs["Schema"], Schema.base_schema_type()):
                 SchemaClass = type(
                     "{name}Schema".format(name=name),
                     (Schema, attrs["Schema"]),
@@ -99,8 +137,34 @@ class DynaModelMeta(type):
                     (Schema,) + attrs["Schema"].__bases__,
                     dict(attrs["Schema"].__dict__),
                 )
+            if SchemaClass.dynamorm_codegen:
+                SchemaClass.dynamorm_compile()
             attrs["Schema"] = SchemaClass
 
+            # compressed fields are only decompressed when their attribute is accessed
+            for field_name, field in six.iteritems(SchemaClass.dynamorm_fields()):
+                if getattr(field, "dynamorm_lazy", False) and field_name not in attrs:
+                    attrs[field_name] = LazyAttribute(field_name)
+
+        def option(name):
+            return attrs.get(
+                name, any(getattr(parent, name, False) for parent in parents)
+            )
+
+        track_changes = option("dynamorm_track_changes")
+        if track_changes:
+            attrs.setdefault("__setattr__", tracked_setattr)
+            attrs.setdefault("__delattr__", tracked_delattr)
+
+        compact = option("dynamorm_compact")
+        if compact:
+            schema = attrs.get("Schema") or next(
+                parent.Schema for parent in parents if hasattr(parent, "Schema")
+            )
+            attrs["__slots__"] = tuple(attrs.get("__slots__", ())) + cls.compact_slots(
+                schema, parents, attrs, track_changes=track_changes
+            )
+
         # transform the Table
         if should_transform("Table"):
             TableClass = type(
@@ -117,6 +181,12 @@ class DynaModelMeta(type):
         model.Schema._model = model
         model.Table._model = model
 
+        # the lazy attributes of compact models keep their values in the slots that were made for them
+        if compact:
+            for field_name, value in six.iteritems(attrs):
+                if isinstance(value, LazyAttribute):
+                    value.slot = getattr(model, LazyAttribute.slot_name(field_name))
+
         # Put the instantiated indexes back into our attrs.  We instantiate the Index class that's in the attrs and
         # provide the actual Index object from our table as the parameter.
         for name, klass in six.iteritems(indexes):
@@ -130,6 +200,38 @@ class DynaModelMeta(type):
 
         return model
 
+    @staticmethod
+    def compact_slots(schema, parents, attrs, track_changes=False):
+        """Return the ``__slots__`` of a compact model with the given schema
+
+        Every field gets a slot, except for lazy fields which keep their values in a slot of their
+        :class:`~dynamorm.types.compression.LazyAttribute`, and slots that the parents already have are left out.
+        """
+
+        def has_slot(name):
+            return any(
+                isinstance(getattr(parent, name, None), types.MemberDescriptorType)
+                for parent in parents
+            )
+
+        names = []
+        for field_name in schema.dynamorm_fields():
+            if isinstance(attrs.get(field_name), LazyAttribute):
+                names.append(LazyAttribute.slot_name(field_name))
+            elif field_name not in attrs and not any(
+                isinstance(getattr(parent, field_name, None), LazyAttribute)
+                for parent in parents
+            ):
+                names.append(field_name)
+        names.extend(["_raw", "_validated_data"])
+        if track_changes:
+            names.append("_changes")
+
+        slots = tuple(name for name in names if not has_slot(name))
+        if not any(hasattr(parent, "__weakref__") for parent in parents):
+            slots += ("__weakref__",)
+        return slots
+
 
 @six.add_metaclass(DynaModelMeta)
 class DynaModel(object):
@@ -146,7 +248,8 @@ class DynaModel(object):
     :class:`~LocalIndex` or :class:`~GlobalIndex` classes.  See the :mod:`dynamorm.table` module for more information.
 
     The document schema is defined in a class named ``Schema``, which should be filled out exactly as you would fill
-    out any other Marshmallow :class:`~marshmallow.Schema` or Schematics :class:`~schematics.Model`.
+    out any other Marshmallow :class:`~marshmallow.Schema` or Schematics :class:`~schematics.Model`, or with type
+    annotations for the lightweight :mod:`dynamorm.types.simple` backend.
 
     For example:
 
@@ -194,12 +297,30 @@ class DynaModel(object):
                 ))
     """
 
+    __slots__ = ()
+
+    dynamorm_compact = False
+    dynamorm_track_changes = False
+
     def __init__(self, partial=False, **raw):
         """Create a new instance of a DynaModel
 
         :param \*\*raw: The raw data as pulled out of dynamo. This will be validated and the sanitized
         input will be put onto ``self`` as attributes.
         """
+        self._load(raw, partial=partial)
+
+    def _load(self, raw, partial=False, trusted=False):
+        """Validate, or when trusted only convert, the raw data and put it onto ``self`` as attributes"""
+        relationships = self._prepare_load(raw, partial)
+        if trusted:
+            validated = self.Schema.dynamorm_convert(raw, partial=partial)
+        else:
+            validated = self.Schema.dynamorm_load(raw, partial=partial)
+        self._finish_load(validated, relationships, partial)
+
+    def _prepare_load(self, raw, partial):
+        """Send the ``pre_init`` signal and take the relationships out of the raw data, before it is loaded"""
         pre_init.send(self.__class__, instance=self, partial=partial, raw=raw)
 
         # When creating models you can pass in values to the relationships defined on the model, we remove the value
@@ -216,16 +337,26 @@ class DynaModel(object):
                     raw.update(to_assign)
 
         self._raw = raw
-        self._validated_data = self.Schema.dynamorm_validate(
-            raw, partial=partial, native=True
-        )
-        for k, v in six.iteritems(self._validated_data):
+        return relationships
+
+    def _finish_load(self, validated, relationships, partial):
+        """Put the loaded data and relationships onto ``self`` and send the ``post_init`` signal"""
+        if self.dynamorm_track_changes:
+            self._changes = ChangeTracker()
+
+        self._validated_data = validated
+        for k, v in six.iteritems(validated):
             setattr(self, k, v)
 
         for k, v in six.iteritems(relationships):
             setattr(self, k, v)
 
-        post_init.send(self.__class__, instance=self, partial=partial, raw=raw)
+        if self.dynamorm_track_changes:
+            self._changes.clear()
+
+        post_init.send(self.__class__, instance=self, partial=partial, raw=self._raw)
+        if self.dynamorm_compact:
+            del self._raw
 
     @classmethod
     def _normalize_keys_in_kwargs(cls, kwargs):
@@ -237,9 +368,7 @@ class DynaModel(object):
 
         def normalize(key):
             try:
-                validated = cls.Schema.dynamorm_validate(
-                    {key: kwargs[key]}, partial=True
-                )
+                validated = cls.Schema.dynamorm_dump({key: kwargs[key]}, partial=True)
                 kwargs[key] = validated[key]
             except KeyError:
                 pass
@@ -254,10 +383,16 @@ class DynaModel(object):
 
         The attributes on the item go through validation, so this may raise :class:`ValidationError`.
 
+        When a :func:`~dynamorm.batch.write_buffer` is active, and no kwargs are supplied, the item is added to the
+        buffer instead of being written right away.
+
         :param dict item: The item to put into the table
         :param \*\*kwargs: All other kwargs are passed through to the put method on the table
         """
-        return cls.Table.put(cls.Schema.dynamorm_validate(item), **kwargs)
+        buffer = active_write_buffer()
+        if buffer is not None and not kwargs:
+            return buffer.put(cls, item)
+        return cls.Table.put(cls.Schema.dynamorm_dump(item), **kwargs)
 
     @classmethod
     def put_unique(cls, item, **kwargs):
@@ -266,7 +401,7 @@ class DynaModel(object):
         :param dict item: The item to put into the table
         :param \*\*kwargs: All other kwargs are passed through to the put_unique method on the table
         """
-        return cls.Table.put_unique(cls.Schema.dynamorm_validate(item), **kwargs)
+        return cls.Table.put_unique(cls.Schema.dynamorm_dump(item), **kwargs)
 
     @classmethod
     def put_batch(cls, *items, **batch_kwargs):
@@ -275,6 +410,8 @@ class DynaModel(object):
         :param \*items: The items to put into the table
         :param \*\*kwargs: All other kwargs are passed through to the put_batch method on the table
 
+        The ``pre_batch_save`` & ``post_batch_save`` signals are sent with all of the validated items.
+
         Example::
 
             Thing.put_batch(
@@ -283,44 +420,215 @@ class DynaModel(object):
                 {"hash_key": "three"},
             )
         """
-        return cls.Table.put_batch(
-            *[cls.Schema.dynamorm_validate(item) for item in items], **batch_kwargs
-        )
+        items = [cls.Schema.dynamorm_dump(item) for item in items]
+        pre_batch_save.send(cls, items=items)
+        resp = cls.Table.put_batch(*items, **batch_kwargs)
+        post_batch_save.send(cls, items=items)
+        return resp
 
     @classmethod
-    def update_item(cls, conditions=None, update_item_kwargs=None, **kwargs):
-        """Update a item in the table
+    def estimate(cls, item):
+        """Estimate the size of an item, and the capacity units writing & reading it consumes, without writing it
 
-        :params conditions: A dict of key/val pairs that should be applied as a condition to the update
-        :params update_item_kwargs: A dict of other kwargs that are passed through to update_item
-        :params \*\*kwargs: Includes your hash/range key/val to match on as well as any keys to update
+        Example::
+
+            estimate = Thing.estimate({"hash_key": "one", "document": document})
+            if estimate.size > 100 * 1024:
+                ...
+
+        :param item: An instance of this model, or a dict that goes through validation like it would for ``put``
+        :returns: A :class:`~dynamorm.capacity.ItemEstimate`
         """
+        if isinstance(item, cls):
+            item = item.to_dict()
+        else:
+            item = cls.Schema.dynamorm_dump(item)
+        return estimate_item(cls.Table, remove_nones(item))
+
+    @classmethod
+    def put_stream(cls, items, concurrency=None, on_invalid=None):
+        """Put items from any iterable, such as a generator, into the table
+
+        Unlike ``put_batch`` the items are validated and written as they are consumed from the iterable, so only a
+        bounded number of them are held in memory at any time.  Items that fail validation are counted and skipped
+        rather than aborting the whole stream.
+
+        :param items: An iterable of dicts to put into the table
+        :param int concurrency: When supplied, keep up to this many batch requests in flight at once.  See
+                                :class:`~dynamorm.batch.ParallelBatchWriter`.
+        :param on_invalid: An optional callable that is called with the item and the :class:`ValidationError` for
+                           each item that fails validation
+        :returns: A :class:`~dynamorm.batch.BatchStats` summary with the ``written``, ``failed_validation`` and
+                  ``retried`` counts
+
+        Example::
+
+            def things():
+                for line in open("things.ndjson"):
+                    yield json.loads(line)
+
+            summary = Thing.put_stream(things())
+        """
+        with batch_write(concurrency=concurrency) as batch:
+            for item in items:
+                try:
+                    batch.put(cls, item)
+                except ValidationError as exc:
+                    log.debug("Skipping invalid item in put_stream: %s", exc)
+                    batch.stats.record(failed_validation=1)
+                    if on_invalid is not None:
+                        on_invalid(item, exc)
+        return batch.stats
+
+    @classmethod
+    def _validate_update_kwargs(cls, kwargs):
+        """Helper method to replace the values in the kwargs of an update with their validated values"""
         kwargs.update(
             dict(
                 (k, v)
                 for k, v in six.iteritems(
-                    cls.Schema.dynamorm_validate(kwargs, partial=True)
+                    cls.Schema.dynamorm_dump(kwargs, partial=True)
                 )
                 if k in kwargs
             )
         )
-        kwargs = cls._normalize_keys_in_kwargs(kwargs)
+        return kwargs
+
+    @classmethod
+    def update_item(cls, conditions=None, update_item_kwargs=None, **kwargs):
+        """Update a item in the table
+
+        :params conditions: A dict of key/val pairs that should be applied as a condition to the update
+        :params update_item_kwargs: A dict of other kwargs that are passed through to update_item
+        :params \*\*kwargs: Includes your hash/range key/val to match on as well as any keys to update
+        """
+        kwargs = cls._normalize_keys_in_kwargs(cls._validate_update_kwargs(kwargs))
         return cls.Table.update(
             conditions=conditions, update_item_kwargs=update_item_kwargs, **kwargs
         )
 
     @classmethod
-    def new_from_raw(cls, raw, partial=False):
+    def update_many(
+        cls, keys, conditions=None, update_item_kwargs=None, concurrency=8, **kwargs
+    ):
+        """Apply the same update to many items in the table
+
+        The updates are validated and the update expression is built once, then an ``UpdateItem`` request is sent for
+        each key with up to ``concurrency`` requests in flight at once::
+
+            failed = Thing.update_many(
+                [{"id": "one"}, {"id": "two"}],
+                conditions=dict(status="active"),
+                status="archived",
+                count__plus=1,
+            )
+
+        Keys whose conditions fail don't stop the remaining keys from being updated.
+
+        :params keys: An iterable of dicts containing the hash key, and range key if used
+        :params conditions: A dict of key/val pairs that should be applied as a condition to each update
+        :params update_item_kwargs: A dict of other kwargs that are passed through to update_item
+        :params int concurrency: The number of requests to keep in flight
+        :params \*\*kwargs: The keys to update, using the same syntax as ``update_item``
+        :returns: A list of ``(key, ConditionFailed)`` tuples for the keys whose conditions failed
+        """
+        kwargs = cls._validate_update_kwargs(kwargs)
+        return cls.Table.update_many(
+            (cls._normalize_keys_in_kwargs(dict(key)) for key in keys),
+            conditions=conditions,
+            update_item_kwargs=update_item_kwargs,
+            concurrency=concurrency,
+            **kwargs
+        )
+
+    @classmethod
+    def new_from_raw(cls, raw, partial=False, trusted=None):
         """Return a new instance of this model from a raw (dict) of data that is loaded by our Schema
 
+        Items that were read from the table were validated when they were written, so when they are trusted the values
+        are only converted to their native types and the validators of the Schema are skipped.  Call ``.validate()``
+        on the instance to validate it anyway.
+
         :param dict raw: The attributes to use when creating the instance
+        :param bool partial: True if not all of the attributes may be present
+        :param bool trusted: Only convert the raw data rather than validating it, defaults to the ``trusted_reads``
+                             attribute of the Table
         """
         if raw is None:
             return None
-        return cls(partial=partial, **raw)
+        if trusted is None:
+            trusted = cls.Table.trusted_reads
+        if not trusted:
+            return cls(partial=partial, **raw)
+
+        instance = cls.__new__(cls)
+        instance._load(raw, partial=partial, trusted=True)
+        return instance
+
+    @classmethod
+    def new_from_raw_page(cls, raws, partial=False, trusted=None):
+        """Return new instances of this model from a page of raw (dict) data, loaded by our Schema all at once
+
+        This is what the query and scan iterators use, so that a whole page of items is validated in one go, which
+        is cheaper than validating them one at a time through ``new_from_raw``.  Items that fail validation don't stop
+        the rest of the page from loading, instead their :class:`~dynamorm.exceptions.ValidationError` is returned in
+        place of the instance.
+
+        :param list raws: The attributes of each of the instances
+        :param bool partial: True if not all of the attributes may be present
+        :param bool trusted: Only convert the raw data rather than validating it, defaults to the ``trusted_reads``
+                             attribute of the Table
+        :returns: A list with an instance, or a ValidationError, for each of the raws in order
+
+        The ``post_page_load`` signal is sent with the instances once the page is loaded.  When a
+        :class:`~dynamorm.session.Session` is active the instances that are already in its identity map are returned
+        in place of the ones that were loaded.
+        """
+        if trusted is None:
+            trusted = cls.Table.trusted_reads
+        if trusted:
+            instances = [
+                cls.new_from_raw(raw, partial=partial, trusted=True) for raw in raws
+            ]
+        else:
+            instances = cls._load_page(raws, partial)
+
+        session = active_session()
+        if session is not None and not partial:
+            instances = session.merge_page(instances)
+
+        post_page_load.send(
+            cls,
+            instances=[
+                instance
+                for instance in instances
+                if not isinstance(instance, ValidationError)
+            ],
+        )
+        return instances
 
     @classmethod
-    def get(cls, consistent=False, **kwargs):
+    def _load_page(cls, raws, partial):
+        """Validate a page of raw data through ``Schema.dynamorm_load_many``, see ``new_from_raw_page``"""
+        instances = []
+        relationships = []
+        for raw in raws:
+            instance = cls.__new__(cls)
+            relationships.append(instance._prepare_load(dict(raw), partial))
+            instances.append(instance)
+
+        loaded = cls.Schema.dynamorm_load_many(
+            [instance._raw for instance in instances], partial=partial
+        )
+        for i, (validated, error) in enumerate(loaded):
+            if error is not None:
+                instances[i] = error
+            else:
+                instances[i]._finish_load(validated, relationships[i], partial)
+        return instances
+
+    @classmethod
+    def get(cls, consistent=False, trusted=None, **kwargs):
         """Get an item from the table
 
         Example::
@@ -328,24 +636,50 @@ class DynaModel(object):
             Thing.get(hash_key="three")
 
         :param bool consistent: If set to True the get will be a consistent read
+        :param bool trusted: If set to True the item is only converted, and not validated, by the Schema.  See
+                             ``new_from_raw``.
         :param \*\*kwargs: You must supply your hash key, and range key if used
+
+        When a :class:`~dynamorm.session.Session` is active the instance is returned from its identity map if it was
+        already loaded.
         """
+        session = active_session()
+        if session is not None:
+            return session.get(cls, consistent=consistent, trusted=trusted, **kwargs)
+
         kwargs = cls._normalize_keys_in_kwargs(kwargs)
         item = cls.Table.get(consistent=consistent, **kwargs)
-        return cls.new_from_raw(item)
+        return cls.new_from_raw(item, trusted=trusted)
 
     @classmethod
-    def get_batch(cls, keys, consistent=False, attrs=None):
+    def get_batch(cls, keys, consistent=False, attrs=None, trusted=None):
         """Generator to get more than one item from the table.
 
         :param keys: One or more dicts containing the hash key, and range key if used
         :param bool consistent: If set to True then get_batch will be a consistent read
         :param str attrs: The projection expression of which attrs to fetch, if None all attrs will be fetched
+        :param bool trusted: If set to True the items are only converted, and not validated, by the Schema.  See
+                             ``new_from_raw``.
+
+        When a :class:`~dynamorm.session.Session` is active, and ``attrs`` is None, only the items that aren't already
+        in its identity map are read.
         """
+        session = active_session()
+        if session is not None and attrs is None:
+            return session.get_batch(cls, keys, consistent=consistent, trusted=trusted)
+        return cls._get_batch(keys, consistent=consistent, attrs=attrs, trusted=trusted)
+
+    @classmethod
+    def _get_batch(cls, keys, consistent=False, attrs=None, trusted=None):
         keys = (cls._normalize_keys_in_kwargs(key) for key in keys)
-        items = cls.Table.get_batch(keys, consistent=consistent, attrs=attrs)
-        for item in items:
-            yield cls.new_from_raw(item, partial=attrs is not None)
+        pages = cls.Table.get_batch_pages(keys, consistent=consistent, attrs=attrs)
+        for page in pages:
+            for instance in cls.new_from_raw_page(
+                page, partial=attrs is not None, trusted=trusted
+            ):
+                if isinstance(instance, ValidationError):
+                    raise instance
+                yield instance
 
     @classmethod
     def query(cls, *args, **kwargs):
@@ -422,14 +756,70 @@ class DynaModel(object):
         kwargs = cls._normalize_keys_in_kwargs(kwargs)
         return ScanIterator(cls, *args, **kwargs)
 
+    @classmethod
+    def delete_batch(cls, keys, concurrency=4, signals=False):
+        """Delete more than one item from the table, through parallel ``BatchWriteItem`` requests.
+
+        Example::
+
+            Thing.delete_batch([{"hash_key": "one"}, {"hash_key": "two"}])
+
+        :param keys: An iterable of dicts containing the hash key, and range key if used
+        :param int concurrency: The number of batch requests to keep in flight at once
+        :param bool signals: If set to True a ``pre_delete`` signal is sent for each key, with a partial instance, as
+                             it is queued.  The keys are deleted in chunks of ``concurrency`` full requests and a
+                             ``post_delete`` signal is sent for each key once its chunk has been written, so only one
+                             chunk of instances is held in memory at a time.
+        :returns: A :class:`~dynamorm.batch.BatchStats` summary of the writes
+
+        The ``post_batch_delete`` signal is sent with the keys of each chunk once it has been written, regardless of
+        ``signals``.
+        """
+        chunk_size = BATCH_WRITE_LIMIT * (concurrency or 1)
+        batch_signal = post_batch_delete.is_active(cls)
+        deleted = []
+        deleted_keys = []
+
+        def send_post_delete():
+            for instance in deleted:
+                post_delete.send(cls, instance=instance)
+            if deleted_keys:
+                post_batch_delete.send(cls, keys=list(deleted_keys))
+            del deleted[:]
+            del deleted_keys[:]
+
+        with batch_write(concurrency=concurrency) as batch:
+            for key in keys:
+                if signals:
+                    instance = cls.new_from_raw(key, partial=True, trusted=False)
+                    pre_delete.send(cls, instance=instance)
+                    deleted.append(instance)
+                if batch_signal:
+                    deleted_keys.append(cls._normalize_keys_in_kwargs(dict(key)))
+                batch.delete(cls, key)
+
+                if max(len(deleted), len(deleted_keys)) >= chunk_size:
+                    batch.flush()
+                    send_post_delete()
+
+        send_post_delete()
+        return batch.stats
+
     def to_dict(self, native=False):
         obj = {}
         for k in self.Schema.dynamorm_fields():
+            attr = getattr(self.__class__, k, None)
             try:
-                obj[k] = getattr(self, k)
+                if isinstance(attr, LazyAttribute):
+                    # compressed values that haven't been accessed are passed through without decompressing them
+                    obj[k] = attr.raw(self)
+                else:
+                    obj[k] = getattr(self, k)
             except AttributeError:
                 pass
-        return self.Schema.dynamorm_validate(obj, native=native)
+        if native:
+            return self.Schema.dynamorm_load(obj)
+        return self.Schema.dynamorm_dump(obj)
 
     def validate(self):
         """Validate this instance
@@ -455,32 +845,107 @@ class DynaModel(object):
 
         The attributes on the item go through validation, so this may raise :class:`ValidationError`.
 
+        When a :func:`~dynamorm.batch.write_buffer` is active, full saves without any kwargs are added to the buffer
+        instead of being written right away.
+
+        Partial saves of models that track their changes only send the paths that changed, including inside of maps,
+        see :mod:`dynamorm.tracking`.  Other models compare each field with its value when it was loaded and send the
+        whole fields that differ.
+
+        When the Table has a ``version_field`` saves only succeed if the version of the item in the table is still the
+        version of this instance, and increment it, otherwise :class:`~dynamorm.exceptions.ConditionFailed` is raised.
+        Instances without a version can only be saved as new items.  This lets concurrent writers detect lost updates
+        without reading the item before writing it::
+
+            thing = Thing.get(id="one")
+            thing.count += 1
+            try:
+                thing.save()
+            except ConditionFailed:
+                # someone else saved the thing since we read it
+                ...
+
+        Versioned saves are never added to a :func:`~dynamorm.batch.write_buffer`.
+
         TODO - Support unique, partial saves.
         """
         if not partial:
             pre_save.send(self.__class__, instance=self, put_kwargs=kwargs)
             as_dict = self.to_dict()
+            put_kwargs = kwargs
+            version = None
+            if self.Table.version_field:
+                condition, version = self._next_version()
+                as_dict[self.Table.version_field] = version
+                if not unique:
+                    put_kwargs = dict(kwargs, ConditionExpression=condition)
+
+            buffer = active_write_buffer()
             if unique:
-                resp = self.Table.put_unique(as_dict, **kwargs)
+                resp = self.Table.put_unique(as_dict, **put_kwargs)
+            elif buffer is not None and not put_kwargs:
+                resp = buffer.put(self.__class__, as_dict)
             else:
-                resp = self.Table.put(as_dict, **kwargs)
+                try:
+                    resp = self.Table.put(as_dict, **put_kwargs)
+                except botocore.exceptions.ClientError as exc:
+                    code = exc.response["Error"]["Code"]
+                    if (
+                        version is not None
+                        and code == "ConditionalCheckFailedException"
+                    ):
+                        raise ConditionFailed(exc)
+                    raise
             self._validated_data = as_dict
+            if version is not None:
+                setattr(self, self.Table.version_field, version)
+            if self.dynamorm_track_changes:
+                self._changes.clear()
+            self._written()
             post_save.send(self.__class__, instance=self, put_kwargs=kwargs)
             return resp
 
-        # Collect the fields to updated based on what's changed
-        # XXX: Deeply nested data will still put the whole top-most object that has changed
-        # TODO: Support the __ syntax to do deeply nested updates
-        updates = dict(
-            (k, getattr(self, k))
-            for k, v in six.iteritems(self._validated_data)
-            if getattr(self, k) != v
-        )
+        if self.dynamorm_track_changes:
+            updates = self._changes.updates(self)
+        else:
+            # Collect the fields to updated based on what's changed
+            # XXX: Deeply nested data will still put the whole top-most object that has changed
+            updates = dict(
+                (k, getattr(self, k))
+                for k, v in six.iteritems(self._validated_data)
+                if getattr(self, k) != v
+            )
 
         if not updates:
             log.warning("Partial save on %s produced nothing to update", self)
 
-        return self.update(update_item_kwargs=kwargs, return_all=return_all, **updates)
+        resp = self.update(update_item_kwargs=kwargs, return_all=return_all, **updates)
+        if self.dynamorm_track_changes:
+            self._changes.clear()
+        return resp
+
+    def _next_version(self):
+        """Return the condition that the version of this instance is still the version of the item in the table, and
+        the next version, for tables with a ``version_field``"""
+        field = self.Table.version_field
+        version = getattr(self, field, None)
+        if version is None:
+            return Q(**{field + "__not_exists": True}), 1
+        return Q(**{field: version}), version + 1
+
+    def _version_update(self, conditions, kwargs):
+        """Add the version increment to the kwargs of an update, for tables with a ``version_field``, and return the
+        conditions with the version condition added along with the next version"""
+        condition, version = self._next_version()
+        if version == 1:
+            kwargs[self.Table.version_field] = version
+        else:
+            kwargs[self.Table.version_field + "__plus"] = 1
+
+        conditions = conditions_to_expression(conditions)
+        if conditions is not None:
+            condition = condition & conditions
+        return condition, version
 
     def _add_hash_key_values(self, hash_dict):
         """Mutate a dictionary to add key: value pair for a hash and (if specified) sort key."""
@@ -526,6 +991,9 @@ class DynaModel(object):
 
         If your update conditions do not match then a dynamorm.exceptions.ConditionFailed exception will be raised.
 
+        When the Table has a ``version_field`` the update also requires the version of the item in the table to still
+        be the version of this instance, and increments it.  See ``save``.
+
         As long as the update succeeds the attrs on this instance will be updated to match their new values.  If you set
         ``return_all`` to true then we will update all of the attributes on the object with the current values in
         Dyanmo, rather than just those you updated.
@@ -535,6 +1003,9 @@ class DynaModel(object):
         is_noop = not kwargs
         resp = None
 
+        if self.Table.version_field and not is_noop:
+            conditions, _ = self._version_update(conditions, kwargs)
+
         self._add_hash_key_values(kwargs)
 
         pre_update.send(
@@ -561,14 +1032,16 @@ class DynaModel(object):
 
             # update our local attrs to match what we updated
             partial_model = self.new_from_raw(resp["Attributes"], partial=True)
-            for key, _ in six.iteritems(resp["Attributes"]):
-                # elsewhere in Dynamorm, models can be created without all fields (non-"strict" mode in Schematics),
-                # so we drop unknown keys here to be consistent
-                if hasattr(partial_model, key):
-                    val = getattr(partial_model, key)
-                    setattr(self, key, val)
-                    self._validated_data[key] = val
+            if return_all:
+                updated = [(key, None) for key in resp["Attributes"]]
+            else:
+                updated = six.iteritems(kwargs)
+            for key, value in updated:
+                self._apply_update(
+                    key.split("__"), value, resp["Attributes"], partial_model
+                )
 
+        self._written()
         post_update.send(
             self.__class__,
             instance=self,
@@ -578,6 +1051,63 @@ class DynaModel(object):
         )
         return resp
 
+    def _written(self):
+        """Keep the identity map of the active :class:`~dynamorm.session.Session` up to date after writing ``self``"""
+        session = active_session()
+        if session is not None:
+            session.saved(self)
+
+    def _apply_update(self, path, value, attributes, partial_model):
+        """Set the value at a double underscore path of an update on ``self``, from the attributes that the update
+        returned
+
+        Nested paths only return the values inside of their top level attribute, so they are set inside of the local
+        value of the attribute rather than replacing it.  Nested paths that are set to a value, rather than through a
+        function, are set to the value that was sent.
+        """
+        if len(path) > 1 and path[-1] in UPDATE_FUNCTION_TEMPLATES:
+            path, function = path[:-1], path[-1]
+        else:
+            function = None
+
+        key = path[0]
+        if function != "remove" and key not in attributes:
+            return
+
+        if len(path) == 1:
+            if function == "remove":
+                if hasattr(self, key):
+                    object.__delattr__(self, key)
+                self._validated_data.pop(key, None)
+            # elsewhere in Dynamorm, models can be created without all fields (non-"strict" mode in Schematics),
+            # so we drop unknown keys here to be consistent
+            elif hasattr(partial_model, key):
+                val = getattr(partial_model, key)
+                if self.dynamorm_track_changes:
+                    val = track(val, self._changes, (key,))
+                object.__setattr__(self, key, val)
+                self._validated_data[key] = val
+            return
+
+        # walk to the map that holds the updated path, in both our value and the returned one
+        local = getattr(self, key, None)
+        returned = getattr(partial_model, key, None)
+        for part in path[1:-1]:
+            if not isinstance(local, dict) or not isinstance(returned, dict):
+                return
+            local = local.get(part)
+            returned = returned.get(part)
+        if not isinstance(local, dict):
+            return
+
+        if function == "remove":
+            dict.pop(local, path[-1], None)
+        elif function is None or (isinstance(returned, dict) and path[-1] in returned):
+            val = value if function is None else returned[path[-1]]
+            if self.dynamorm_track_changes:
+                val = track(val, self._changes, tuple(path))
+            dict.__setitem__(local, path[-1], val)
+
     def delete(self):
         """Delete this record in the table."""
         delete_item_kwargs = {}
@@ -586,5 +1116,8 @@ class DynaModel(object):
 
         pre_delete.send(self.__class__, instance=self)
         resp = self.Table.delete_item(**delete_item_kwargs)
+        session = active_session()
+        if session is not None:
+            session.deleted_instance(self)
         post_delete.send(self.__class__, instance=self)
         return resp
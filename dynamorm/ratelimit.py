@@ -0,0 +1,328 @@
+"""Client side rate limiting paces the requests made to a table so they stay within its provisioned capacity.
+
+Rather than letting bursty jobs get throttled by DynamoDB (and then retried by botocore, which makes matters worse) you
+can set ``rate_limit`` on your inner ``Table`` class to a fraction of the provisioned ``read`` & ``write`` capacity.
+Each table, and each ``GlobalIndex`` with its own capacity, gets a token bucket for reads and one for writes:
+
+.. code-block:: python
+
+    class Thing(DynaModel):
+        class Table:
+            name = 'things'
+            hash_key = 'id'
+            read = 100
+            write = 20
+
+            # use at most 80% of our provisioned capacity
+            rate_limit = 0.8
+
+Before each request the expected number of capacity units is taken from the bucket, blocking until they are available.
+Requests are made with ``ReturnConsumedCapacity`` so that once the response arrives the bucket is corrected to match
+the capacity that was actually consumed, and the estimate for the next request of that type is refined.
+
+Buckets are shared by all threads in a process.  To share them between processes on the same host, for example the
+workers of a bulk import, also set ``rate_limit_path`` to a directory where the bucket state will be kept in files.
+"""
+
+import errno
+import logging
+import os
+import threading
+import time
+
+import six
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+#: The weight given to the most recent observation when refining capacity estimates
+ESTIMATE_WEIGHT = 0.2
+
+
+class TokenBucket(object):
+    """A thread safe token bucket
+
+    Tokens are added at ``rate`` per second, up to ``capacity``.  Requests for more tokens than are available block
+    until enough have accumulated.  A request for more tokens than the bucket can ever hold only waits for the bucket
+    to be full and then leaves it in debt, so that large requests still make progress while keeping the average rate.
+
+    :param float rate: The number of tokens added per second
+    :param float capacity: The maximum number of tokens held, defaults to one second worth
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self.lock = threading.Lock()
+        self.tokens = self.capacity
+        self.timestamp = time.time()
+
+    def _refill(self, tokens, timestamp):
+        now = time.time()
+        return min(self.capacity, tokens + max(0, now - timestamp) * self.rate), now
+
+    def _take(self, tokens):
+        """Take tokens if they are available, returning the number of seconds to wait before trying again"""
+        with self.lock:
+            self.tokens, self.timestamp = self._refill(self.tokens, self.timestamp)
+            needed = min(tokens, self.capacity)
+            if self.tokens >= needed:
+                self.tokens -= tokens
+                return 0
+            return (needed - self.tokens) / self.rate
+
+    def acquire(self, tokens=1):
+        """Take tokens from the bucket, blocking until they are available
+
+        :returns: The number of seconds spent waiting
+        """
+        waited = 0
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def adjust(self, tokens):
+        """Take tokens (or give them back, when negative) without waiting
+
+        This is used to correct the bucket once we know how much capacity a request really consumed.
+        """
+        with self.lock:
+            self.tokens, self.timestamp = self._refill(self.tokens, self.timestamp)
+            self.tokens = min(self.capacity, self.tokens - tokens)
+
+
+class FileTokenBucket(TokenBucket):
+    """A token bucket whose state is kept in a file, so that it can be shared by multiple processes on one host
+
+    The file is locked with ``flock`` while the state is read and written, so this is only available on platforms that
+    provide ``fcntl``.
+
+    :param str path: The file to keep the bucket state in
+    :param float rate: The number of tokens added per second
+    :param float capacity: The maximum number of tokens held, defaults to one second worth
+    """
+
+    def __init__(self, path, rate, capacity=None):
+        if fcntl is None:
+            raise RuntimeError("FileTokenBucket requires fcntl, which is not available")
+        super(FileTokenBucket, self).__init__(rate, capacity)
+        self.path = path
+
+    def _update(self, callback):
+        """Lock the state file, pass the current state to callback and store the state it returns"""
+        with open(self.path, "a+") as fd:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                fd.seek(0)
+                try:
+                    tokens, timestamp = (float(x) for x in fd.read().split())
+                except ValueError:
+                    # a new (or corrupt) file starts out full
+                    tokens, timestamp = self.capacity, time.time()
+
+                tokens, timestamp = self._refill(tokens, timestamp)
+                tokens, result = callback(tokens)
+
+                fd.seek(0)
+                fd.truncate()
+                fd.write("{0!r} {1!r}".format(tokens, timestamp))
+                fd.flush()
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _take(self, tokens):
+        def take(available):
+            needed = min(tokens, self.capacity)
+            if available >= needed:
+                return available - tokens, 0
+            return available, (needed - available) / self.rate
+
+        return self._update(take)
+
+    def adjust(self, tokens):
+        self._update(lambda available: (min(self.capacity, available - tokens), None))
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+_estimates = {}
+_estimates_lock = threading.Lock()
+
+
+def get_bucket(name, rate, capacity=None, path=None):
+    """Return the bucket with the given name, creating it if it doesn't exist yet
+
+    Buckets are kept in a registry so that every model using the same table shares the same buckets.  Since they are
+    shared, asking for an existing bucket with a different rate, capacity or path is an error.
+
+    :param str name: A unique name for the bucket
+    :param float rate: The number of tokens added per second
+    :param float capacity: The maximum number of tokens held, defaults to one second worth
+    :param str path: If supplied, a directory in which a :class:`FileTokenBucket` keeps its state
+    """
+    with _buckets_lock:
+        try:
+            bucket = _buckets[name]
+        except KeyError:
+            pass
+        else:
+            if (
+                bucket.rate != float(rate)
+                or bucket.capacity != float(capacity or rate)
+                or getattr(bucket, "path", None)
+                != (os.path.join(path, "{0}.bucket".format(name)) if path else None)
+            ):
+                raise ValueError(
+                    "The rate limit bucket {0} is already in use with a different configuration, all models using "
+                    "the same table must use the same rate_limit & rate_limit_path".format(
+                        name
+                    )
+                )
+            return bucket
+
+        if path:
+            try:
+                os.makedirs(path)
+            except OSError as exc:
+                if exc.errno != errno.EEXIST:
+                    raise
+            bucket = FileTokenBucket(
+                os.path.join(path, "{0}.bucket".format(name)), rate, capacity
+            )
+        else:
+            bucket = TokenBucket(rate, capacity)
+
+        _buckets[name] = bucket
+        return bucket
+
+
+class RateLimiter(object):
+    """Paces the reads & writes of a table, and its global indexes, to a fraction of their provisioned capacity
+
+    You don't normally create these yourself, tables with a ``rate_limit`` create one for themselves.
+
+    Reads from a global index consume capacity from the index.  Writes consume capacity from the table and then, based
+    on the consumed capacity reported back, from any global indexes they touched.  Local indexes share the capacity
+    of their table.
+
+    :param table: The :class:`~dynamorm.table.DynamoTable3` to limit
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def bucket(self, mode, index_name=None):
+        """Return the bucket for reads or writes (``mode``) on the table or one of its global indexes
+
+        None is returned when the table or index does not have any provisioned capacity for the mode.
+        """
+        owner = self.table
+        if index_name is not None:
+            index = self.table.indexes.get(index_name)
+            if index is not None and index.INDEX_TYPE == "GlobalIndex":
+                owner = index
+            else:
+                # local indexes use the capacity of the table
+                index_name = None
+
+        units = getattr(owner, mode)
+        if not units:
+            return None
+
+        name = "-".join(
+            part for part in (self.table.name, index_name, mode) if part is not None
+        )
+        return get_bucket(
+            name, units * self.table.rate_limit, path=self.table.rate_limit_path
+        )
+
+    def estimate(self, mode, operation, index_name=None):
+        """Return the number of capacity units we expect a single operation to consume
+
+        Like the buckets, estimates are shared by every model using the same table.
+        """
+        return _estimates.get((self.table.name, mode, operation, index_name), 1.0)
+
+    def acquire(self, mode, operation, index_name=None, count=1):
+        """Wait until there is enough capacity for ``count`` operations
+
+        :returns: The number of capacity units that were taken, which must be passed to :meth:`record`
+        """
+        estimated = self.estimate(mode, operation, index_name) * count
+
+        bucket = self.bucket(mode, index_name)
+        if bucket is not None:
+            waited = bucket.acquire(estimated)
+            if waited:
+                log.debug(
+                    "Waited %.2f seconds for %s capacity on %s",
+                    waited,
+                    mode,
+                    self.table.name,
+                )
+
+        if mode == "write":
+            # writes also consume capacity on our global indexes, but we only know how much once they are done, so we
+            # just wait for any of them that are in debt
+            for index in six.itervalues(self.table.indexes):
+                index_bucket = self.bucket(mode, index.name)
+                if index_bucket is not None and index_bucket is not bucket:
+                    index_bucket.acquire(0)
+
+        return estimated
+
+    def record(
+        self, mode, operation, estimated, consumed_capacity, index_name=None, count=1
+    ):
+        """Correct the buckets once we know the capacity that an operation really consumed
+
+        :param float estimated: The value returned from :meth:`acquire`
+        :param dict consumed_capacity: The ``ConsumedCapacity`` for our table from the response, if any
+        """
+        if not consumed_capacity:
+            return
+
+        bucket = self.bucket(mode, index_name)
+        if bucket is not None:
+            bucket.adjust(-estimated)
+
+        # With ReturnConsumedCapacity=INDEXES we get a breakdown between the table and the indexes, otherwise we only
+        # have the total to go on
+        consumed = {}
+        try:
+            consumed[None] = consumed_capacity["Table"]["CapacityUnits"]
+        except KeyError:
+            consumed[None] = consumed_capacity.get("CapacityUnits", 0)
+        else:
+            # local indexes consume the capacity of the table
+            for index_capacity in six.itervalues(
+                consumed_capacity.get("LocalSecondaryIndexes") or {}
+            ):
+                consumed[None] += index_capacity["CapacityUnits"]
+        for name, index_capacity in six.iteritems(
+            consumed_capacity.get("GlobalSecondaryIndexes") or {}
+        ):
+            consumed[name] = index_capacity["CapacityUnits"]
+
+        for name, units in six.iteritems(consumed):
+            consumed_bucket = self.bucket(mode, name)
+            if consumed_bucket is not None:
+                consumed_bucket.adjust(units)
+
+        observed = consumed.get(index_name, consumed[None])
+        if count and observed:
+            key = (self.table.name, mode, operation, index_name)
+            with _estimates_lock:
+                previous = _estimates.get(key, 1.0)
+                _estimates[key] = (1 - ESTIMATE_WEIGHT) * previous + ESTIMATE_WEIGHT * (
+                    float(observed) / count
+                )
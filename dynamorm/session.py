@@ -0,0 +1,302 @@
+"""Sessions hold an identity map of the instances loaded while they're active, and write the changes made to them as a
+unit of work.
+
+Within a session every model instance is loaded at most once for each primary key: repeated ``get`` calls, such as from
+relationships and service layers that each look up the same item, return the same instance without another round
+trip, and ``get_batch``, query & scan results return the instances that are already known in place of the ones they
+load.  Keys that don't exist are remembered too.
+
+.. code-block:: python
+
+    from dynamorm import Session
+
+    with Session() as session:
+        user = User.get(name="alice")
+        assert User.get(name="alice") is user
+
+        user.email = "alice@example.com"
+        session.add(Thread(forum_name="general", subject="Hello"))
+        session.delete(old_reply)
+
+When the context exits the new instances, the instances that changed since they were loaded and the deletes are
+written by :meth:`Session.commit`, through ``BatchWriteItem`` requests or, with ``transactional=True``, in a single
+transaction.  If the context exits because of an exception nothing is written.
+
+Instances that are saved, updated or deleted directly while the session is active are kept up to date in the identity
+map, and are only written again if they change afterwards.
+
+Changes to instances of models that track their changes, see :mod:`dynamorm.tracking`, are found through their
+trackers and written as updates in transactional sessions.  Other instances are compared with a copy of their data
+taken when they were loaded, and are written whole.
+
+Instances of models with a ``version_field`` on their Table are written with the same version check as ``save``, see
+:meth:`~dynamorm.model.DynaModel.save`.  Since batch requests can't have conditions they are saved one at a time, before
+the batch requests, when the session isn't transactional.
+
+Sessions are per thread, the session that is active in one thread isn't used by any other thread.
+"""
+
+import logging
+import threading
+
+import six
+
+from .batch import batch_write, hashable_key
+from .signals import post_delete, post_save, pre_delete, pre_save
+from .transactions import transaction
+
+log = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def active_session():
+    """Return the :class:`Session` that is active in the current thread, or None"""
+    try:
+        return _local.sessions[-1]
+    except (AttributeError, IndexError):
+        return None
+
+
+class Session(object):
+    """An identity map of model instances, and the unit of work that writes the changes made to them
+
+    :param bool transactional: Write the changes in a single transaction when committing, rather than through batch
+                               requests.  DynamoDB accepts at most 100 operations in a transaction.
+    :param int concurrency: The number of batch requests to keep in flight when committing, see
+                            :func:`~dynamorm.batch.batch_write`
+    """
+
+    def __init__(self, transactional=False, concurrency=None):
+        self.transactional = transactional
+        self.concurrency = concurrency
+        # the instance, or None when it doesn't exist, by model and key
+        self.identity_map = {}
+        # the data of each instance that isn't tracked when it was loaded or last written, by id of the instance
+        self.snapshots = {}
+        self.new = {}
+        self.deleted = {}
+
+    def __enter__(self):
+        if not hasattr(_local, "sessions"):
+            _local.sessions = []
+        _local.sessions.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.commit()
+        finally:
+            _local.sessions.remove(self)
+            self.rollback()
+
+    @staticmethod
+    def identity(model, key):
+        """Return the key of the identity map for a model and a key dict"""
+        return model, hashable_key(key)
+
+    @staticmethod
+    def instance_identity(instance):
+        """Return the key of the identity map for an instance"""
+        key = {}
+        instance._add_hash_key_values(key)
+        return Session.identity(
+            instance.__class__, instance._normalize_keys_in_kwargs(key)
+        )
+
+    def _register(self, identity, instance):
+        """Add an instance that matches what's stored in the table to the identity map"""
+        self.identity_map[identity] = instance
+        if instance is not None and not instance.dynamorm_track_changes:
+            self.snapshots[id(instance)] = instance.to_dict()
+
+    def get(self, model, consistent=False, trusted=None, **kwargs):
+        """Get an item, from the identity map when it's already known
+
+        ``Model.get`` calls this while the session is active.
+        """
+        kwargs = model._normalize_keys_in_kwargs(kwargs)
+        identity = self.identity(model, kwargs)
+        try:
+            return self.identity_map[identity]
+        except KeyError:
+            pass
+
+        item = model.Table.get(consistent=consistent, **kwargs)
+        instance = model.new_from_raw(item, trusted=trusted)
+        self._register(identity, instance)
+        return instance
+
+    def get_batch(self, model, keys, consistent=False, trusted=None):
+        """Generator that gets more than one item, only reading the items that aren't already known
+
+        ``Model.get_batch`` calls this while the session is active, unless specific attributes are requested.
+        """
+        missing = {}
+        for key in keys:
+            key = model._normalize_keys_in_kwargs(dict(key))
+            identity = self.identity(model, key)
+            if identity in self.identity_map:
+                if self.identity_map[identity] is not None:
+                    yield self.identity_map[identity]
+            elif identity not in missing:
+                missing[identity] = key
+
+        if missing:
+            pages = model.Table.get_batch_pages(
+                list(missing.values()), consistent=consistent
+            )
+            for page in pages:
+                # new_from_raw_page adds the loaded instances to the identity map
+                for instance in model.new_from_raw_page(page, trusted=trusted):
+                    if not isinstance(instance, Exception):
+                        missing.pop(self.instance_identity(instance), None)
+                    yield instance
+
+        for identity in missing:
+            self.identity_map[identity] = None
+
+    def merge_page(self, instances):
+        """Replace the instances of a page with the ones already in the identity map, adding the others to it
+
+        :param list instances: The instances, or ValidationErrors, that were loaded
+        """
+        for index, instance in enumerate(instances):
+            if isinstance(instance, Exception):
+                continue
+            identity = self.instance_identity(instance)
+            existing = self.identity_map.get(identity)
+            if existing is not None:
+                instances[index] = existing
+            elif identity not in self.deleted:
+                self._register(identity, instance)
+        return instances
+
+    def add(self, instance):
+        """Add an instance that will be put to the table when committing"""
+        identity = self.instance_identity(instance)
+        self.deleted.pop(identity, None)
+        self.identity_map[identity] = instance
+        self.new[identity] = instance
+
+    def delete(self, instance):
+        """Delete an instance from the table when committing"""
+        identity = self.instance_identity(instance)
+        self.new.pop(identity, None)
+        self.identity_map[identity] = None
+        self.snapshots.pop(id(instance), None)
+        self.deleted[identity] = instance
+
+    def is_dirty(self, instance):
+        """Return True if an instance in the identity map changed since it was loaded or last written"""
+        if instance.dynamorm_track_changes:
+            return len(instance._changes) > 0
+        return instance.to_dict() != self.snapshots.get(id(instance))
+
+    @property
+    def dirty(self):
+        """The instances in the identity map that changed since they were loaded or last written"""
+        return [
+            instance
+            for identity, instance in six.iteritems(self.identity_map)
+            if instance is not None
+            and identity not in self.new
+            and self.is_dirty(instance)
+        ]
+
+    def saved(self, instance):
+        """Called when an instance is saved or updated directly, to keep the identity map up to date"""
+        identity = self.instance_identity(instance)
+        self.deleted.pop(identity, None)
+        self.new.pop(identity, None)
+        self._register(identity, instance)
+
+    def deleted_instance(self, instance):
+        """Called when an instance is deleted directly, to keep the identity map up to date"""
+        identity = self.instance_identity(instance)
+        self.new.pop(identity, None)
+        self.deleted.pop(identity, None)
+        self.identity_map[identity] = None
+        self.snapshots.pop(id(instance), None)
+
+    def commit(self):
+        """Write the new & changed instances and the deletes
+
+        The ``pre_save`` & ``post_save`` signals are sent for every instance that is written, and the ``pre_delete`` &
+        ``post_delete`` signals for every delete.
+        """
+        puts = list(self.new.values()) + self.dirty
+        deletes = list(self.deleted.values())
+        if not puts and not deletes:
+            return
+
+        if not self.transactional:
+            # batch writes can't have conditions, so instances of versioned models are saved on their own
+            for instance in puts:
+                if instance.Table.version_field:
+                    instance.save()
+            puts = [instance for instance in puts if not instance.Table.version_field]
+
+        for instance in puts:
+            pre_save.send(instance.__class__, instance=instance, put_kwargs={})
+        for instance in deletes:
+            pre_delete.send(instance.__class__, instance=instance)
+
+        if self.transactional:
+            with transaction() as txn:
+                versions = [self._transact_put(txn, instance) for instance in puts]
+                for instance in deletes:
+                    txn.delete(instance)
+            for instance, version in zip(puts, versions):
+                if version is not None:
+                    setattr(instance, instance.Table.version_field, version)
+        else:
+            with batch_write(concurrency=self.concurrency) as batch:
+                for instance in puts:
+                    batch.put(instance)
+                for instance in deletes:
+                    batch.delete(instance)
+        log.debug("Session wrote %d instances and %d deletes", len(puts), len(deletes))
+
+        self.new.clear()
+        self.deleted.clear()
+        for instance in puts:
+            if instance.dynamorm_track_changes:
+                instance._changes.clear()
+            self._register(self.instance_identity(instance), instance)
+            post_save.send(instance.__class__, instance=instance, put_kwargs={})
+        for instance in deletes:
+            post_delete.send(instance.__class__, instance=instance)
+
+    def _transact_put(self, txn, instance):
+        """Add the write of an instance to a transaction, returning its next version when its model is versioned"""
+        identity = self.instance_identity(instance)
+        field = instance.Table.version_field
+        condition = version = None
+
+        if not instance.dynamorm_track_changes or identity in self.new:
+            item = instance.to_dict()
+            if field:
+                condition, version = instance._next_version()
+                item[field] = version
+            txn.put(instance.__class__, item, conditions=condition, validate=False)
+            return version
+
+        # only the paths that changed are written for instances that track their changes
+        updates = instance._changes.updates(instance)
+        if field:
+            condition, version = instance._version_update(None, updates)
+        updates.update(identity[1])
+        txn.update(instance.__class__, conditions=condition, **updates)
+        return version
+
+    def rollback(self):
+        """Forget the identity map, and the new instances and deletes that haven't been written
+
+        Changes made to the instances aren't undone, but they are no longer written when committing.
+        """
+        self.identity_map.clear()
+        self.snapshots.clear()
+        self.new.clear()
+        self.deleted.clear()
@@ -0,0 +1,426 @@
+"""Sharding splits items that are larger than DynamoDB allows across multiple rows of the same table.
+
+Set ``shard_items`` on the inner ``Table`` of a model with a string range key:
+
+.. code-block:: python
+
+    class Document(DynaModel):
+        class Table:
+            name = "documents"
+            hash_key = "owner"
+            range_key = "name"
+            read = 5
+            write = 5
+
+            shard_items = True
+
+When an item that is put is larger than the ``shard_size`` of the table its largest attributes are moved out of the
+item and stored, compressed, in chunk rows under the same hash key.  The range key of each chunk row is the range key
+of the item with :data:`CHUNK_SUFFIX` and the number of the chunk appended, so range keys containing the suffix are
+reserved.  Key attributes, including those of the indexes, always stay in the item itself.
+
+The item and its chunk rows are written in a single transaction.  ``get`` reads the item with a plain ``GetItem``, and
+only when it was sharded are its chunk rows read, through a query bounded to their range keys.  ``query`` & ``scan``
+results fetch the chunks of the sharded items they find while skipping the chunk rows themselves.  Every row of a sharded item carries the same token, so a read that raced a write is detected and the
+rows are read again as a consistent snapshot through ``TransactGetItems``.
+
+Items that need to be sharded are written in their own transaction even when they're put in a batch, and deleting
+items through batch requests leaves their chunk rows behind.  Those rows are never read, but they still take up
+storage.  Updates only change the item itself, so attributes that have been moved to the chunk rows should be changed
+by putting the whole item again.
+"""
+
+import base64
+import json
+import logging
+import uuid
+import zlib
+
+import six
+from boto3.dynamodb.conditions import Attr, ConditionBase, Key
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+
+from .capacity import ITEM_SIZE_LIMIT, item_size
+from .exceptions import ItemTooLarge, ShardedItemError
+from .transactions import TRANSACT_ITEMS_LIMIT, Transaction, transact_get_items
+
+log = logging.getLogger(__name__)
+
+#: The suffix of the range keys of chunk rows, which is followed by the number of the chunk
+CHUNK_SUFFIX = "#dynamorm-chunk#"
+
+#: The attribute of a sharded item with its number of chunk rows
+CHUNKS_ATTRIBUTE = "_dynamorm_chunks"
+
+#: The attribute with the token that every row of a sharded item shares
+TOKEN_ATTRIBUTE = "_dynamorm_token"
+
+#: The attribute of a chunk row with its part of the compressed attributes
+DATA_ATTRIBUTE = "_dynamorm_data"
+
+#: The default size, in bytes, above which items are sharded
+SHARD_SIZE = ITEM_SIZE_LIMIT - 16 * 1024
+
+#: The maximum total size of the items in a TransactWriteItems request
+TRANSACTION_SIZE_LIMIT = 4 * 1024 * 1024
+
+#: The number of times the rows of an item are read again when they don't match
+READ_ATTEMPTS = 3
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def chunk_range_key(range_value, index):
+    """Return the range key of a chunk row of the item with the given range key"""
+    return "{0}{1}{2:04d}".format(range_value, CHUNK_SUFFIX, index)
+
+
+def is_chunk(table, item):
+    """Returns True if the item read from a table is a chunk row"""
+    range_value = item.get(table.range_key)
+    return isinstance(range_value, six.string_types) and CHUNK_SUFFIX in range_value
+
+
+def _json_default(value):
+    if isinstance(value, Binary):
+        return base64.b64encode(value.value).decode("ascii")
+    raise TypeError("{0!r} is not JSON serializable".format(value))
+
+
+def _decode_binary(value):
+    """Turn the base64 encoded binary values of a serialized attribute back into bytes"""
+    if "B" in value:
+        return {"B": base64.b64decode(value["B"])}
+    if "BS" in value:
+        return {"BS": [base64.b64decode(v) for v in value["BS"]]}
+    if "M" in value:
+        return {"M": dict((k, _decode_binary(v)) for k, v in six.iteritems(value["M"]))}
+    if "L" in value:
+        return {"L": [_decode_binary(v) for v in value["L"]]}
+    return value
+
+
+def encode(attributes):
+    """Encode attributes as compressed DynamoDB JSON"""
+    data = json.dumps(
+        dict(
+            (name, _serializer.serialize(value))
+            for name, value in six.iteritems(attributes)
+        ),
+        separators=(",", ":"),
+        default=_json_default,
+    )
+    return zlib.compress(data.encode("utf-8"))
+
+
+def decode(data):
+    """Decode the attributes encoded by :func:`encode`"""
+    attributes = json.loads(zlib.decompress(data).decode("utf-8"))
+    return dict(
+        (name, _deserializer.deserialize(_decode_binary(value)))
+        for name, value in six.iteritems(attributes)
+    )
+
+
+def shard_size(table):
+    """Return the size above which items put into a table are sharded"""
+    return table.shard_size or SHARD_SIZE
+
+
+def should_shard(table, item):
+    """Returns True if an item is larger than the shard size of a table"""
+    return item_size(item) > shard_size(table)
+
+
+def split_item(table, item, token):
+    """Split an item into the item to store, which keeps its keys and smallest attributes, and its chunk rows
+
+    :returns: A tuple of the item and a list of the chunk rows
+    """
+    pinned = set([table.hash_key, table.range_key])
+    for index in six.itervalues(table.indexes):
+        pinned.update([index.hash_key, index.range_key])
+
+    size = shard_size(table)
+    main = dict(item)
+    main[CHUNKS_ATTRIBUTE] = 0
+    main[TOKEN_ATTRIBUTE] = token
+
+    overflow = {}
+    for name in sorted(
+        (name for name in item if name not in pinned),
+        key=lambda name: item_size({name: item[name]}),
+        reverse=True,
+    ):
+        if item_size(main) <= size:
+            break
+        overflow[name] = main.pop(name)
+
+    if not overflow or item_size(main) > size:
+        raise ItemTooLarge(
+            "The keys of the item are larger than the shard size of {0}".format(
+                table.name
+            )
+        )
+
+    hash_value = item[table.hash_key]
+    range_value = item[table.range_key]
+    overhead = item_size(
+        {
+            table.hash_key: hash_value,
+            table.range_key: chunk_range_key(range_value, 0),
+            TOKEN_ATTRIBUTE: token,
+            DATA_ATTRIBUTE: Binary(b""),
+        }
+    )
+    piece_size = size - overhead
+
+    data = encode(overflow)
+    chunks = [
+        {
+            table.hash_key: hash_value,
+            table.range_key: chunk_range_key(range_value, index),
+            TOKEN_ATTRIBUTE: token,
+            DATA_ATTRIBUTE: Binary(data[start : start + piece_size]),
+        }
+        for index, start in enumerate(six.moves.range(0, len(data), piece_size))
+    ]
+    main[CHUNKS_ATTRIBUTE] = len(chunks)
+    return main, chunks
+
+
+def join_item(main, chunks):
+    """Join a sharded item with its chunk rows
+
+    :param dict main: The sharded item
+    :param list chunks: The chunk rows of the item, in order, with None for chunks that were not found
+    :returns: The whole item, or None if the chunks don't belong to the item because they were read while it was
+              being written
+    """
+    token = main[TOKEN_ATTRIBUTE]
+    count = int(main[CHUNKS_ATTRIBUTE])
+    if len(chunks) != count or any(
+        chunk is None or chunk.get(TOKEN_ATTRIBUTE) != token for chunk in chunks
+    ):
+        return None
+
+    item = decode(b"".join(bytes(chunk[DATA_ATTRIBUTE].value) for chunk in chunks))
+    item.update(main)
+    del item[CHUNKS_ATTRIBUTE]
+    del item[TOKEN_ATTRIBUTE]
+    return item
+
+
+def _merge_condition(request, kwargs):
+    """Add a ConditionExpression given to ``put`` as a string, along with its names & values, to a request"""
+    request["ConditionExpression"] = "({0}) AND ({1})".format(
+        request["ConditionExpression"], kwargs["ConditionExpression"]
+    )
+    request["ExpressionAttributeNames"].update(
+        kwargs.get("ExpressionAttributeNames") or {}
+    )
+    if kwargs.get("ExpressionAttributeValues"):
+        request.setdefault("ExpressionAttributeValues", {}).update(
+            kwargs["ExpressionAttributeValues"]
+        )
+
+
+def put_item(table, item, **kwargs):
+    """Put an item into a sharded table, sharding it when it's larger than the ``shard_size`` of the table
+
+    Items that are small enough are put as usual, and any chunk rows from an earlier, sharded, version of the item are
+    deleted afterwards.  Sharded items are written in a transaction, where only the ``ConditionExpression`` (and its
+    names & values) are supported from the kwargs.
+    """
+    key = {table.hash_key: item[table.hash_key], table.range_key: item[table.range_key]}
+
+    if not should_shard(table, item):
+        kwargs.setdefault("ReturnValues", "ALL_OLD")
+        response = table.call_limited(
+            "write", "put", table.table.put_item, Item=item, **kwargs
+        )
+        delete_chunks(table, response.get("Attributes"))
+        return response
+
+    token = uuid.uuid4().hex
+    main, chunks = split_item(table, item, token)
+    for row in [main] + chunks:
+        table.check_item_size(row)
+
+    old = (
+        table.call_limited(
+            "read",
+            "get",
+            table.table.get_item,
+            Key=key,
+            ConsistentRead=True,
+            ProjectionExpression="#chunks, #token",
+            ExpressionAttributeNames={
+                "#chunks": CHUNKS_ATTRIBUTE,
+                "#token": TOKEN_ATTRIBUTE,
+            },
+        ).get("Item")
+        or {}
+    )
+    old_count = int(old.get(CHUNKS_ATTRIBUTE, 0))
+
+    stale = [
+        dict(key, **{table.range_key: chunk_range_key(key[table.range_key], index)})
+        for index in six.moves.range(len(chunks), old_count)
+    ]
+    if len(chunks) + len(stale) + 1 > TRANSACT_ITEMS_LIMIT or (
+        item_size(main) + sum(item_size(chunk) for chunk in chunks)
+        > TRANSACTION_SIZE_LIMIT
+    ):
+        raise ItemTooLarge(
+            "The item is too large to be written to {0} in a single transaction".format(
+                table.name
+            )
+        )
+
+    # the condition on the token of the item makes sure that no other write changed its chunks since we read it
+    if TOKEN_ATTRIBUTE in old:
+        condition = Attr(TOKEN_ATTRIBUTE).eq(old[TOKEN_ATTRIBUTE])
+    else:
+        condition = Attr(TOKEN_ATTRIBUTE).not_exists()
+
+    user_condition = kwargs.get("ConditionExpression")
+    if isinstance(user_condition, ConditionBase):
+        condition = condition & user_condition
+
+    model = table._model
+    txn = Transaction()
+    txn._add(model, "Put", {"Item": main}, condition)
+    if isinstance(user_condition, six.string_types):
+        _merge_condition(txn.items[-1]["Put"], kwargs)
+    for chunk in chunks:
+        txn._add(model, "Put", {"Item": chunk})
+    for stale_key in stale:
+        txn._add(model, "Delete", {"Key": stale_key})
+    txn.commit()
+    return {}
+
+
+def delete_chunks(table, item):
+    """Delete the chunk rows of an item, if it was sharded"""
+    if not item or CHUNKS_ATTRIBUTE not in item:
+        return
+
+    with table.table.batch_writer() as writer:
+        for index in six.moves.range(int(item[CHUNKS_ATTRIBUTE])):
+            writer.delete_item(
+                Key={
+                    table.hash_key: item[table.hash_key],
+                    table.range_key: chunk_range_key(item[table.range_key], index),
+                }
+            )
+
+
+def delete_item(table, key):
+    """Delete an item from a sharded table, along with its chunk rows"""
+    response = table.call_limited(
+        "write", "delete", table.table.delete_item, Key=key, ReturnValues="ALL_OLD"
+    )
+    delete_chunks(table, response.get("Attributes"))
+    return response
+
+
+def _get_main(table, key, consistent):
+    """Read the item itself, without its chunk rows"""
+    return table.call_limited(
+        "read",
+        "get",
+        table.table.get_item,
+        Key=key,
+        ConsistentRead=consistent,
+    ).get("Item")
+
+
+def _query_chunks(table, key, count, consistent):
+    """Read the chunk rows of an item with a query that is bounded to the range keys of its chunks"""
+    range_value = key[table.range_key]
+    query_kwargs = {
+        "KeyConditionExpression": Key(table.hash_key).eq(key[table.hash_key])
+        & Key(table.range_key).between(
+            chunk_range_key(range_value, 0), chunk_range_key(range_value, count - 1)
+        ),
+        "ConsistentRead": consistent,
+    }
+    while True:
+        response = table.call_limited(
+            "read", "query", table.table.query, **query_kwargs
+        )
+        for row in response["Items"]:
+            yield row
+        if "LastEvaluatedKey" not in response:
+            return
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def get_item(table, key, consistent=False, main=None):
+    """Get an item from a sharded table, joining it with its chunk rows
+
+    The item is read with a plain ``GetItem``, and only when it was sharded are its chunk rows read as well.
+
+    :param dict main: The item, when it has already been read by a query, scan or batch get
+    :raises ShardedItemError: If the chunk rows of the item still don't match it after reading them again
+    """
+    range_value = key[table.range_key]
+    if main is None:
+        main = _get_main(table, key, consistent)
+
+    rows = None
+    for _ in six.moves.range(READ_ATTEMPTS):
+        if main is None or CHUNKS_ATTRIBUTE not in main:
+            return main
+
+        count = int(main[CHUNKS_ATTRIBUTE])
+        chunk_keys = [
+            dict(key, **{table.range_key: chunk_range_key(range_value, index)})
+            for index in six.moves.range(count)
+        ]
+        if rows is None:
+            rows = dict(
+                (row[table.range_key], row)
+                for row in _query_chunks(table, key, count, consistent)
+            )
+        item = join_item(main, [rows.get(k[table.range_key]) for k in chunk_keys])
+        if item is not None:
+            return item
+
+        # the rows were read while the item was being written, so read them again as a consistent snapshot
+        log.debug("Reading the chunks of %s from %s again", key, table.name)
+        model = table._model
+        items = transact_get_items([(model, k) for k in [key] + chunk_keys])
+        main = items[0]
+        rows = dict((row[table.range_key], row) for row in items[1:] if row)
+
+    raise ShardedItemError(
+        "The chunks of {0} in {1} don't match the item".format(key, table.name)
+    )
+
+
+def load_page(table, response, consistent=False):
+    """Join the sharded items in a page of query or scan results with their chunk rows, and drop the chunk rows"""
+    items = []
+    for item in response["Items"]:
+        if is_chunk(table, item):
+            continue
+        if CHUNKS_ATTRIBUTE in item:
+            item = get_item(
+                table,
+                {
+                    table.hash_key: item[table.hash_key],
+                    table.range_key: item[table.range_key],
+                },
+                consistent=consistent,
+            )
+            if item is None:
+                continue
+        items.append(item)
+
+    response = dict(response)
+    response["Items"] = items
+    response["Count"] = len(items)
+    return response
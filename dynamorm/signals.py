@@ -15,10 +15,130 @@ To use the signals you ``connect`` a receiver function to the signals you're int
 
 See the `blinker`_ documentation for more details.
 
+Models send signals for every instance that's loaded, saved, updated or deleted, so sending them has to be cheap when
+nothing listens.  Each signal remembers whether any receivers are connected for a sender, which is forgotten whenever
+receivers connect or disconnect, and sending a signal that has no receivers for its sender returns right away.
+
+Each signal also counts how often it was sent, how often that was skipped because nothing listened, how many receivers
+were called and the time spent calling them, see :func:`signal_stats`:
+
+.. code-block:: python
+
+    from dynamorm.signals import reset_signal_stats, signal_stats
+
+    reset_signal_stats()
+    list(Book.scan())
+    for name, stats in signal_stats().items():
+        log.info("%s: %r", name, stats)
+
 .. _blinker: https://pythonhosted.org/blinker/
 """
 
-from blinker import signal
+import threading
+from timeit import default_timer
+
+from blinker import ANY, NamedSignal, Namespace
+
+
+class SignalStats(object):
+    """The profiling counters of a signal
+
+    :ivar int sends: The number of times the signal was sent
+    :ivar int skipped: The number of sends that returned right away because no receivers were connected for the sender
+    :ivar int receivers: The number of receivers called
+    :ivar float seconds: The time spent sending the signal to its receivers
+    """
+
+    __slots__ = ("sends", "skipped", "receivers", "seconds")
+
+    def __init__(self):
+        self.reset()
+
+    def __repr__(self):
+        return (
+            "<SignalStats sends={0} skipped={1} receivers={2} seconds={3:.6f}>".format(
+                self.sends, self.skipped, self.receivers, self.seconds
+            )
+        )
+
+    def reset(self):
+        self.sends = 0
+        self.skipped = 0
+        self.receivers = 0
+        self.seconds = 0.0
+
+
+class Signal(NamedSignal):
+    """A blinker signal that skips sending when no receivers are connected for the sender, and profiles its sends"""
+
+    def __init__(self, name, doc=None):
+        super(Signal, self).__init__(name, doc)
+        self.stats = SignalStats()
+        # whether any receivers are connected, by id of the sender, which is cleared when receivers (dis)connect
+        self._active = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _changed(self):
+        with self._lock:
+            self._generation += 1
+            self._active.clear()
+
+    def connect(self, receiver, sender=ANY, weak=True):
+        try:
+            return super(Signal, self).connect(receiver, sender=sender, weak=weak)
+        finally:
+            self._changed()
+
+    def _disconnect(self, receiver_id, sender_id):
+        # disconnect and the cleanup of weakly referenced receivers both go through here
+        super(Signal, self)._disconnect(receiver_id, sender_id)
+        self._changed()
+
+    def is_active(self, sender):
+        """Return True if any receivers are connected for the sender, or for any sender"""
+        try:
+            return self._active[id(sender)]
+        except KeyError:
+            pass
+
+        generation = self._generation
+        active = any(True for _ in self.receivers_for(sender))
+        with self._lock:
+            if generation == self._generation:
+                self._active[id(sender)] = active
+        return active
+
+    def send(self, *sender, **kwargs):
+        stats = self.stats
+        stats.sends += 1
+
+        active = False
+        if self.receivers:
+            active = self._active.get(id(sender[0] if sender else None))
+            if active is None:
+                active = self.is_active(sender[0] if sender else None)
+        if not active:
+            stats.skipped += 1
+            return []
+
+        start = default_timer()
+        try:
+            results = super(Signal, self).send(*sender, **kwargs)
+        finally:
+            stats.seconds += default_timer() - start
+        stats.receivers += len(results)
+        return results
+
+
+#: The namespace of the dynamorm signals
+namespace = Namespace()
+
+
+def signal(name, doc=None):
+    """Return the dynamorm signal with the given name, created in our namespace the first time"""
+    return namespace.setdefault(name, Signal(name, doc))
+
 
 model_prepared = signal(
     "dynamorm.model_prepared",
@@ -111,3 +231,55 @@ post_delete = signal(
     :param: instance: The deleted model instance.
     """,
 )
+
+pre_batch_save = signal(
+    "dynamorm.pre_batch_save",
+    doc="""Sent before saving items through ``put_batch``, once for all of the items.
+
+    :param: sender: The model class.
+    :param: list items: The validated items, as dicts, that are about to be put.
+    """,
+)
+
+post_batch_save = signal(
+    "dynamorm.post_batch_save",
+    doc="""Sent after saving items through ``put_batch``, once for all of the items.
+
+    :param: sender: The model class.
+    :param: list items: The validated items, as dicts, that were put.
+    """,
+)
+
+post_batch_delete = signal(
+    "dynamorm.post_batch_delete",
+    doc="""Sent after deleting items through ``delete_batch``, or ``.delete()`` on query & scan results, once for
+    each chunk of keys that has been deleted.
+
+    :param: sender: The model class.
+    :param: list keys: The keys, as dicts, that were deleted.
+    """,
+)
+
+post_page_load = signal(
+    "dynamorm.post_page_load",
+    doc="""Sent once a page of items has been loaded as model instances, by query & scan results and ``get_batch``.
+
+    :param: sender: The model class.
+    :param: list instances: The instances that were loaded, leaving out items that failed validation.
+    """,
+)
+
+
+def signal_stats():
+    """Return the :class:`SignalStats` of each of the dynamorm signals, by name"""
+    return dict(
+        (name, value.stats)
+        for name, value in list(namespace.items())
+        if isinstance(value, Signal)
+    )
+
+
+def reset_signal_stats():
+    """Reset the profiling counters of all of the dynamorm signals"""
+    for stats in signal_stats().values():
+        stats.reset()
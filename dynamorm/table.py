@@ -4,25 +4,48 @@
 The attributes you define on your inner ``Table`` class map to underlying boto data structures.  This mapping is
 expressed through the following data model:
 
-=========  ========  ====  ===========
-Attribute  Required  Type  Description
-=========  ========  ====  ===========
-name       True      str   The name of the table, as stored in Dynamo.
+=================  ========  =====  ===========
+Attribute          Required  Type   Description
+=================  ========  =====  ===========
+name               True      str    The name of the table, as stored in Dynamo.
 
-hash_key   True      str   The name of the field to use as the hash key.
-                           It must exist in the schema.
+hash_key           True      str    The name of the field to use as the hash key.
+                                    It must exist in the schema.
 
-range_key  False     str   The name of the field to use as the range_key, if one is used.
-                           It must exist in the schema.
+range_key          False     str    The name of the field to use as the range_key, if one is used.
+                                    It must exist in the schema.
 
-read       True      int   The provisioned read throughput.
+read               True      int    The provisioned read throughput.
 
-write      True      int   The provisioned write throughput.
+write              True      int    The provisioned write throughput.
 
-stream     False     str   The stream view type, either None or one of:
-                           'NEW_IMAGE'|'OLD_IMAGE'|'NEW_AND_OLD_IMAGES'|'KEYS_ONLY'
+stream             False     str    The stream view type, either None or one of:
+                                    'NEW_IMAGE'|'OLD_IMAGE'|'NEW_AND_OLD_IMAGES'|'KEYS_ONLY'
 
-=========  ========  ====  ===========
+rate_limit         False     float  When set, reads & writes are paced on the client to this fraction
+                                    of the provisioned read & write throughput.  See :mod:`dynamorm.ratelimit`.
+
+rate_limit_path    False     str    A directory used to share the rate limit between processes on a host.
+
+trusted_reads      False     bool   When True, items read from the table are only converted to their
+                                    native types by the schema, without running its validation.
+
+item_size_warning  False     int    Log a warning when an item that is put is larger than this many bytes.
+                                    See :mod:`dynamorm.capacity`.
+
+item_size_limit    False     int    Raise :class:`~dynamorm.exceptions.ItemTooLarge` instead of putting an
+                                    item that is larger than this many bytes.  On tables with
+                                    ``shard_items`` each row of a sharded item is checked instead.
+
+shard_items        False     bool   When True, items that are too large are split across multiple rows.
+                                    Requires a string range key.  See :mod:`dynamorm.sharding`.
+
+shard_size         False     int    The size, in bytes, above which items are sharded.
+
+version_field      False     str    The name of a number field that holds the version of each item, for
+                                    optimistic concurrency.  See :meth:`dynamorm.model.DynaModel.save`.
+
+=================  ========  =====  ===========
 
 
 Indexes
@@ -44,7 +67,8 @@ projection  True      object  An instance of of :class:`dynamorm.model.ProjectAl
 import logging
 import time
 import warnings
-from collections import defaultdict, OrderedDict
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from collections.abc import Iterable, Mapping
@@ -58,14 +82,30 @@ import six
 from boto3.dynamodb.conditions import Key, Attr
 from dynamorm.exceptions import (
     MissingTableAttribute,
+    InvalidTableAttribute,
     TableNotActive,
     InvalidSchemaField,
     HashKeyExists,
     ConditionFailed,
+    TransactionConditionFailed,
+    ValidationError,
 )
+from dynamorm.capacity import check_item_size
+from dynamorm.ratelimit import RateLimiter
 
 log = logging.getLogger(__name__)
 
+#: The functions that can end the double underscore paths of updates, and the update expressions they become.  The
+#: ``remove`` function removes the path, through a ``REMOVE`` clause, and ignores its value.
+UPDATE_FUNCTION_TEMPLATES = {
+    "append": "{key} = list_append({key}, {value})",
+    "plus": "{key} = {key} + {value}",
+    "minus": "{key} = {key} - {value}",
+    "if_not_exists": "{key} = if_not_exists({key}, {value})",
+    "remove": "{key}",
+    None: "{key} = {value}",
+}
+
 
 class DynamoCommon3(object):
     """Common properties & functions of Boto3 DynamORM objects -- i.e. Tables & Indexes"""
@@ -188,6 +228,15 @@ class DynamoTable3(DynamoCommon3):
 
     stream = None
 
+    rate_limit = None
+    rate_limit_path = None
+    trusted_reads = False
+    item_size_warning = None
+    item_size_limit = None
+    shard_items = False
+    shard_size = None
+    version_field = None
+
     def __init__(self, schema, indexes=None):
         self.schema = schema
 
@@ -223,6 +272,33 @@ class DynamoTable3(DynamoCommon3):
                 "Stream parameter '{0}' is invalid".format(self.stream)
             )
 
+        if self.rate_limit is not None and not 0 < self.rate_limit <= 1:
+            raise InvalidTableAttribute(
+                "rate_limit must be greater than 0 and at most 1, not {0}".format(
+                    self.rate_limit
+                )
+            )
+
+        self.rate_limiter = RateLimiter(self) if self.rate_limit else None
+
+        if self.shard_items and (
+            not self.range_key
+            or schema.dynamorm_field_types().get(self.range_key) != "S"
+        ):
+            raise InvalidTableAttribute(
+                "shard_items requires a range_key that is a string"
+            )
+
+        if (
+            self.version_field
+            and schema.dynamorm_field_types().get(self.version_field) != "N"
+        ):
+            raise InvalidTableAttribute(
+                "version_field must be the name of a number field in the schema, not {0}".format(
+                    self.version_field
+                )
+            )
+
     @property
     def resource(self):
         return self.get_resource()
@@ -316,11 +392,9 @@ class DynamoTable3(DynamoCommon3):
         """Return an appropriate AttributeDefinitions, based on our key attributes and the schema object"""
         defs = []
 
+        field_types = self.schema.dynamorm_field_types()
         for name in self.all_attribute_fields:
-            dynamorm_field = self.schema.dynamorm_fields()[name]
-            field_type = self.schema.field_to_dynamo_type(dynamorm_field)
-
-            defs.append({"AttributeName": name, "AttributeType": field_type})
+            defs.append({"AttributeName": name, "AttributeType": field_types[name]})
 
         return defs
 
@@ -477,10 +551,12 @@ class DynamoTable3(DynamoCommon3):
             log.info(
                 "Updating stream on table %s (%s -> %s)",
                 self.name,
-                table.stream_specification["StreamViewType"]
-                if table.stream_specification
-                and "StreamEnabled" in table.stream_specification
-                else "NONE",
+                (
+                    table.stream_specification["StreamViewType"]
+                    if table.stream_specification
+                    and "StreamEnabled" in table.stream_specification
+                    else "NONE"
+                ),
                 self.stream,
             )
             do_update(StreamSpecification=self.stream_specification)
@@ -560,6 +636,30 @@ class DynamoTable3(DynamoCommon3):
             )
         return True
 
+    def call_limited(self, mode, operation, method, index_name=None, **kwargs):
+        """Call a boto3 method, pacing it through our rate limiter if we have one
+
+        :param str mode: Either ``read`` or ``write``, the type of capacity the call consumes
+        :param str operation: The name of the operation, used to keep separate capacity estimates for each
+        :param method: The boto3 method to call
+        :param str index_name: The name of the index being read, if any
+        :param \*\*kwargs: The kwargs for the boto3 method
+        """
+        if self.rate_limiter is None:
+            return method(**kwargs)
+
+        estimated = self.rate_limiter.acquire(mode, operation, index_name=index_name)
+        kwargs.setdefault("ReturnConsumedCapacity", "INDEXES")
+        response = method(**kwargs)
+        self.rate_limiter.record(
+            mode,
+            operation,
+            estimated,
+            response.get("ConsumedCapacity"),
+            index_name=index_name,
+        )
+        return response
+
     def put(self, item, **kwargs):
         """Put a singular item into the table
 
@@ -568,7 +668,15 @@ class DynamoTable3(DynamoCommon3):
 
         .. _DynamoDB Table put_item: http://boto3.readthedocs.io/en/latest/reference/services/dynamodb.html#DynamoDB.Table.put_item
         """  # noqa
-        return self.table.put_item(Item=remove_nones(item), **kwargs)
+        item = remove_nones(item)
+        self.check_item_size(item)
+        if self.shard_items:
+            from dynamorm import sharding
+
+            return sharding.put_item(self, item, **kwargs)
+        return self.call_limited(
+            "write", "put", self.table.put_item, Item=item, **kwargs
+        )
 
     def put_unique(self, item, **kwargs):
         try:
@@ -580,11 +688,48 @@ class DynamoTable3(DynamoCommon3):
             if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
                 raise HashKeyExists
             raise
+        except TransactionConditionFailed:
+            # sharded items are put in a transaction
+            raise HashKeyExists
 
     def put_batch(self, *items, **batch_kwargs):
+        if self.rate_limiter is not None:
+            # the boto3 batch writer doesn't give us access to the consumed capacity, while ours requests it and
+            # corrects the rate limiter with it
+            from dynamorm.batch import BatchWriter
+
+            with BatchWriter() as writer:
+                for item in items:
+                    item = remove_nones(item)
+                    self.check_item_size(item)
+                    writer.put(self._model, item, validate=False)
+            return
+
         with self.table.batch_writer(**batch_kwargs) as writer:
             for item in items:
-                writer.put_item(Item=remove_nones(item))
+                item = remove_nones(item)
+                self.check_item_size(item)
+                if self.shard_items and self.should_shard(item):
+                    self.put(item)
+                    continue
+                writer.put_item(Item=item)
+
+    def check_item_size(self, item):
+        """Check the size of an item that is about to be put, when ``item_size_warning`` or ``item_size_limit`` are set
+
+        See :func:`dynamorm.capacity.check_item_size`.  Items that are going to be sharded are not checked here, since
+        it's the rows they are split into that are written, and those are checked once the item has been split.
+        """
+        if self.item_size_warning is not None or self.item_size_limit is not None:
+            if self.shard_items and self.should_shard(item):
+                return
+            check_item_size(self, item)
+
+    def should_shard(self, item):
+        """Returns True if an item is larger than the ``shard_size`` of the table, and needs to be sharded when put"""
+        from dynamorm import sharding
+
+        return sharding.should_shard(self, item)
 
     def get_update_expr_for_key(self, id_, parts):
         """Given a key and a unique id, return all the information required
@@ -621,14 +766,6 @@ class DynamoTable3(DynamoCommon3):
         :param parts: List of parts that make up this key
         :rtype: tuple[str, dict, str]
         """
-        UPDATE_FUNCTION_TEMPLATES = {
-            "append": "{key} = list_append({key}, {value})",
-            "plus": "{key} = {key} + {value}",
-            "minus": "{key} = {key} - {value}",
-            "if_not_exists": "{key} = if_not_exists({key}, {value})",
-            None: "{key} = {value}",
-        }
-
         if len(parts) == 1 or parts[-1] not in UPDATE_FUNCTION_TEMPLATES:
             function = None
         else:
@@ -652,23 +789,89 @@ class DynamoTable3(DynamoCommon3):
         )
 
     def update(self, update_item_kwargs=None, conditions=None, **kwargs):
+        # First, pick out the keys for the update.
+        update_key = {
+            key: kwargs.pop(key)
+            for key in (self.hash_key, self.range_key)
+            if key in kwargs
+        }
+
+        update_item_kwargs = self.get_update_item_kwargs(
+            update_item_kwargs, conditions, **kwargs
+        )
+        update_item_kwargs["Key"] = update_key
+
+        try:
+            return self.call_limited(
+                "write", "update", self.table.update_item, **update_item_kwargs
+            )
+        except botocore.exceptions.ClientError as exc:
+            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise ConditionFailed(exc)
+            raise
+
+    def update_many(
+        self, keys, update_item_kwargs=None, conditions=None, concurrency=8, **kwargs
+    ):
+        """Apply the same update to many keys, with multiple ``UpdateItem`` requests in flight at once
+
+        The update expression is built once and then sent for each key from a thread pool.  Keys whose conditions
+        fail do not stop the others from being updated, instead they are returned along with their exception.
+
+        :param keys: An iterable of dicts containing the hash key, and range key if used
+        :param int concurrency: The number of requests to keep in flight
+        :returns: A list of ``(key, ConditionFailed)`` tuples for the keys whose conditions failed
+        """
+        update_item_kwargs = self.get_update_item_kwargs(
+            update_item_kwargs, conditions, **kwargs
+        )
+        update_item_kwargs["TableName"] = self.name
+
+        # unlike the Table resource, the client is safe to share between threads
+        client = self.resource.meta.client
+
+        def update(key):
+            try:
+                self.call_limited(
+                    "write", "update", client.update_item, Key=key, **update_item_kwargs
+                )
+            except botocore.exceptions.ClientError as exc:
+                if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                    return key, ConditionFailed(exc)
+                raise
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = deque()
+            for key in keys:
+                # keep memory bounded when we're given a generator of many keys
+                if len(in_flight) >= concurrency * 2:
+                    failed.append(in_flight.popleft().result())
+                in_flight.append(executor.submit(update, key))
+            while in_flight:
+                failed.append(in_flight.popleft().result())
+
+        return [result for result in failed if result is not None]
+
+    def get_update_item_kwargs(
+        self, update_item_kwargs=None, conditions=None, **kwargs
+    ):
+        """Return the kwargs for ``update_item``, without the ``Key``, that set the fields in kwargs
+
+        :param dict update_item_kwargs: Other kwargs for ``update_item``, these are copied and not modified
+        :param conditions: A dict, Q object or list of Q objects that the update is conditional on
+        :param \*\*kwargs: The fields to update, using the double underscore syntax for nested fields and functions
+        """
         # copy update_item_kwargs, so that we don't mutate the original later on
         update_item_kwargs = dict(
             (k, v) for k, v in six.iteritems(update_item_kwargs or {})
         )
-        conditions = conditions or {}
         update_fields = []
+        remove_fields = []
         expr_names = {}
         expr_vals = {}
 
-        # First, pick out the keys for the update.
-        update_key = {
-            key: kwargs.pop(key)
-            for key in (self.hash_key, self.range_key)
-            if key in kwargs
-        }
-
-        # Then, generate the keys and values for the update-expression.
+        # Generate the keys and values for the update-expression.
         for i, key in enumerate(kwargs):
             key_parts = key.split("__")
             top_level_key = key_parts[0]
@@ -686,40 +889,40 @@ class DynamoTable3(DynamoCommon3):
                 field_expr_names,
                 field_expr_value,
             ) = self.get_update_expr_for_key(i, key_parts)
-            update_fields.append(field_expr)
             expr_names.update(field_expr_names)
-            expr_vals[field_expr_value] = kwargs[key]
-
-        update_item_kwargs["Key"] = update_key
-        update_item_kwargs["UpdateExpression"] = "SET {0}".format(
-            ", ".join(update_fields)
-        )
+            if len(key_parts) > 1 and key_parts[-1] == "remove":
+                remove_fields.append(field_expr)
+            else:
+                update_fields.append(field_expr)
+                expr_vals[field_expr_value] = kwargs[key]
+
+        clauses = []
+        if update_fields:
+            clauses.append("SET {0}".format(", ".join(update_fields)))
+        if remove_fields:
+            clauses.append("REMOVE {0}".format(", ".join(remove_fields)))
+        update_item_kwargs["UpdateExpression"] = " ".join(clauses)
         update_item_kwargs["ExpressionAttributeNames"] = expr_names
-        update_item_kwargs["ExpressionAttributeValues"] = expr_vals
-
-        if isinstance(conditions, Mapping):
-            condition_expression = Q(**conditions)
-        elif isinstance(conditions, Iterable):
-            condition_expression = None
-            for condition in conditions:
-                try:
-                    condition_expression = condition_expression & condition
-                except TypeError:
-                    condition_expression = condition
-        else:
-            condition_expression = conditions
+        if expr_vals:
+            update_item_kwargs["ExpressionAttributeValues"] = expr_vals
 
+        condition_expression = conditions_to_expression(conditions)
         if condition_expression:
             update_item_kwargs["ConditionExpression"] = condition_expression
 
-        try:
-            return self.table.update_item(**update_item_kwargs)
-        except botocore.exceptions.ClientError as exc:
-            if exc.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                raise ConditionFailed(exc)
-            raise
+        return update_item_kwargs
 
     def get_batch(self, keys, consistent=False, attrs=None, batch_get_kwargs=None):
+        for page in self.get_batch_pages(
+            keys, consistent=consistent, attrs=attrs, batch_get_kwargs=batch_get_kwargs
+        ):
+            for item in page:
+                yield item
+
+    def get_batch_pages(
+        self, keys, consistent=False, attrs=None, batch_get_kwargs=None
+    ):
+        """Like ``get_batch``, but yields the items of each ``BatchGetItem`` response as a list"""
         # copy batch_get_kwargs, so that we don't mutate the original later on
         batch_get_kwargs = dict(
             (k, v) for k, v in six.iteritems(batch_get_kwargs or {})
@@ -742,12 +945,36 @@ class DynamoTable3(DynamoCommon3):
             batch_get_kwargs["ProjectionExpression"] = attrs
 
         while True:
-            response = self.resource.batch_get_item(
-                RequestItems={self.name: batch_get_kwargs}
-            )
+            request = {"RequestItems": {self.name: batch_get_kwargs}}
+            if self.rate_limiter is not None:
+                count = len(batch_get_kwargs["Keys"])
+                estimated = self.rate_limiter.acquire("read", "get_batch", count=count)
+                request["ReturnConsumedCapacity"] = "INDEXES"
+
+            response = self.resource.batch_get_item(**request)
+
+            if self.rate_limiter is not None:
+                for consumed in response.get("ConsumedCapacity", []):
+                    self.rate_limiter.record(
+                        "read", "get_batch", estimated, consumed, count=count
+                    )
 
+            page = []
             for item in response["Responses"][self.name]:
-                yield item
+                if self.shard_items:
+                    from dynamorm import sharding
+
+                    if sharding.CHUNKS_ATTRIBUTE in item:
+                        item = sharding.get_item(
+                            self,
+                            dict(
+                                (key, item[key])
+                                for key in (self.hash_key, self.range_key)
+                            ),
+                            consistent=consistent,
+                        )
+                page.append(item)
+            yield page
 
             try:
                 batch_get_kwargs = response["UnprocessedKeys"][self.name]
@@ -765,11 +992,18 @@ class DynamoTable3(DynamoCommon3):
                     "{0} does not exist in the schema fields".format(k)
                 )
 
+        if self.shard_items and not get_item_kwargs:
+            from dynamorm import sharding
+
+            return sharding.get_item(self, kwargs, consistent=consistent)
+
         get_item_kwargs["Key"] = kwargs
         if consistent:
             get_item_kwargs["ConsistentRead"] = True
 
-        response = self.table.get_item(**get_item_kwargs)
+        response = self.call_limited(
+            "read", "get", self.table.get_item, **get_item_kwargs
+        )
 
         if "Item" in response:
             return response["Item"]
@@ -825,7 +1059,13 @@ class DynamoTable3(DynamoCommon3):
             query_kwargs["FilterExpression"] = filter_expression
 
         log.debug("Query: %s", query_kwargs)
-        return self.table.query(**query_kwargs)
+        return self.call_limited(
+            "read",
+            "query",
+            self.table.query,
+            index_name=query_kwargs.get("IndexName"),
+            **query_kwargs
+        )
 
     def scan(self, *args, **kwargs):
         # copy scan_kwargs, so that we don't mutate the original later on
@@ -843,10 +1083,20 @@ class DynamoTable3(DynamoCommon3):
         if filter_expression:
             scan_kwargs["FilterExpression"] = filter_expression
 
-        return self.table.scan(**scan_kwargs)
+        return self.call_limited(
+            "read",
+            "scan",
+            self.table.scan,
+            index_name=scan_kwargs.get("IndexName"),
+            **scan_kwargs
+        )
 
     def delete_item(self, **kwargs):
-        return self.table.delete_item(Key=kwargs)
+        if self.shard_items:
+            from dynamorm import sharding
+
+            return sharding.delete_item(self, kwargs)
+        return self.call_limited("write", "delete", self.table.delete_item, Key=kwargs)
 
 
 def remove_nones(in_dict):
@@ -914,6 +1164,29 @@ def Q(**mapping):
     return expression
 
 
+def conditions_to_expression(conditions):
+    """Return a single condition expression from conditions given as a dict, a Q object or a list of Q objects
+
+    Dicts are turned into a Q object and the Q objects in a list are AND'd together.
+    """
+    if not conditions:
+        return None
+
+    if isinstance(conditions, Mapping):
+        return Q(**conditions)
+
+    if isinstance(conditions, Iterable):
+        expression = None
+        for condition in conditions:
+            try:
+                expression = expression & condition
+            except TypeError:
+                expression = condition
+        return expression
+
+    return conditions
+
+
 class ReadIterator(six.Iterator):
     """ReadIterator provides an iterator object that wraps a model and a method (either scan or query).
 
@@ -934,6 +1207,17 @@ class ReadIterator(six.Iterator):
 
         # ...
 
+    Each page of items is validated at once, through :meth:`~dynamorm.model.DynaModel.new_from_raw_page`, rather than
+    one item at a time.  By default an item that fails validation raises its
+    :class:`~dynamorm.exceptions.ValidationError`, use ``on_invalid`` to skip or collect the invalid items instead:
+
+    .. code-block:: python
+
+        results = MyModel.scan().on_invalid("collect")
+        valid = list(results)
+        for error in results.invalid_items:
+            print error.raw, error.errors
+
     :param model: The Model class to wrap
     :param \*args: Q objects, passed through to scan or query
     :param \*\*kwargs: filters, passed through to scan or query
@@ -952,7 +1236,14 @@ class ReadIterator(six.Iterator):
 
         self._partial = False
         self._recursive = False
+        self._trusted = None
+        self._on_invalid = "raise"
+        self._page = None
+        self._page_resp = None
+        self.invalid_items = []
+        self._join_chunks = True
         self.last = None
+        self._start = None
         self.resp = None
         self.index = -1
 
@@ -972,6 +1263,33 @@ class ReadIterator(six.Iterator):
 
     def __next__(self):
         """Called for each iteration of this object"""
+        # Grab the next item from the response, loading the whole page as instances of our model when it's new
+        while True:
+            self._next_raw()
+            if self._page_resp is not self.resp:
+                self._page = self.model.new_from_raw_page(
+                    self.resp["Items"], partial=self._partial, trusted=self._trusted
+                )
+                self._page_resp = self.resp
+
+            instance = self._page[self.index]
+            if not isinstance(instance, ValidationError):
+                return instance
+            self._invalid(instance)
+
+    def _invalid(self, error):
+        """Apply the ``on_invalid`` policy to an item that failed validation"""
+        if self._on_invalid == "raise":
+            raise error
+
+        log.debug("Skipping invalid item: %s", error)
+        if self._on_invalid == "collect":
+            self.invalid_items.append(error)
+        elif callable(self._on_invalid):
+            self._on_invalid(error)
+
+    def _next_raw(self):
+        """Return the next raw item from the responses, fetching new pages as needed"""
         # If we don't have a resp object, go get it
         if self.resp is None:
             self.resp = self._get_resp()
@@ -979,6 +1297,16 @@ class ReadIterator(six.Iterator):
             # Store the last key from query
             self.last = self.resp.get("LastEvaluatedKey", None)
 
+            # Sharded items are joined with their chunk rows, which are left out of the results
+            if self.model.Table.shard_items and self._join_chunks:
+                from dynamorm import sharding
+
+                self.resp = sharding.load_page(
+                    self.model.Table,
+                    self.resp,
+                    consistent=self.dynamo_kwargs.get("ConsistentRead", False),
+                )
+
         # If a Limit is specified we must not operate in recursive mode
         if "Limit" in self.dynamo_kwargs and self._recursive:
             log.warning(
@@ -1000,11 +1328,9 @@ class ReadIterator(six.Iterator):
             # Our last marker is not None and we are in recursive mode
             # Reset our response state and re-call next
             self.again()
-            return self.__next__()
+            return self._next_raw()
 
-        # Grab the raw item from the response and return it as a new instance of our model
-        raw = self.resp["Items"][self.index]
-        return self.model.new_from_raw(raw, partial=self._partial)
+        return self.resp["Items"][self.index]
 
     def limit(self, limit):
         """Set the limit value"""
@@ -1013,6 +1339,7 @@ class ReadIterator(six.Iterator):
 
     def start(self, last):
         """Set the last value"""
+        self._start = last
         self.dynamo_kwargs["ExclusiveStartKey"] = last
         return self
 
@@ -1021,6 +1348,27 @@ class ReadIterator(six.Iterator):
         self.dynamo_kwargs["ConsistentRead"] = True
         return self
 
+    def trusted(self, trusted=True):
+        """Only convert, rather than validate, the items read.  See :meth:`~dynamorm.model.DynaModel.new_from_raw`"""
+        self._trusted = trusted
+        return self
+
+    def on_invalid(self, policy):
+        """Set what happens when an item read fails validation
+
+        :param policy: One of ``"raise"`` (the default) to raise the :class:`~dynamorm.exceptions.ValidationError`,
+                       ``"skip"`` to skip the item, ``"collect"`` to skip the item and append its error to
+                       ``invalid_items``, or a callable that is called with the error of each skipped item
+        """
+        if policy not in ("raise", "skip", "collect") and not callable(policy):
+            raise ValueError(
+                "on_invalid must be raise, skip, collect or a callable, not {0!r}".format(
+                    policy
+                )
+            )
+        self._on_invalid = policy
+        return self
+
     def specific_attributes(self, attrs):
         """Return only specific attributes in the documents through a ProjectionExpression
 
@@ -1066,6 +1414,54 @@ class ReadIterator(six.Iterator):
         resp = self._get_resp()
         return resp["Count"]
 
+    def delete(self, concurrency=4, signals=False):
+        """Delete all of the items matching the current read
+
+        Only the keys of the matching items are fetched, and they are deleted through parallel ``BatchWriteItem``
+        requests.  Unless a limit has been set this reads recursively, so every matching item is deleted.
+
+        .. code-block:: python
+
+            MyModel.query(foo="bar", count__lt=10).delete()
+
+        The delete is made through a new read with the same arguments, so it also deletes any items this iterator has
+        already returned and leaves the iterator itself untouched.  Any ``specific_attributes`` are replaced with just
+        the key attributes.
+
+        See :meth:`~dynamorm.model.DynaModel.delete_batch` for the ``concurrency`` and ``signals`` arguments.
+        """
+        kwargs = dict(self.kwargs)
+        dynamo_kwargs = kwargs[self.dynamo_kwargs_key] = dict(self.dynamo_kwargs)
+        for name in ("ExpressionAttributeNames", "ProjectionExpression", "Select"):
+            dynamo_kwargs.pop(name, None)
+        if self._start is None:
+            dynamo_kwargs.pop("ExclusiveStartKey", None)
+        else:
+            dynamo_kwargs["ExclusiveStartKey"] = self._start
+        read = self.__class__(self.model, *self.args, **kwargs)
+
+        keys = [self.model.Table.hash_key]
+        if self.model.Table.range_key:
+            keys.append(self.model.Table.range_key)
+        read.specific_attributes(keys)
+
+        # the chunk rows of sharded items are deleted along with the items
+        read._join_chunks = False
+
+        if "Limit" not in dynamo_kwargs:
+            read.recursive()
+
+        def iter_keys():
+            while True:
+                try:
+                    yield read._next_raw()
+                except StopIteration:
+                    return
+
+        return self.model.delete_batch(
+            iter_keys(), concurrency=concurrency, signals=signals
+        )
+
     def again(self):
         """Call this to reset the iterator so that you can iterate over it again.
 
@@ -1075,7 +1471,7 @@ class ReadIterator(six.Iterator):
         self.resp = None
         self.index = -1
         if self.last:
-            return self.start(self.last)
+            self.dynamo_kwargs["ExclusiveStartKey"] = self.last
         return self
 
 
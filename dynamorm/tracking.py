@@ -0,0 +1,316 @@
+"""Track the changes made to model instances, so that partial saves only send what changed
+
+Models that set ``dynamorm_track_changes = True`` record every field that is set or deleted on their instances, and the
+dict & list values of their fields are wrapped in :class:`TrackedDict` & :class:`TrackedList`, which record the
+changes made inside of them:
+
+.. code-block:: python
+
+    class Service(DynaModel):
+        dynamorm_track_changes = True
+
+        class Table:
+            name = "services"
+            hash_key = "name"
+            read = 5
+            write = 5
+
+        class Schema:
+            name = fields.String(required=True)
+            owner = fields.String()
+            config = fields.Dict()
+
+    service = Service.get(name="api")
+    service.config["limits"]["cpu"] = 2
+    del service.config["debug"]
+    service.save(partial=True)
+
+The partial save sends ``SET config.limits.cpu = :v REMOVE config.debug``, built with the same double underscore paths
+as :meth:`~dynamorm.model.DynaModel.update`, rather than the whole ``config`` map.
+
+Changes inside of lists set the whole list, since the positions of its items shift as it changes, and so do changes to
+keys that can't be written as a path, like keys that contain a double underscore.  Compressed & packed fields, and
+fields that aren't stored as a map, are always set as a whole.
+"""
+
+from collections import OrderedDict
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+import six
+
+from .table import UPDATE_FUNCTION_TEMPLATES
+
+#: The change recorded for a path that is set
+SET = "set"
+
+#: The change recorded for a path that is removed
+REMOVE = "remove"
+
+
+class ChangeTracker(object):
+    """The changes made to a model instance, as an ordered mapping of paths to either :data:`SET` or :data:`REMOVE`
+
+    Paths are tuples of the field name and the keys inside of it.  A change to a path replaces any change recorded for
+    the paths inside of it, and changes inside of a path that is already set are covered by it.
+    """
+
+    __slots__ = ("changes",)
+
+    def __init__(self):
+        self.changes = OrderedDict()
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def __repr__(self):
+        return "<ChangeTracker {0}>".format(list(six.iteritems(self.changes)))
+
+    def record(self, path, change=SET):
+        """Record a change to a path"""
+        # paths are written with double underscores, so keys that can't be part of one set their parent instead
+        for index, part in enumerate(path[1:], 1):
+            if (
+                not isinstance(part, six.string_types)
+                or not part
+                or "__" in part
+                or part in UPDATE_FUNCTION_TEMPLATES
+            ):
+                path, change = path[:index], SET
+                break
+
+        for index in six.moves.range(1, len(path)):
+            if self.changes.get(path[:index]) == SET:
+                return
+
+        for existing in list(self.changes):
+            if existing[: len(path)] == path:
+                del self.changes[existing]
+        self.changes[path] = change
+
+    def clear(self):
+        self.changes.clear()
+
+    def updates(self, instance):
+        """Return the changes as kwargs for :meth:`~dynamorm.model.DynaModel.update`
+
+        Fields whose changes are inside of them, but that aren't stored as a map, are set as a whole instead.
+        """
+        whole = set()
+        for path in self.changes:
+            if len(path) > 1 and path[0] not in whole:
+                dumped = instance.Schema.dynamorm_dump(
+                    {path[0]: getattr(instance, path[0])}, partial=True
+                ).get(path[0])
+                if not isinstance(dumped, Mapping):
+                    whole.add(path[0])
+
+        updates = {}
+        for path, change in six.iteritems(self.changes):
+            if path[0] in whole:
+                updates[path[0]] = getattr(instance, path[0])
+            elif change == REMOVE:
+                updates["__".join(path + (REMOVE,))] = True
+            else:
+                updates["__".join(path)] = get_path(
+                    getattr(instance, path[0]), path[1:]
+                )
+        return updates
+
+
+def get_path(value, path):
+    """Return the value at a path of keys inside of a value"""
+    for key in path:
+        value = value[key]
+    return value
+
+
+class TrackedDict(dict):
+    """A dict that records the changes made to it, and to the dicts & lists inside of it, on a :class:`ChangeTracker`
+
+    :param tracker: The tracker that the changes are recorded on
+    :param tuple path: The path of the dict
+    :param bool whole: When True every change sets the whole path, which is used inside of lists
+    """
+
+    __slots__ = ("_tracker", "_path", "_whole")
+
+    def __init__(self, value, tracker, path, whole=False):
+        super(TrackedDict, self).__init__()
+        self._tracker = tracker
+        self._path = path
+        self._whole = whole
+        for key, item in six.iteritems(value):
+            dict.__setitem__(self, key, self._wrap(key, item))
+
+    def __reduce__(self):
+        # copies & pickles of tracked values are plain values
+        return dict, (dict(self),)
+
+    def _wrap(self, key, value):
+        if self._whole:
+            return track(value, self._tracker, self._path, whole=True)
+        return track(value, self._tracker, self._path + (key,))
+
+    def _record(self, key=None, change=SET):
+        if self._whole or key is None:
+            self._tracker.record(self._path, SET)
+        else:
+            self._tracker.record(self._path + (key,), change)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, self._wrap(key, value))
+        self._record(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._record(key, REMOVE)
+
+    def pop(self, key, *args):
+        present = key in self
+        value = dict.pop(self, key, *args)
+        if present:
+            self._record(key, REMOVE)
+        return value
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._record(key, REMOVE)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def update(self, *args, **kwargs):
+        for key, value in six.iteritems(dict(*args, **kwargs)):
+            self[key] = value
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
+
+
+class TrackedList(list):
+    """A list that records that it changed, along with changes to the dicts & lists inside of it, on a
+    :class:`ChangeTracker`
+
+    Any change sets the whole list.
+    """
+
+    __slots__ = ("_tracker", "_path")
+
+    def __init__(self, value, tracker, path):
+        super(TrackedList, self).__init__(
+            track(item, tracker, path, whole=True) for item in value
+        )
+        self._tracker = tracker
+        self._path = path
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def _changed(self):
+        self._tracker.record(self._path, SET)
+
+    def _wrap(self, value):
+        return track(value, self._tracker, self._path, whole=True)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._wrap(item) for item in value]
+        else:
+            value = self._wrap(value)
+        list.__setitem__(self, index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        list.__delitem__(self, index)
+        self._changed()
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __imul__(self, count):
+        list.__imul__(self, count)
+        self._changed()
+        return self
+
+    def append(self, value):
+        list.append(self, self._wrap(value))
+        self._changed()
+
+    def extend(self, values):
+        list.extend(self, [self._wrap(value) for value in values])
+        self._changed()
+
+    def insert(self, index, value):
+        list.insert(self, index, self._wrap(value))
+        self._changed()
+
+    def pop(self, *args):
+        value = list.pop(self, *args)
+        self._changed()
+        return value
+
+    def remove(self, value):
+        list.remove(self, value)
+        self._changed()
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        list.reverse(self)
+        self._changed()
+
+    if six.PY2:  # pragma: no cover
+
+        def __setslice__(self, i, j, values):
+            self[max(0, i) : max(0, j)] = values
+
+        def __delslice__(self, i, j):
+            del self[max(0, i) : max(0, j)]
+
+
+def track(value, tracker, path, whole=False):
+    """Return a value with its dicts & lists wrapped so that their changes are recorded on a tracker"""
+    if isinstance(value, (TrackedDict, TrackedList)):
+        if value._tracker is tracker and value._path == path:
+            return value
+        value = value.__reduce__()[1][0]
+    if isinstance(value, dict):
+        return TrackedDict(value, tracker, path, whole=whole)
+    if isinstance(value, list):
+        return TrackedList(value, tracker, path)
+    return value
+
+
+def tracked_setattr(self, name, value):
+    """The ``__setattr__`` of models that track their changes"""
+    field = self.Schema.dynamorm_fields().get(name)
+    if field is not None:
+        changes = self._changes
+        if not getattr(field, "dynamorm_lazy", False):
+            value = track(value, changes, (name,))
+        changes.record((name,), SET)
+    object.__setattr__(self, name, value)
+
+
+def tracked_delattr(self, name):
+    """The ``__delattr__`` of models that track their changes"""
+    object.__delattr__(self, name)
+    if name in self.Schema.dynamorm_fields():
+        self._changes.record((name,), REMOVE)
@@ -0,0 +1,326 @@
+"""Transactions group puts, updates, deletes and condition checks on any number of models so that they either all
+succeed or all fail, through DynamoDB's ``TransactWriteItems`` operation.
+
+Conditions and updates use the same syntax as :meth:`~dynamorm.model.DynaModel.update_item`:
+
+.. code-block:: python
+
+    from dynamorm import transaction
+
+    with transaction() as txn:
+        txn.update(Account, name="alice", conditions=dict(balance__gte=10), balance__minus=10)
+        txn.update(Account, name="bob", balance__plus=10)
+        txn.put(Transfer, {"id": "1234", "source": "alice", "destination": "bob", "amount": 10})
+        txn.condition_check(Account, {"name": "bob"}, conditions=dict(status="active"))
+
+If any of the conditions fail no changes are made and :class:`~dynamorm.exceptions.TransactionConditionFailed` is
+raised, with the cancellation reason of each operation.
+
+:func:`transact_get` reads items from any number of models through ``TransactGetItems``, which gives a consistent
+snapshot of all of them:
+
+.. code-block:: python
+
+    alice, bob = transact_get([(Account, {"name": "alice"}), (Account, {"name": "bob"})])
+"""
+
+import logging
+import uuid
+
+import botocore
+import six
+
+from boto3.dynamodb.conditions import ConditionExpressionBuilder
+
+from .batch import (
+    BatchWriter,
+    acquire_capacity,
+    record_capacity,
+    resource_group_key,
+)
+from .exceptions import TransactionCanceled, TransactionConditionFailed
+from .table import conditions_to_expression, remove_nones
+
+log = logging.getLogger(__name__)
+
+#: The maximum number of operations DynamoDB accepts in a single TransactWriteItems or TransactGetItems request
+TRANSACT_ITEMS_LIMIT = 100
+
+
+def transaction(token=None, chunked=False):
+    """Return a :class:`Transaction` to be used as a context manager
+
+    :param str token: The idempotency token for the transaction, a new one is generated when not supplied
+    :param bool chunked: Allow transactions with more operations than DynamoDB accepts in one request, see
+                         :class:`Transaction`
+    """
+    return Transaction(token=token, chunked=chunked)
+
+
+def chunk_token(token, index):
+    """Return the idempotency token for a chunk of a transaction
+
+    The first chunk uses the token as is, later chunks use a token derived from it so that retrying the whole
+    transaction with the same token is still idempotent.
+    """
+    if not index:
+        return token
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, "{0}-{1}".format(token, index)))
+
+
+def check_resource_group(models):
+    """Make sure that all of the models live behind the same boto3 resource configuration
+
+    Like batch requests, transactions can only span tables in one account & region.
+    """
+    groups = set(resource_group_key(model.Table) for model in models)
+    if len(groups) > 1:
+        raise ValueError(
+            "All models in a transaction must use the same session_kwargs & resource_kwargs"
+        )
+
+
+def raise_for_cancellation(exc, operations):
+    """Turn a ``TransactionCanceledException`` into a :class:`~dynamorm.exceptions.TransactionCanceled`
+
+    :param exc: The ClientError raised by boto3
+    :param list operations: The ``(model, operation)`` pairs that were part of the request, in order
+    """
+    if exc.response["Error"]["Code"] != "TransactionCanceledException":
+        raise exc
+
+    reasons = [
+        (model, operation, reason)
+        for (model, operation), reason in zip(
+            operations, exc.response.get("CancellationReasons") or []
+        )
+    ]
+    if any(reason.get("Code") == "ConditionalCheckFailed" for _, _, reason in reasons):
+        raise TransactionConditionFailed(reasons, exc)
+    raise TransactionCanceled(reasons, exc)
+
+
+class Transaction(object):
+    """Collects writes and condition checks for any number of models and sends them in a ``TransactWriteItems``
+    request when the context exits (or :meth:`commit` is called).  If the context exits because of an exception
+    nothing is sent.
+
+    Every operation can take ``conditions``, as a dict, a Q object or a list of Q objects, that must hold for the
+    transaction to succeed.  Items are validated through each model's Schema as they are added.
+
+    Transactions are sent with an idempotency token, so if a commit fails because of a network error it can be retried
+    with the same ``token`` without applying the changes twice.
+
+    DynamoDB accepts at most :data:`TRANSACT_ITEMS_LIMIT` operations in a single transaction and a transaction with
+    more operations is rejected, unless ``chunked`` is set.  Chunked transactions are sent as multiple requests, each
+    of which succeeds or fails as a whole, but the transaction as a whole is no longer atomic.
+
+    :param str token: The idempotency token for the transaction, a new one is generated when not supplied
+    :param bool chunked: Send transactions with too many operations in multiple requests
+    """
+
+    def __init__(self, token=None, chunked=False):
+        self.token = token or str(uuid.uuid4())
+        self.chunked = chunked
+        self.items = []
+        self.operations = []
+        self.tables = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+
+    def _add(self, model, operation, request, conditions=None):
+        request["TableName"] = model.Table.name
+
+        condition = conditions_to_expression(conditions)
+        if condition:
+            # the condition objects are only turned into expressions by boto3 for top level ConditionExpressions, so
+            # we need to build them ourselves
+            built = ConditionExpressionBuilder().build_expression(condition)
+            request["ConditionExpression"] = built.condition_expression
+            request.setdefault("ExpressionAttributeNames", {}).update(
+                built.attribute_name_placeholders
+            )
+            if built.attribute_value_placeholders:
+                request.setdefault("ExpressionAttributeValues", {}).update(
+                    built.attribute_value_placeholders
+                )
+
+        self.tables[model.Table.name] = model.Table
+        self.items.append({operation: request})
+        self.operations.append((model, operation))
+
+    def put(self, model_or_instance, item=None, conditions=None, validate=True):
+        """Add a put
+
+        :param model_or_instance: Either a model instance, or a model class when supplying ``item``
+        :param dict item: The item to put, when a model class is supplied as the first argument
+        :param conditions: Conditions on the existing item that must hold for the transaction to succeed
+        :param bool validate: Set to False when the item has already been dumped by the model's Schema
+        """
+        if validate:
+            model, item = BatchWriter._model_and_item(model_or_instance, item)
+        else:
+            model = model_or_instance
+        self._add(model, "Put", {"Item": remove_nones(item)}, conditions)
+
+    def update(self, model, conditions=None, **kwargs):
+        """Add an update
+
+        The kwargs include the hash key, and range key if used, and the fields to update with the same syntax as
+        :meth:`~dynamorm.model.DynaModel.update_item`.
+
+        :param model: The model class
+        :param conditions: Conditions on the existing item that must hold for the transaction to succeed
+        """
+        kwargs = model._normalize_keys_in_kwargs(model._validate_update_kwargs(kwargs))
+        key = dict(
+            (name, kwargs.pop(name))
+            for name in (model.Table.hash_key, model.Table.range_key)
+            if name in kwargs
+        )
+        request = model.Table.get_update_item_kwargs(**kwargs)
+        request["Key"] = key
+        self._add(model, "Update", request, conditions)
+
+    def delete(self, model_or_instance, key=None, conditions=None):
+        """Add a delete
+
+        :param model_or_instance: Either a model instance, or a model class when supplying ``key``
+        :param dict key: The hash key, and range key if used, when a model class is supplied as the first argument
+        :param conditions: Conditions on the existing item that must hold for the transaction to succeed
+        """
+        model, key = BatchWriter._model_and_key(model_or_instance, key)
+        self._add(model, "Delete", {"Key": key}, conditions)
+
+    def condition_check(self, model_or_instance, key=None, conditions=None):
+        """Add a condition check on an item that is not otherwise changed by the transaction
+
+        :param model_or_instance: Either a model instance, or a model class when supplying ``key``
+        :param dict key: The hash key, and range key if used, when a model class is supplied as the first argument
+        :param conditions: Conditions on the item that must hold for the transaction to succeed
+        """
+        if not conditions:
+            raise ValueError("A condition check requires conditions")
+        model, key = BatchWriter._model_and_key(model_or_instance, key)
+        self._add(model, "ConditionCheck", {"Key": key}, conditions)
+
+    def commit(self):
+        """Send the transaction
+
+        :raises TransactionConditionFailed: When any of the conditions failed
+        :raises TransactionCanceled: When the transaction was cancelled for any other reason, such as a conflict with
+                                     another transaction
+        """
+        if not self.items:
+            return
+
+        if len(self.items) > TRANSACT_ITEMS_LIMIT and not self.chunked:
+            raise ValueError(
+                "A transaction can contain at most {0} operations, this one has {1}".format(
+                    TRANSACT_ITEMS_LIMIT, len(self.items)
+                )
+            )
+
+        models = [model for model, _ in self.operations]
+        check_resource_group(models)
+        client = models[0].Table.resource.meta.client
+
+        for index, start in enumerate(
+            six.moves.range(0, len(self.items), TRANSACT_ITEMS_LIMIT)
+        ):
+            items = self.items[start : start + TRANSACT_ITEMS_LIMIT]
+            operations = self.operations[start : start + TRANSACT_ITEMS_LIMIT]
+
+            request_items = {}
+            for model, _ in operations:
+                request_items.setdefault(model.Table.name, []).append(model)
+            limited = acquire_capacity(
+                "write", "transact_write", self.tables, request_items
+            )
+
+            request = {
+                "TransactItems": items,
+                "ClientRequestToken": chunk_token(self.token, index),
+            }
+            if limited:
+                request["ReturnConsumedCapacity"] = "INDEXES"
+
+            try:
+                response = client.transact_write_items(**request)
+            except botocore.exceptions.ClientError as exc:
+                raise_for_cancellation(exc, operations)
+
+            record_capacity("write", "transact_write", self.tables, limited, response)
+
+        self.items = []
+        self.operations = []
+
+
+def transact_get(models_keys):
+    """Read items from any number of models in a consistent snapshot, through ``TransactGetItems``
+
+    .. code-block:: python
+
+        alice, transfer = transact_get([(Account, {"name": "alice"}), (Transfer, {"id": "1234"})])
+
+    Items that don't exist are returned as None.  DynamoDB reads at most :data:`TRANSACT_ITEMS_LIMIT` items in a
+    single request, more keys than that are read in multiple requests and each request is a separate snapshot.
+
+    :param list models_keys: A list of ``(model, key)`` tuples
+    :returns: A list with a model instance (or None) for each key, in the same order
+    """
+    models_keys = [
+        (model, model._normalize_keys_in_kwargs(dict(key)))
+        for model, key in models_keys
+    ]
+    items = transact_get_items(models_keys)
+    return [
+        None if item is None else model.new_from_raw(item)
+        for (model, _), item in zip(models_keys, items)
+    ]
+
+
+def transact_get_items(models_keys):
+    """Like :func:`transact_get`, but the keys are used as is and the raw items are returned instead of instances"""
+    if not models_keys:
+        return []
+
+    check_resource_group(model for model, _ in models_keys)
+    client = models_keys[0][0].Table.resource.meta.client
+    tables = dict((model.Table.name, model.Table) for model, _ in models_keys)
+
+    results = []
+    for start in six.moves.range(0, len(models_keys), TRANSACT_ITEMS_LIMIT):
+        chunk = models_keys[start : start + TRANSACT_ITEMS_LIMIT]
+
+        request_items = {}
+        for model, key in chunk:
+            request_items.setdefault(model.Table.name, {"Keys": []})["Keys"].append(key)
+        limited = acquire_capacity("read", "transact_get", tables, request_items)
+
+        request = {
+            "TransactItems": [
+                {"Get": {"TableName": model.Table.name, "Key": key}}
+                for model, key in chunk
+            ]
+        }
+        if limited:
+            request["ReturnConsumedCapacity"] = "INDEXES"
+
+        try:
+            response = client.transact_get_items(**request)
+        except botocore.exceptions.ClientError as exc:
+            raise_for_cancellation(exc, [(model, "Get") for model, _ in chunk])
+
+        record_capacity("read", "transact_get", tables, limited, response)
+
+        results.extend(
+            response_item.get("Item") for response_item in response["Responses"]
+        )
+
+    return results
@@ -1,30 +1,80 @@
+import functools
+from decimal import Decimal
+
 import six
 from pkg_resources import parse_version
 
 from marshmallow import Schema as MarshmallowSchema
 from marshmallow.exceptions import MarshmallowError
-from marshmallow import fields, __version__ as marshmallow_version
+from boto3.dynamodb.types import Binary
+from marshmallow import fields, missing, __version__ as marshmallow_version
 
 from .base import DynamORMSchema
+from .codegen import compile_function, indent, wrap_with_fallback
+from .compression import DEFAULT_CODEC, JSON, LazyValue, compress, get_codec
+from .packing import MSGPACK
 from ..exceptions import ValidationError
 
 # Define different validation logic depending on the version of marshmallow we're using
 if parse_version(marshmallow_version) >= parse_version("3.0.0a1"):
 
+    def _schema(cls, partial=False):
+        """Return the shared Marshmallow v3+ schema instance for a schema class
+
+        Creating a schema instance copies all of its fields, so we only do it once per class.  Since v3 schemas don't
+        keep any state between calls to load or dump a single instance can be shared by every thread, and dump ignores
+        partial so the same instance works for both.
+        """
+        try:
+            return cls.__dict__["_dynamorm_schema"]
+        except KeyError:
+            cls._dynamorm_schema = cls(unknown="EXCLUDE")
+            return cls._dynamorm_schema
+
     def _validate(cls, obj, partial=False, native=False):
         """Validate using a Marshmallow v3+ schema"""
         try:
             if native:
-                data = cls().load(obj, partial=partial, unknown="EXCLUDE")
+                data = _schema(cls).load(obj, partial=partial, unknown="EXCLUDE")
             else:
-                data = cls(partial=partial, unknown="EXCLUDE").dump(obj)
+                data = _schema(cls).dump(obj)
         except MarshmallowError as e:
             raise ValidationError(obj, cls.__name__, e)
         return data
 
+    def _load_many(cls, objs, partial=False):
+        """Load a page of items with a single Marshmallow v3+ ``many=True`` load
+
+        When any of the items are invalid this returns None, and the items should be loaded one at a time instead,
+        since marshmallow doesn't run the post load hooks on any of the items in that case.
+        """
+        try:
+            return _schema(cls).load(
+                objs, many=True, partial=partial, unknown="EXCLUDE"
+            )
+        except MarshmallowError:
+            return None
+
+    def _compile(cls, native):
+        """Generate the load or dump function for a Marshmallow v3+ schema class"""
+        schema = _schema(cls)
+        if any(six.itervalues(schema._hooks)) or schema.opts.ordered:
+            # hooks & schema level validators can do anything with the data, so these are left to marshmallow
+            return None
+        if native:
+            return _load_function(cls, schema)
+        return _dump_function(cls, schema)
+
 
 else:
 
+    def _schema(cls, partial=False):
+        """Return a new Marshmallow 2.x schema instance for a schema class
+
+        Marshmallow 2.x schemas keep state, such as errors, on the instance so they cannot be shared.
+        """
+        return cls(partial=partial)
+
     def _validate(cls, obj, partial=False, native=False):
         """Validate using a Marshmallow 2.x schema"""
         if native:
@@ -35,6 +85,238 @@ else:
             raise ValidationError(obj, cls.__name__, errors)
         return data
 
+    def _load_many(cls, objs, partial=False):
+        """Marshmallow 2.x schemas load a page of items one at a time"""
+        return None
+
+    def _compile(cls, native):
+        """Marshmallow 2.x schemas keep state on the instance, so they always go through marshmallow"""
+        return None
+
+
+def _identity(value):
+    return value
+
+
+def _inline_load(field):
+    """Return ``(condition, expression)`` pairs for the common values of a field that can be loaded inline"""
+    if field.validators:
+        return []
+    if type(field) is fields.String:
+        return [("type(value) is str", "value")]
+    if type(field) is fields.Integer and not field.strict:
+        return [
+            ("type(value) is int", "value"),
+            ("type(value) is Decimal", "int(value)"),
+        ]
+    if type(field) is fields.Float:
+        if field.allow_nan is False:
+            return [("type(value) is float and -inf < value < inf", "value")]
+        return [("type(value) is float", "value")]
+    if type(field) is fields.Boolean and (
+        not field.truthy
+        or (True in field.truthy and False in field.falsy and False not in field.truthy)
+    ):
+        return [("value is True or value is False", "value")]
+    return []
+
+
+def _inline_dump(field):
+    """Return ``(condition, expression)`` pairs for the common values of a field that can be dumped inline"""
+    if type(field) is fields.String:
+        return [("type(value) is str", "value")]
+    if type(field) is fields.Integer and not field.as_string:
+        return [
+            ("type(value) is int", "value"),
+            ("type(value) is Decimal", "int(value)"),
+        ]
+    if type(field) is fields.Float and not field.as_string:
+        return [
+            ("type(value) is float", "value"),
+            ("type(value) is Decimal", "float(value)"),
+        ]
+    if (
+        type(field) is fields.Boolean
+        and False not in field.truthy
+        and True not in field.falsy
+    ):
+        return [("value is True or value is False", "value")]
+    return []
+
+
+def _load_function(cls, schema):
+    """Generate a function that does the same as ``schema.load``, and that fills in None for missing fields when
+    partial like ``dynamorm_validate`` does"""
+    namespace = {
+        "missing": missing,
+        "Decimal": Decimal,
+        "inf": float("inf"),
+        "fallback": functools.partial(cls.dynamorm_validate, native=True),
+    }
+    lines = ["data = {}"]
+    for index, (name, field) in enumerate(six.iteritems(schema.load_fields)):
+        if field.attribute is not None:
+            return None
+
+        key = field.data_key if field.data_key is not None else name
+        deserialize = "deserialize_{0}".format(index)
+        namespace[deserialize] = field.deserialize
+
+        lines.extend(
+            ["value = obj.get({0!r}, missing)".format(key), "if value is missing:"]
+        )
+        if field.required or field.missing is not missing:
+            # let marshmallow raise the required error or fill in the default
+            lines.extend(
+                [
+                    "    if not partial:",
+                    "        value = {0}(missing, {1!r}, obj, partial=partial)".format(
+                        deserialize, key
+                    ),
+                    "        if value is not missing:",
+                    "            data[{0!r}] = value".format(name),
+                ]
+            )
+        else:
+            lines.append("    pass")
+        if field.allow_none:
+            lines.extend(["elif value is None:", "    data[{0!r}] = None".format(name)])
+        for condition, expression in _inline_load(field):
+            lines.extend(
+                [
+                    "elif {0}:".format(condition),
+                    "    data[{0!r}] = {1}".format(name, expression),
+                ]
+            )
+        lines.extend(
+            [
+                "else:",
+                "    data[{0!r}] = {1}(value, {2!r}, obj, partial=partial)".format(
+                    name, deserialize, key
+                ),
+            ]
+        )
+
+    fill_lines = []
+    for name in cls.dynamorm_fields():
+        fill_lines.extend(
+            [
+                "if {0!r} not in data:".format(name),
+                "    data[{0!r}] = None".format(name),
+            ]
+        )
+    if fill_lines:
+        lines.append("if partial:")
+        lines.extend(indent(fill_lines))
+    lines.append("return data")
+
+    return compile_function(
+        "load_{0}".format(cls.__name__),
+        [
+            "if partial is not True and partial is not False:",
+            "    return fallback(obj, partial)",
+        ]
+        + wrap_with_fallback(lines),
+        namespace,
+    )
+
+
+def _dump_function(cls, schema):
+    """Generate a function that does the same as ``schema.dump``"""
+    namespace = {
+        "missing": missing,
+        "Decimal": Decimal,
+        "get_attribute": schema.get_attribute,
+        "fallback": functools.partial(cls.dynamorm_validate, native=False),
+    }
+    lines = ["data = {}"]
+    for index, (name, field) in enumerate(six.iteritems(schema.dump_fields)):
+        key = field.data_key if field.data_key is not None else name
+        serialize = "serialize_{0}".format(index)
+        namespace[serialize] = field.serialize
+
+        # marshmallow pulls the value out of the object, and applies the default, when it serializes the field
+        serialize_lines = [
+            "value = {0}({1!r}, obj, accessor=get_attribute)".format(serialize, name),
+            "if value is not missing:",
+            "    data[{0!r}] = value".format(key),
+        ]
+
+        inline = (
+            _inline_dump(field) if field.attribute is None and "." not in name else []
+        )
+        if not inline:
+            lines.extend(serialize_lines)
+            continue
+
+        lines.extend(
+            [
+                "value = obj.get({0!r}, missing)".format(name),
+                "if value is None:",
+                "    data[{0!r}] = None".format(key),
+            ]
+        )
+        for condition, expression in inline:
+            lines.extend(
+                [
+                    "elif {0}:".format(condition),
+                    "    data[{0!r}] = {1}".format(key, expression),
+                ]
+            )
+        lines.append("else:")
+        lines.extend(indent(serialize_lines))
+    lines.append("return data")
+
+    return compile_function(
+        "dump_{0}".format(cls.__name__), wrap_with_fallback(lines), namespace
+    )
+
+
+class Compressed(fields.Raw):
+    """A field whose value is stored compressed, in a binary attribute.  See :mod:`dynamorm.types.compression`
+
+    :param field: The field for the uncompressed value, like ``fields.Dict()``, that loads & dumps the value
+    :param codec: The name of a registered codec, or a codec object
+    """
+
+    dynamorm_lazy = True
+    serializer = JSON
+
+    def __init__(self, field=None, codec=DEFAULT_CODEC, **kwargs):
+        super(Compressed, self).__init__(**kwargs)
+        self.field = field if field is not None else fields.Raw()
+        self.codec = get_codec(codec)
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        if value is None:
+            return None
+        if isinstance(value, LazyValue):
+            return value.compressed(self.codec, self.serializer)
+        return compress(
+            self.field._serialize(value, attr, obj), self.codec, self.serializer
+        )
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, LazyValue):
+            return value
+        if isinstance(value, Binary):
+            return LazyValue(value, self.codec, self.field.deserialize, self.serializer)
+        return self.field.deserialize(value, attr, data)
+
+
+class Packed(Compressed):
+    """A field whose value is stored packed with MessagePack, in a binary attribute.  See
+    :mod:`dynamorm.types.packing`
+
+    :param field: The field for the unpacked value, like ``fields.Dict()``, that loads & dumps the value
+    :param codec: The name of a registered codec, or a codec object, to also compress the packed value with
+    """
+
+    serializer = MSGPACK
+
+    def __init__(self, field=None, codec="none", **kwargs):
+        super(Packed, self).__init__(field=field, codec=codec, **kwargs)
+
 
 class Schema(MarshmallowSchema, DynamORMSchema):
     """This is the base class for marshmallow based schemas"""
@@ -48,9 +330,50 @@ class Schema(MarshmallowSchema, DynamORMSchema):
             return "N"
         return "S"
 
+    @staticmethod
+    def field_to_converter(field):
+        """Given a marshmallow field object return a function that converts values without validating them"""
+        if type(field) in (fields.Integer, fields.Float):
+            # numbers are loaded from dynamo as Decimals
+            return field.num_type
+        if type(field) in (fields.String, fields.Boolean, fields.Raw):
+            return _identity
+
+        def convert(value):
+            # _deserialize does the conversion without running the validators of the field
+            return field._deserialize(value, None, None)
+
+        return convert
+
+    @staticmethod
+    def field_raw_name(name, field):
+        return (
+            getattr(field, "data_key", None)
+            or getattr(field, "load_from", None)
+            or name
+        )
+
+    @staticmethod
+    def field_load_default(field, partial=False):
+        # marshmallow doesn't fill in missing fields on partial loads, and doesn't deserialize the defaults it fills in
+        if partial or field.missing is missing:
+            return None
+        if callable(field.missing):
+            return field.missing
+        return lambda: field.missing
+
     @classmethod
     def dynamorm_fields(cls):
-        return cls().fields
+        """Return the fields of the schema, which are only built once for each schema class"""
+        try:
+            return cls.__dict__["_dynamorm_fields"]
+        except KeyError:
+            cls._dynamorm_fields = _schema(cls).fields
+            return cls._dynamorm_fields
+
+    @classmethod
+    def compile_function(cls, native):
+        return _compile(cls, native)
 
     @classmethod
     def dynamorm_validate(cls, obj, partial=False, native=False):
@@ -60,12 +383,28 @@ class Schema(MarshmallowSchema, DynamORMSchema):
         # When asking for partial native objects (during model init) we want to return None values
         # This ensures our object has all attributes and we can track partial saves properly
         if partial and native:
-            for name in six.iterkeys(cls().fields):
-                if name not in data:
-                    data[name] = None
+            cls._fill_missing(data)
 
         return data
 
+    @classmethod
+    def _fill_missing(cls, data):
+        for name in six.iterkeys(cls.dynamorm_fields()):
+            if name not in data:
+                data[name] = None
+
+    @classmethod
+    def dynamorm_load_many(cls, objs, partial=False):
+        """Load a page of items through a single ``many=True`` load, unless there is a generated load function"""
+        if cls.__dict__.get("_dynamorm_load") is None:
+            loaded = _load_many(cls, objs, partial)
+            if loaded is not None:
+                if partial:
+                    for data in loaded:
+                        cls._fill_missing(data)
+                return [(data, None) for data in loaded]
+        return super(Schema, cls).dynamorm_load_many(objs, partial=partial)
+
     @staticmethod
     def base_schema_type():
         return MarshmallowSchema
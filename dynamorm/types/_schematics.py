@@ -1,14 +1,201 @@
+import functools
+from decimal import Decimal
+
+import six
+from boto3.dynamodb.types import Binary
 from schematics.models import Model as SchematicsModel
+from schematics.common import DEFAULT
 from schematics.exceptions import (
     ValidationError as SchematicsValidationError,
     ModelConversionError,
 )
 from schematics import types
+from schematics.undefined import Undefined
 
 from .base import DynamORMSchema
+from .codegen import compile_function, wrap_with_fallback
+from .compression import DEFAULT_CODEC, JSON, LazyValue, compress, get_codec
+from .packing import MSGPACK
 from ..exceptions import ValidationError
 
 
+def _identity(value):
+    return value
+
+
+def _is_plain(field):
+    """Returns True if none of the validators of a field do anything"""
+    if field.choices is not None:
+        return False
+    if any(
+        getattr(validator, "__self__", None) is not field
+        for validator in field.validators
+    ):
+        return False
+    if isinstance(field, types.StringType):
+        return (
+            field.min_length is None
+            and field.max_length is None
+            and field.regex is None
+        )
+    if isinstance(field, types.NumberType):
+        return field.min_value is None and field.max_value is None
+    return True
+
+
+def _inline(field):
+    """Return ``(condition, lines)`` pairs for the common values of a field that can be converted inline, where the
+    lines set ``value`` to the native value"""
+    if not _is_plain(field):
+        return []
+    if type(field) is types.StringType:
+        return [("type(value) is text_type", [])]
+    if type(field) in (types.IntType, types.LongType) and not field.strict:
+        return [
+            ("type(value) is int", []),
+            (
+                "type(value) is Decimal",
+                [
+                    "number = int(value)",
+                    "if number != value:",
+                    "    raise ValueError",
+                    "value = number",
+                ],
+            ),
+        ]
+    if type(field) is types.FloatType:
+        return [
+            ("type(value) is float", []),
+            ("type(value) is Decimal", ["value = float(value)"]),
+        ]
+    if type(field) is types.BooleanType:
+        return [("value is True or value is False", [])]
+    return []
+
+
+def _compile(cls, native):
+    """Generate a function that does the same as creating a validated instance of a schematics model, and exporting it
+    with ``to_native`` or ``to_primitive``"""
+    if (
+        cls._validator_functions
+        or cls._serializables
+        or cls._options.roles
+        or cls._options.export_order
+        or cls._options.export_level != DEFAULT
+    ):
+        return None
+
+    namespace = {
+        "Undefined": Undefined,
+        "Decimal": Decimal,
+        "text_type": six.text_type,
+        "fallback": functools.partial(cls.dynamorm_validate, native=native),
+    }
+    lines = ["data = {}"]
+    for index, (name, field) in enumerate(six.iteritems(cls.fields)):
+        if field.is_compound or field.export_level is not None:
+            # compound fields need the context of the whole import & export, so these are left to schematics
+            return None
+
+        key = field.serialized_name or name
+        lines.append("value = obj.get({0!r}, Undefined)".format(name))
+        for input_key in field.get_input_keys():
+            if input_key and input_key != name:
+                lines.extend(
+                    [
+                        "if value is Undefined:",
+                        "    value = obj.get({0!r}, Undefined)".format(input_key),
+                    ]
+                )
+
+        lines.append("if value is Undefined:")
+        if field._default is Undefined:
+            lines.append("    value = None")
+        else:
+            namespace["field_{0}".format(index)] = field
+            lines.extend(
+                [
+                    "    value = field_{0}.default".format(index),
+                    "    if value is Undefined:",
+                    "        value = None",
+                ]
+            )
+
+        lines.append("if value is None:")
+        if field.required:
+            # let schematics raise the required error
+            lines.extend(["    if not partial:", "        raise ValueError"])
+        lines.append("    data[{0!r}] = None".format(key))
+
+        for condition, convert_lines in _inline(field):
+            lines.append("elif {0}:".format(condition))
+            lines.extend("    " + line for line in convert_lines)
+            lines.append("    data[{0!r}] = value".format(key))
+
+        validate = "validate_{0}".format(index)
+        export = "export_{0}".format(index)
+        namespace[validate] = field.validate
+        namespace[export] = field.to_native if native else field.to_primitive
+        lines.extend(
+            ["else:", "    data[{0!r}] = {1}({2}(value))".format(key, export, validate)]
+        )
+    lines.append("return data")
+
+    return compile_function(
+        "{0}_{1}".format("load" if native else "dump", cls.__name__),
+        wrap_with_fallback(lines),
+        namespace,
+    )
+
+
+class CompressedType(types.BaseType):
+    """A type whose value is stored compressed, in a binary attribute.  See :mod:`dynamorm.types.compression`
+
+    :param field: The type of the uncompressed value, like ``DictType(BaseType)``, that converts & validates the value
+    :param codec: The name of a registered codec, or a codec object
+    """
+
+    dynamorm_lazy = True
+    serializer = JSON
+
+    def __init__(self, field=None, codec=DEFAULT_CODEC, **kwargs):
+        super(CompressedType, self).__init__(**kwargs)
+        self.field = field if field is not None else types.BaseType()
+        self.codec = get_codec(codec)
+
+    def to_native(self, value, context=None):
+        if isinstance(value, LazyValue):
+            return value
+        if isinstance(value, Binary):
+            return LazyValue(value, self.codec, self.field.convert, self.serializer)
+        return self.field.convert(value, context)
+
+    def to_primitive(self, value, context=None):
+        if isinstance(value, LazyValue):
+            return value.compressed(self.codec, self.serializer)
+        return compress(
+            self.field.to_primitive(value, context), self.codec, self.serializer
+        )
+
+    def validate_field(self, value, context=None):
+        # values read from the table are trusted, rather than decompressed to be validated
+        if not isinstance(value, LazyValue):
+            self.field.validate(value, context)
+
+
+class PackedType(CompressedType):
+    """A type whose value is stored packed with MessagePack, in a binary attribute.  See :mod:`dynamorm.types.packing`
+
+    :param field: The type of the unpacked value, like ``DictType(BaseType)``, that converts & validates the value
+    :param codec: The name of a registered codec, or a codec object, to also compress the packed value with
+    """
+
+    serializer = MSGPACK
+
+    def __init__(self, field=None, codec="none", **kwargs):
+        super(PackedType, self).__init__(field=field, codec=codec, **kwargs)
+
+
 class Schema(SchematicsModel, DynamORMSchema):
     """This is the base class for schematics based schemas"""
 
@@ -16,14 +203,43 @@ class Schema(SchematicsModel, DynamORMSchema):
     def field_to_dynamo_type(field):
         """Given a schematics field object return the appropriate Dynamo type character"""
         # XXX: Schematics does not currently have a "raw" type that would map to Dynamo's 'B' (binary) type.
+        if isinstance(field, CompressedType):
+            return "B"
         if isinstance(field, types.NumberType):
             return "N"
         return "S"
 
+    @staticmethod
+    def field_to_converter(field):
+        """Given a schematics field object return a function that converts values without validating them"""
+        if type(field) in (types.IntType, types.LongType, types.FloatType):
+            # numbers are loaded from dynamo as Decimals
+            return field.native_type
+        if type(field) in (types.StringType, types.BooleanType):
+            return _identity
+
+        # to_native does the conversion, validation is a separate step in schematics
+        return field.to_native
+
+    @staticmethod
+    def field_raw_name(name, field):
+        return field.serialized_name or name
+
+    @staticmethod
+    def field_load_default(field, partial=False):
+        # schematics fills in the defaults of missing fields on partial loads as well
+        if field._default is Undefined:
+            return None
+        return lambda: field.default
+
     @classmethod
     def dynamorm_fields(cls):
         return cls.fields
 
+    @classmethod
+    def compile_function(cls, native):
+        return _compile(cls, native)
+
     @classmethod
     def dynamorm_validate(cls, obj, partial=False, native=False):
         try:
@@ -1,3 +1,8 @@
+import six
+
+from ..exceptions import ValidationError
+
+
 class DynamORMSchema(object):
     """This is the base class for the inner ``Schema`` class on Tables.
 
@@ -6,6 +11,12 @@ class DynamORMSchema(object):
     type of the attribute, and ``field_to_dynamo_type`` which returns the dynamo type character for the input type.
     """
 
+    __slots__ = ()
+
+    #: Set this to False on a Schema to always validate through the serialization library, rather than through the
+    #: functions generated for the Schema
+    dynamorm_codegen = True
+
     @staticmethod
     def field_to_dynamo_type(field):
         """Returns the dynamo type character given the field."""
@@ -18,6 +29,85 @@ class DynamORMSchema(object):
             "{0} class must implement dynamallow_fields".format(cls.__name__)
         )
 
+    @classmethod
+    def dynamorm_field_types(cls):
+        """Returns a dictionary of attributes to their dynamo type characters, which is only built once per class"""
+        try:
+            return cls.__dict__["_dynamorm_field_types"]
+        except KeyError:
+            cls._dynamorm_field_types = dict(
+                (name, cls.field_to_dynamo_type(field))
+                for name, field in six.iteritems(cls.dynamorm_fields())
+            )
+            return cls._dynamorm_field_types
+
+    @staticmethod
+    def field_to_converter(field):
+        """Returns a function that converts a value of the field, as loaded from dynamo, to its native python type
+        without running any validation."""
+        raise NotImplementedError("Child class must implement field_to_converter")
+
+    @staticmethod
+    def field_raw_name(name, field):
+        """Returns the name under which the field is stored in dynamo"""
+        return name
+
+    @staticmethod
+    def field_load_default(field, partial=False):
+        """Returns a function that returns the native value that loading fills in when the field is missing, or None
+        when the field doesn't have a default for the given partial value"""
+        return None
+
+    @classmethod
+    def dynamorm_converters(cls):
+        """Returns a list of ``(name, raw_name, converter)`` tuples for the fields, which is only built once per class"""
+        try:
+            return cls.__dict__["_dynamorm_converters"]
+        except KeyError:
+            cls._dynamorm_converters = [
+                (name, cls.field_raw_name(name, field), cls.field_to_converter(field))
+                for name, field in six.iteritems(cls.dynamorm_fields())
+            ]
+            return cls._dynamorm_converters
+
+    @classmethod
+    def dynamorm_load_defaults(cls, partial=False):
+        """Returns a dictionary of field names to the functions that return their load defaults, which is only built
+        once per class and partial value"""
+        key = (
+            "_dynamorm_load_defaults_partial" if partial else "_dynamorm_load_defaults"
+        )
+        try:
+            return cls.__dict__[key]
+        except KeyError:
+            defaults = {}
+            for name, field in six.iteritems(cls.dynamorm_fields()):
+                default = cls.field_load_default(field, partial=partial)
+                if default is not None:
+                    defaults[name] = default
+            setattr(cls, key, defaults)
+            return defaults
+
+    @classmethod
+    def dynamorm_convert(cls, obj, partial=False):
+        """Given a dictionary representing a blob from dynamo, that was validated when it was written, this method
+        returns a dictionary of native python values by only converting the types of the values.
+
+        No validation is done, so this is much cheaper than ``dynamorm_validate`` with native set.  Fields that are
+        missing from the blob get their load default, like they would when validating, and are otherwise set to None.
+        """
+        defaults = cls.dynamorm_load_defaults(partial)
+        data = {}
+        for name, raw_name, converter in cls.dynamorm_converters():
+            value = obj.get(raw_name)
+            if value is not None:
+                data[name] = converter(value)
+            elif name in defaults and raw_name not in obj:
+                data[name] = defaults[name]()
+            else:
+                data[name] = None
+        return data
+
     @classmethod
     def dynamorm_validate(cls, obj, partial=False, native=False):
         """Given a dictionary representing a blob from dynamo, this method will validate the blob given the desired
@@ -35,6 +125,55 @@ class DynamORMSchema(object):
             "{0} class must implement dynamallow_validate".format(cls.__name__)
         )
 
+    @classmethod
+    def dynamorm_load(cls, obj, partial=False):
+        """The same as ``dynamorm_validate`` with native set, through the generated load function when there is one"""
+        load = cls.__dict__.get("_dynamorm_load")
+        if load is None:
+            return cls.dynamorm_validate(obj, partial=partial, native=True)
+        return load(obj, partial)
+
+    @classmethod
+    def dynamorm_dump(cls, obj, partial=False):
+        """The same as ``dynamorm_validate`` without native set, through the generated dump function when there is
+        one"""
+        dump = cls.__dict__.get("_dynamorm_dump")
+        if dump is None:
+            return cls.dynamorm_validate(obj, partial=partial)
+        return dump(obj, partial)
+
+    @classmethod
+    def dynamorm_load_many(cls, objs, partial=False):
+        """Load a page of items at once, like ``dynamorm_load``
+
+        :returns: A list with a ``(data, error)`` tuple for each item, in order, where error is the
+                  ``dynamorm.exc.ValidationError`` for items that failed validation and None otherwise
+        """
+        results = []
+        for obj in objs:
+            try:
+                results.append((cls.dynamorm_load(obj, partial=partial), None))
+            except ValidationError as exc:
+                results.append((None, exc))
+        return results
+
+    @classmethod
+    def dynamorm_compile(cls):
+        """Generate the load & dump functions used by ``dynamorm_load`` and ``dynamorm_dump`` for this class
+
+        This is called by the model metaclass when the model is created, unless ``dynamorm_codegen`` is False.  The
+        functions fall back to ``dynamorm_validate`` for anything they don't handle themselves, see
+        :mod:`dynamorm.types.codegen`.
+        """
+        cls._dynamorm_load = cls.compile_function(native=True)
+        cls._dynamorm_dump = cls.compile_function(native=False)
+
+    @classmethod
+    def compile_function(cls, native):
+        """Returns a generated function that does the same as ``dynamorm_validate`` with the given native value, or
+        None when the schema can't be handled by generated code"""
+        return None
+
     @staticmethod
     def base_schema_type():
         """Returns the base class used for schemas of this type"""
@@ -0,0 +1,43 @@
+"""Helpers for generating the specialized load & dump functions of schemas
+
+The schema backends turn each field into a few lines of straight-line Python, with the common cases (strings,
+numbers and booleans without validators) converted inline and everything else handed to the field object from the
+serialization library.  The lines are then compiled into a single function by :func:`compile_function`.
+
+Any failure in a generated function, such as a validation error, makes it fall back to the generic path through the
+serialization library so that the errors raised are exactly the same as when the functions are not used.
+"""
+
+import six
+
+
+def compile_function(name, lines, namespace):
+    """Compile the lines of a function body into a function
+
+    :param str name: The name of the function, which takes ``obj`` and ``partial`` arguments
+    :param list lines: The lines of the body, indented relative to the body
+    :param dict namespace: The globals of the function
+    :returns: The function, with its source available as ``__source__``
+    """
+    source = "def {0}(obj, partial=False):\n{1}\n".format(
+        name, "\n".join("    " + line for line in lines)
+    )
+    namespace = dict(namespace)
+    six.exec_(compile(source, "<dynamorm {0}>".format(name), "exec"), namespace)
+    function = namespace[name]
+    function.__source__ = source
+    return function
+
+
+def wrap_with_fallback(lines):
+    """Wrap the lines of a function body so that any exception calls ``fallback(obj, partial)`` instead"""
+    return (
+        ["try:"]
+        + ["    " + line for line in lines]
+        + ["except Exception:", "    return fallback(obj, partial)"]
+    )
+
+
+def indent(lines, level=1):
+    """Indent lines by a number of levels"""
+    return ["    " * level + line for line in lines]
@@ -0,0 +1,295 @@
+"""Compressed attributes, for fields that hold large documents or text
+
+DynamoDB bills reads & writes by the size of the items, so large JSON documents or text dominate the cost and latency
+of a table.  The compressed field types store their value as JSON, compressed by a codec, in a binary (``B``)
+attribute:
+
+.. code-block:: python
+
+    from marshmallow import fields
+    from dynamorm.types._marshmallow import Compressed
+
+    class Thing(DynaModel):
+        class Table:
+            name = "things"
+            hash_key = "id"
+            read = 5
+            write = 5
+
+        class Schema:
+            id = fields.String(required=True)
+            document = Compressed(fields.Dict(), codec="zlib")
+
+For schematics use ``CompressedType(types.DictType(types.BaseType))`` from ``dynamorm.types._schematics``.  The
+inner field validates and converts the value like it would when it isn't compressed.
+
+Values read from the table are only decompressed when the attribute is accessed on the model, until then they are
+held as a :class:`LazyValue`, and saving the model writes the still compressed value back as is.
+
+``zlib`` is the default codec, ``bz2``, ``lzma`` (on python 3) and ``none``, which doesn't compress, are also
+registered.  Other codecs are any object
+with ``compress`` and ``decompress`` methods that take and return bytes, either passed to the field directly or
+registered by name with :func:`register_codec`.  The codec isn't stored with the value, so changing the codec of a
+field needs the existing items to be migrated.
+
+Values are encoded as JSON before they are compressed by default.  The serializer is pluggable too, the packed field
+types of :mod:`dynamorm.types.packing` encode their values with MessagePack.
+"""
+
+import bz2
+import json
+import zlib
+from decimal import Decimal
+
+import six
+from boto3.dynamodb.types import Binary
+
+try:
+    import lzma
+except ImportError:  # pragma: no cover
+    lzma = None
+
+#: The codec used by the compressed field types when one isn't given
+DEFAULT_CODEC = "zlib"
+
+CODECS = {}
+
+
+class Codec(object):
+    """The base class for codecs, that compress and decompress bytes"""
+
+    name = None
+
+    def compress(self, data):
+        raise NotImplementedError("Child class must implement compress")
+
+    def decompress(self, data):
+        raise NotImplementedError("Child class must implement decompress")
+
+
+class IdentityCodec(Codec):
+    """Doesn't compress, for values that are small or already compact once serialized"""
+
+    name = "none"
+
+    def compress(self, data):
+        return data
+
+    def decompress(self, data):
+        return data
+
+
+class ZlibCodec(Codec):
+    """Compress with :mod:`zlib`, at the given level"""
+
+    name = "zlib"
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, data):
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data):
+        return zlib.decompress(data)
+
+
+class Bz2Codec(Codec):
+    """Compress with :mod:`bz2`, which is slower but often smaller for text"""
+
+    name = "bz2"
+
+    def compress(self, data):
+        return bz2.compress(data)
+
+    def decompress(self, data):
+        return bz2.decompress(data)
+
+
+class LzmaCodec(Codec):
+    """Compress with :mod:`lzma`, which is the slowest but usually the smallest"""
+
+    name = "lzma"
+
+    def compress(self, data):
+        return lzma.compress(data)
+
+    def decompress(self, data):
+        return lzma.decompress(data)
+
+
+def register_codec(codec, name=None):
+    """Register a codec so that fields can refer to it by name
+
+    :param codec: An object with ``compress`` & ``decompress`` methods
+    :param str name: The name to register it as, defaults to the ``name`` attribute of the codec
+    """
+    CODECS[name or codec.name] = codec
+    return codec
+
+
+def get_codec(codec):
+    """Return a codec given its registered name, or the codec itself"""
+    if isinstance(codec, six.string_types):
+        try:
+            return CODECS[codec]
+        except KeyError:
+            raise ValueError(
+                "Unknown codec {0}, must be one of: {1}".format(
+                    codec, ", ".join(sorted(CODECS))
+                )
+            )
+    return codec
+
+
+register_codec(IdentityCodec())
+register_codec(ZlibCodec())
+register_codec(Bz2Codec())
+if lzma is not None:
+    register_codec(LzmaCodec())
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        # numbers inside of documents read from dynamo are Decimals
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError("{0!r} is not JSON serializable".format(value))
+
+
+class JsonSerializer(object):
+    """Serialize primitive values as JSON, which is what the compressed field types use by default
+
+    Serializers turn primitive values into bytes with ``dumps`` and back with ``loads``.
+    """
+
+    name = "json"
+
+    def dumps(self, value):
+        data = json.dumps(value, separators=(",", ":"), default=_json_default)
+        return data.encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data.decode("utf-8"))
+
+
+JSON = JsonSerializer()
+
+
+def compress(value, codec, serializer=JSON):
+    """Serialize a primitive value, as JSON by default, and compress it
+
+    :returns: The compressed value as a :class:`~boto3.dynamodb.types.Binary`, so that it's stored as a ``B``
+    """
+    return Binary(codec.compress(serializer.dumps(value)))
+
+
+def decompress(data, codec, serializer=JSON):
+    """Decompress the primitive value of an attribute"""
+    if isinstance(data, Binary):
+        data = data.value
+    return serializer.loads(codec.decompress(bytes(data)))
+
+
+class LazyValue(object):
+    """A compressed value that is only decompressed, and loaded by the inner field, when its ``value`` is used"""
+
+    __slots__ = ("data", "codec", "load", "serializer", "_value")
+
+    _missing = object()
+
+    def __init__(self, data, codec, load, serializer=JSON):
+        self.data = data.value if isinstance(data, Binary) else data
+        self.codec = codec
+        self.load = load
+        self.serializer = serializer
+        self._value = self._missing
+
+    @property
+    def value(self):
+        if self._value is self._missing:
+            self._value = self.load(self.primitive())
+        return self._value
+
+    def compressed(self, codec, serializer=JSON):
+        """Return the value compressed by a codec, which only needs to be recompressed when it's a different codec or
+        serializer"""
+        if codec is self.codec and serializer is self.serializer:
+            return Binary(self.data)
+        return compress(self.primitive(), codec, serializer)
+
+    def primitive(self):
+        return decompress(self.data, self.codec, self.serializer)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyValue):
+            other = other.value
+        return self.value == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<LazyValue of {0} compressed bytes>".format(len(self.data))
+
+
+class LazyAttribute(object):
+    """A descriptor for the attributes of compressed fields on models, that replaces a :class:`LazyValue` with its value
+    the first time the attribute is accessed
+
+    The values are kept in the ``__dict__`` of the instance, or for compact models in the slot given as ``slot``.
+    """
+
+    __slots__ = ("name", "slot")
+
+    def __init__(self, name, slot=None):
+        self.name = name
+        self.slot = slot
+
+    @staticmethod
+    def slot_name(name):
+        """Return the name of the slot for the values of the attribute with the given name on compact models"""
+        return "_lazy_{0}".format(name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if self.slot is not None:
+            value = self.slot.__get__(instance, owner)
+            if isinstance(value, LazyValue):
+                value = value.value
+                self.slot.__set__(instance, value)
+            return value
+
+        try:
+            value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+        if isinstance(value, LazyValue):
+            value = instance.__dict__[self.name] = value.value
+        return value
+
+    def raw(self, instance):
+        """Return the value of the attribute without decompressing it, which is the :class:`LazyValue` itself until
+        the attribute has been accessed"""
+        if self.slot is not None:
+            return self.slot.__get__(instance, instance.__class__)
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+    def __set__(self, instance, value):
+        if self.slot is not None:
+            self.slot.__set__(instance, value)
+        else:
+            instance.__dict__[self.name] = value
+
+    def __delete__(self, instance):
+        if self.slot is not None:
+            return self.slot.__delete__(instance)
+        try:
+            del instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
@@ -0,0 +1,236 @@
+"""Packed attributes, for fields that hold nested documents
+
+boto3 stores nested dicts & lists as ``M`` & ``L`` attributes, wrapping every value inside of them with its type.  For
+deeply nested documents, like configuration, that makes items larger and serializing them slow.  The packed field
+types store the whole document as a single binary (``B``) attribute encoded with `MessagePack`_ instead:
+
+.. code-block:: python
+
+    from marshmallow import fields
+    from dynamorm.types._marshmallow import Packed
+
+    class Service(DynaModel):
+        class Table:
+            name = "services"
+            hash_key = "name"
+            read = 5
+            write = 5
+
+        class Schema:
+            name = fields.String(required=True)
+            config = Packed(fields.Dict())
+
+For schematics use ``PackedType(types.DictType(types.BaseType))`` from ``dynamorm.types._schematics``.
+
+The packed field types are compressed field types, see :mod:`dynamorm.types.compression`, that use the
+:data:`MSGPACK` serializer and don't compress by default.  Any codec can be given to compress the packed value as
+well, and values read from the table are only unpacked when the attribute is accessed.
+
+The ``msgpack`` package is used when it's installed (``pip install dynamorm[msgpack]``), otherwise values are packed
+by :func:`packb` & :func:`unpackb`, which are slower but produce the same bytes.  Packed attributes can't be used in
+conditions, filters or updates of their nested values.
+
+.. _MessagePack: https://msgpack.org/
+"""
+
+import struct
+from decimal import Decimal
+
+import six
+from boto3.dynamodb.types import Binary
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        # numbers inside of documents read from dynamo are Decimals
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, Binary):
+        return value.value
+    raise TypeError("{0!r} can't be packed".format(value))
+
+
+def _pack_length(parts, length, fix_type, fix_limit, types):
+    """Add the header of a str, bin, array or map of the given length"""
+    if fix_type is not None and length < fix_limit:
+        parts.append(struct.pack("B", fix_type | length))
+    elif types[0] is not None and length <= 0xFF:
+        parts.append(struct.pack(">BB", types[0], length))
+    elif length <= 0xFFFF:
+        parts.append(struct.pack(">BH", types[1], length))
+    elif length <= 0xFFFFFFFF:
+        parts.append(struct.pack(">BI", types[2], length))
+    else:
+        raise ValueError("{0} is too long to be packed".format(length))
+
+
+def _pack_int(parts, value):
+    if 0 <= value < 0x80:
+        parts.append(struct.pack("B", value))
+    elif -0x20 <= value < 0:
+        parts.append(struct.pack("b", value))
+    elif 0 <= value <= 0xFF:
+        parts.append(struct.pack(">BB", 0xCC, value))
+    elif 0 <= value <= 0xFFFF:
+        parts.append(struct.pack(">BH", 0xCD, value))
+    elif 0 <= value <= 0xFFFFFFFF:
+        parts.append(struct.pack(">BI", 0xCE, value))
+    elif 0 <= value <= 0xFFFFFFFFFFFFFFFF:
+        parts.append(struct.pack(">BQ", 0xCF, value))
+    elif -0x80 <= value < 0:
+        parts.append(struct.pack(">Bb", 0xD0, value))
+    elif -0x8000 <= value < 0:
+        parts.append(struct.pack(">Bh", 0xD1, value))
+    elif -0x80000000 <= value < 0:
+        parts.append(struct.pack(">Bi", 0xD2, value))
+    elif -0x8000000000000000 <= value < 0:
+        parts.append(struct.pack(">Bq", 0xD3, value))
+    else:
+        raise ValueError("{0} is too large to be packed".format(value))
+
+
+def _pack(parts, value):
+    if value is None:
+        parts.append(b"\xc0")
+    elif value is True:
+        parts.append(b"\xc3")
+    elif value is False:
+        parts.append(b"\xc2")
+    elif isinstance(value, six.integer_types):
+        _pack_int(parts, value)
+    elif isinstance(value, float):
+        parts.append(struct.pack(">Bd", 0xCB, value))
+    elif isinstance(value, six.text_type) or (six.PY2 and isinstance(value, str)):
+        if isinstance(value, six.text_type):
+            value = value.encode("utf-8")
+        _pack_length(parts, len(value), 0xA0, 32, (0xD9, 0xDA, 0xDB))
+        parts.append(value)
+    elif isinstance(value, (bytes, bytearray)):
+        _pack_length(parts, len(value), None, 0, (0xC4, 0xC5, 0xC6))
+        parts.append(bytes(value))
+    elif isinstance(value, (list, tuple)):
+        _pack_length(parts, len(value), 0x90, 16, (None, 0xDC, 0xDD))
+        for item in value:
+            _pack(parts, item)
+    elif isinstance(value, dict):
+        _pack_length(parts, len(value), 0x80, 16, (None, 0xDE, 0xDF))
+        for key, item in six.iteritems(value):
+            _pack(parts, key)
+            _pack(parts, item)
+    else:
+        _pack(parts, _default(value))
+
+
+def packb(value):
+    """Pack a primitive value with MessagePack, in pure python"""
+    parts = []
+    _pack(parts, value)
+    return b"".join(parts)
+
+
+# the struct format and size of the values that follow each fixed size type byte
+_FIXED = {
+    0xCA: (">f", 4),
+    0xCB: (">d", 8),
+    0xCC: (">B", 1),
+    0xCD: (">H", 2),
+    0xCE: (">I", 4),
+    0xCF: (">Q", 8),
+    0xD0: (">b", 1),
+    0xD1: (">h", 2),
+    0xD2: (">i", 4),
+    0xD3: (">q", 8),
+}
+
+# the struct format and size of the lengths that follow each variable size type byte
+_LENGTHS = {
+    0xC4: (">B", 1),
+    0xC5: (">H", 2),
+    0xC6: (">I", 4),
+    0xD9: (">B", 1),
+    0xDA: (">H", 2),
+    0xDB: (">I", 4),
+    0xDC: (">H", 2),
+    0xDD: (">I", 4),
+    0xDE: (">H", 2),
+    0xDF: (">I", 4),
+}
+
+_CONSTANTS = {0xC0: None, 0xC2: False, 0xC3: True}
+
+
+def _unpack(data, offset):
+    """Unpack the value at offset, returning it along with the offset of the next value"""
+    code = six.indexbytes(data, offset)
+    offset += 1
+
+    if code < 0x80:
+        return code, offset
+    if code >= 0xE0:
+        return code - 0x100, offset
+    if code in _CONSTANTS:
+        return _CONSTANTS[code], offset
+    if code in _FIXED:
+        fmt, size = _FIXED[code]
+        return struct.unpack_from(fmt, data, offset)[0], offset + size
+
+    if code in _LENGTHS:
+        fmt, size = _LENGTHS[code]
+        length = struct.unpack_from(fmt, data, offset)[0]
+        offset += size
+    elif 0xA0 <= code < 0xC0:
+        length = code & 0x1F
+    elif 0x80 <= code < 0xA0:
+        length = code & 0x0F
+    else:
+        raise ValueError("Unsupported MessagePack type 0x{0:02x}".format(code))
+
+    if 0xA0 <= code < 0xC0 or code in (0xD9, 0xDA, 0xDB):
+        end = offset + length
+        return data[offset:end].decode("utf-8"), end
+    if code in (0xC4, 0xC5, 0xC6):
+        end = offset + length
+        return bytes(data[offset:end]), end
+    if 0x90 <= code < 0xA0 or code in (0xDC, 0xDD):
+        items = []
+        for _ in six.moves.range(length):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+
+    items = {}
+    for _ in six.moves.range(length):
+        key, offset = _unpack(data, offset)
+        items[key], offset = _unpack(data, offset)
+    return items, offset
+
+
+def unpackb(data):
+    """Unpack a value packed with MessagePack, in pure python"""
+    value, offset = _unpack(bytes(data), 0)
+    if offset != len(data):
+        raise ValueError("Extra data after the packed value")
+    return value
+
+
+class MsgpackSerializer(object):
+    """Serialize primitive values with MessagePack, through the ``msgpack`` package when it's installed"""
+
+    name = "msgpack"
+
+    def dumps(self, value):
+        if msgpack is None:
+            return packb(value)
+        return msgpack.packb(value, use_bin_type=True, default=_default)
+
+    def loads(self, data):
+        if msgpack is None:
+            return unpackb(data)
+        return msgpack.unpackb(data, raw=False)
+
+
+MSGPACK = MsgpackSerializer()
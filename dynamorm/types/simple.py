@@ -0,0 +1,506 @@
+"""A lightweight schema backend for services where the CPU & memory used per item matter more than the flexibility of
+the schema.
+
+Fields are declared with type annotations, :class:`Field` objects or as a :mod:`dataclasses` dataclass, and don't need
+marshmallow or schematics to be installed:
+
+.. code-block:: python
+
+    from typing import List, Optional
+
+    from dynamorm import DynaModel
+    from dynamorm.types.simple import Field
+
+    class Thing(DynaModel):
+        class Table:
+            name = "things"
+            hash_key = "id"
+            read = 5
+            write = 5
+
+        class Schema:
+            id: str
+            name: Optional[str]
+            count: int = 0
+            tags: List[str] = Field(default=list)
+            color: str = Field(default="purple", validators=[lambda value: value in ("purple", "orange")])
+
+Like a dataclass, annotated fields without a default are required unless they are ``Optional``.  On python 2, where
+there are no annotations, the type is given to the field instead: ``id = Field(str, required=True)``.
+
+Values are coerced to the type of their field, so that numbers loaded from dynamo as ``Decimal`` become ``int`` or
+``float`` and ISO 8601 strings become ``datetime`` objects.  See :data:`TYPES` for the supported types.  Validators
+are called with the coerced value and either return False or raise ``ValueError`` when the value is invalid.
+
+The Schema classes are also slotted records: ``Thing.Schema(id="one")`` returns a validated instance that stores its
+values in ``__slots__`` rather than a ``__dict__``.
+"""
+
+import datetime
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+
+import six
+
+from .base import DynamORMSchema
+from ..exceptions import DynaModelException, ValidationError
+
+try:
+    from typing import Any, Union
+except ImportError:  # pragma: no cover
+    Any = Union = None
+
+MISSING = object()
+
+TRUE_VALUES = ("true", "True", "TRUE", "1", "yes", "on")
+FALSE_VALUES = ("false", "False", "FALSE", "0", "no", "off")
+
+
+def _text(value):
+    if isinstance(value, six.text_type):
+        return value
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    raise TypeError(value)
+
+
+def _integer(value):
+    if isinstance(value, bool):
+        raise TypeError(value)
+    if isinstance(value, six.integer_types):
+        return value
+    if isinstance(value, (float, Decimal)):
+        number = int(value)
+        if number != value:
+            raise ValueError(value)
+        return number
+    if isinstance(value, six.string_types):
+        return int(value)
+    raise TypeError(value)
+
+
+def _float(value):
+    if isinstance(value, bool):
+        raise TypeError(value)
+    if isinstance(value, (float, Decimal) + six.integer_types + six.string_types):
+        return float(value)
+    raise TypeError(value)
+
+
+def _decimal(value):
+    if isinstance(value, bool):
+        raise TypeError(value)
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    if isinstance(value, six.integer_types + six.string_types):
+        return Decimal(value)
+    raise TypeError(value)
+
+
+def _boolean(value):
+    if value is True or value is False:
+        return value
+    if isinstance(value, six.string_types):
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+    elif isinstance(value, six.integer_types + (Decimal,)) and value in (0, 1):
+        return bool(value)
+    raise ValueError(value)
+
+
+def _dict(value):
+    if isinstance(value, dict):
+        return value
+    raise TypeError(value)
+
+
+def _list(value):
+    if isinstance(value, list):
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(value)
+
+
+def _binary(value):
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, bytearray):
+        return bytes(value)
+    # boto3 loads binary attributes as boto3.dynamodb.types.Binary
+    if isinstance(getattr(value, "value", None), bytes):
+        return value.value
+    raise TypeError(value)
+
+
+def _parse_datetime(value):
+    if hasattr(datetime.datetime, "fromisoformat"):
+        return datetime.datetime.fromisoformat(value)
+    try:
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+    except ValueError:
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S")
+
+
+def _datetime(value):
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, six.string_types):
+        return _parse_datetime(value)
+    raise TypeError(value)
+
+
+def _date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, six.string_types):
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    raise TypeError(value)
+
+
+def _uuid(value):
+    if isinstance(value, uuid.UUID):
+        return value
+    if isinstance(value, six.string_types):
+        return uuid.UUID(value)
+    raise TypeError(value)
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _identity(value):
+    return value
+
+
+#: The supported field types, mapped to their dynamo type character and the functions that coerce values to the native
+#: and primitive types of the field
+TYPES = {
+    six.text_type: ("S", _text, _identity),
+    int: ("N", _integer, _identity),
+    float: ("N", _float, _identity),
+    Decimal: ("N", _decimal, _identity),
+    bool: ("S", _boolean, _identity),
+    dict: ("S", _dict, _identity),
+    list: ("S", _list, _identity),
+    datetime.datetime: ("S", _datetime, _isoformat),
+    datetime.date: ("S", _date, _isoformat),
+    uuid.UUID: ("S", _uuid, six.text_type),
+    object: ("S", _identity, _identity),
+}
+if six.PY2:  # pragma: no cover
+    TYPES[str] = TYPES[six.text_type]
+    TYPES[long] = TYPES[int]  # noqa: F821
+else:
+    TYPES[bytes] = ("B", _binary, _identity)
+
+_TYPES_BY_NAME = dict((type_.__name__, type_) for type_ in TYPES)
+
+
+def resolve_type(annotation):
+    """Returns a tuple of the type in :data:`TYPES` for an annotation, and if the annotation is ``Optional``
+
+    Generic annotations are resolved to their container, so ``List[str]`` is a ``list``, and string annotations are
+    resolved by name.
+    """
+    if isinstance(annotation, six.string_types):
+        optional = annotation.startswith("Optional[")
+        if optional:
+            annotation = annotation[len("Optional[") : -1]
+        name = annotation.split("[", 1)[0].strip()
+        name = {"List": "list", "Dict": "dict", "Any": "object"}.get(name, name)
+        try:
+            return _TYPES_BY_NAME[name], optional
+        except KeyError:
+            raise DynaModelException(
+                "Unsupported type annotation {0}".format(annotation)
+            )
+
+    optional = False
+    origin = getattr(annotation, "__origin__", None)
+    if Union is not None and origin is Union:
+        args = [arg for arg in annotation.__args__ if arg is not type(None)]
+        if len(args) != 1:
+            raise DynaModelException(
+                "Unsupported type annotation {0}".format(annotation)
+            )
+        optional = True
+        annotation = args[0]
+        origin = getattr(annotation, "__origin__", None)
+
+    if origin is not None:
+        annotation = origin
+    if Any is not None and annotation is Any:
+        return object, optional
+    if annotation not in TYPES:
+        raise DynaModelException("Unsupported type annotation {0}".format(annotation))
+    return annotation, optional
+
+
+class Field(object):
+    """A field of a simple Schema
+
+    :param type: The type of the field, when it isn't declared with an annotation
+    :param bool required: When True the field must be present, and not None, unless validating partially
+    :param default: The value used when the field is missing, or a callable that returns it
+    :param list validators: Callables that are passed the coerced value and return False, or raise ``ValueError``,
+                            when the value is invalid
+    """
+
+    __slots__ = (
+        "type",
+        "required",
+        "default",
+        "validators",
+        "dynamo_type",
+        "to_native",
+        "to_primitive",
+    )
+
+    def __init__(self, type=None, required=False, default=MISSING, validators=()):
+        self.type = type
+        self.required = required
+        self.default = default
+        self.validators = list(validators)
+        self.dynamo_type = self.to_native = self.to_primitive = None
+
+    def __repr__(self):
+        return "Field({0}, required={1})".format(
+            getattr(self.type, "__name__", self.type), self.required
+        )
+
+    def resolve(self, name):
+        """Resolve the type of the field into its converters, once the type is known"""
+        if self.type is None:
+            raise DynaModelException("The field {0} has no type".format(name))
+        type_, _ = resolve_type(self.type)
+        self.dynamo_type, self.to_native, self.to_primitive = TYPES[type_]
+
+
+# The attributes that the dataclass decorator adds, which we replace with our own
+_DATACLASS_ATTRS = (
+    "__dataclass_fields__",
+    "__dataclass_params__",
+    "__init__",
+    "__repr__",
+    "__eq__",
+    "__hash__",
+    "__match_args__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+    "__setattr__",
+    "__delattr__",
+)
+
+
+def _dataclass_fields(attrs):
+    """Build our fields from the fields of a dataclass"""
+    import dataclasses
+
+    fields = OrderedDict()
+    for name, dc_field in six.iteritems(attrs["__dataclass_fields__"]):
+        attrs.pop(name, None)
+        default = dc_field.default
+        if dc_field.default_factory is not dataclasses.MISSING:
+            default = dc_field.default_factory
+        _, optional = resolve_type(dc_field.type)
+        fields[name] = Field(
+            dc_field.type,
+            required=dc_field.metadata.get(
+                "required", default is dataclasses.MISSING and not optional
+            ),
+            default=MISSING if default is dataclasses.MISSING else default,
+            validators=dc_field.metadata.get("validators", ()),
+        )
+    return fields
+
+
+def _declared_fields(attrs):
+    """Build our fields from the annotations and Field objects in a class namespace"""
+    fields = OrderedDict()
+    for name, annotation in six.iteritems(attrs.get("__annotations__", {})):
+        value = attrs.pop(name, MISSING)
+        if isinstance(value, Field):
+            if value.type is None:
+                value.type = annotation
+            fields[name] = value
+        else:
+            _, optional = resolve_type(annotation)
+            fields[name] = Field(
+                annotation,
+                required=value is MISSING and not optional,
+                default=value,
+            )
+
+    for name, value in list(six.iteritems(attrs)):
+        if isinstance(value, Field):
+            fields[name] = attrs.pop(name)
+    return fields
+
+
+class SchemaMeta(type):
+    """Collects the fields of a simple Schema and gives the class ``__slots__`` for them"""
+
+    def __new__(mcs, name, bases, attrs):
+        attrs = dict(attrs)
+
+        # inner classes that are copied into their schema class bring the descriptors of their own instance dicts
+        attrs.pop("__dict__", None)
+        attrs.pop("__weakref__", None)
+
+        if "__dataclass_fields__" in attrs:
+            declared = _dataclass_fields(attrs)
+            for attr in _DATACLASS_ATTRS:
+                attrs.pop(attr, None)
+        else:
+            declared = _declared_fields(attrs)
+
+        fields = OrderedDict()
+        for base in reversed(bases):
+            fields.update(getattr(base, "_fields", {}))
+        for field_name, field in six.iteritems(declared):
+            field.resolve(field_name)
+            fields[field_name] = field
+
+        attrs["__slots__"] = tuple(
+            field_name
+            for field_name in declared
+            if not any(field_name in getattr(base, "_fields", {}) for base in bases)
+        )
+        attrs["_fields"] = fields
+        attrs["_field_items"] = list(six.iteritems(fields))
+        return super(SchemaMeta, mcs).__new__(mcs, name, bases, attrs)
+
+
+def _library_field(value):
+    return type(value).__module__.split(".", 1)[0] in ("marshmallow", "schematics")
+
+
+def is_simple_schema(cls):
+    """Returns True if an inner Schema class is declared for this backend, rather than marshmallow or schematics"""
+    if isinstance(cls, SchemaMeta) or "__dataclass_fields__" in cls.__dict__:
+        return True
+    if any(isinstance(value, Field) for value in six.itervalues(cls.__dict__)):
+        return True
+    return bool(cls.__dict__.get("__annotations__")) and not any(
+        _library_field(value) for value in six.itervalues(cls.__dict__)
+    )
+
+
+@six.add_metaclass(SchemaMeta)
+class Schema(DynamORMSchema):
+    """This is the base class for simple schemas
+
+    Instances are validated records of the field values, stored in ``__slots__``.
+    """
+
+    def __init__(self, **values):
+        for name, value in six.iteritems(self.dynamorm_validate(values, native=True)):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return "{0}({1})".format(
+            self.__class__.__name__,
+            ", ".join(
+                "{0}={1!r}".format(name, getattr(self, name)) for name in self._fields
+            ),
+        )
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self._fields
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def to_dict(self, native=False):
+        """Returns the values of the record as a dict, of native or primitive values"""
+        obj = dict((name, getattr(self, name)) for name in self._fields)
+        if native:
+            return obj
+        return self.dynamorm_validate(obj)
+
+    @staticmethod
+    def field_to_dynamo_type(field):
+        return field.dynamo_type
+
+    @staticmethod
+    def field_to_converter(field):
+        return field.to_native
+
+    @staticmethod
+    def field_load_default(field, partial=False):
+        if partial or field.default is MISSING:
+            return None
+
+        def load_default():
+            default = field.default
+            value = default() if callable(default) else default
+            return None if value is None else field.to_native(value)
+
+        return load_default
+
+    @classmethod
+    def dynamorm_fields(cls):
+        return cls._fields
+
+    @classmethod
+    def dynamorm_validate(cls, obj, partial=False, native=False):
+        data = {}
+        errors = {}
+        for name, field in cls._field_items:
+            value = obj.get(name)
+            if value is None and not partial and field.default is not MISSING:
+                if name not in obj:
+                    default = field.default
+                    value = default() if callable(default) else default
+
+            if value is None:
+                if field.required and not partial:
+                    errors[name] = ["This field is required."]
+                data[name] = None
+                continue
+
+            try:
+                value = field.to_native(value)
+            except (TypeError, ValueError, OverflowError):
+                errors[name] = [
+                    "Not a valid {0}.".format(
+                        getattr(field.type, "__name__", field.type)
+                    )
+                ]
+                continue
+
+            messages = []
+            for validator in field.validators:
+                try:
+                    if validator(value) is False:
+                        messages.append("Invalid value.")
+                except ValueError as exc:
+                    messages.append(six.text_type(exc) or "Invalid value.")
+            if messages:
+                errors[name] = messages
+                continue
+
+            data[name] = value if native else field.to_primitive(value)
+
+        if errors:
+            raise ValidationError(obj, cls.__name__, errors)
+        return data
+
+    @staticmethod
+    def base_schema_type():
+        return Schema
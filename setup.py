@@ -13,9 +13,15 @@ setup(
     url="https://github.com/NerdWalletOSS/DynamORM",
     license="Apache License Version 2.0",
     python_requires=">=2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*, !=3.4.*, <4",
-    install_requires=["blinker>=1.4,<2.0", "boto3>=1.3,<2.0", "six"],
+    install_requires=[
+        "blinker>=1.4,<2.0",
+        "boto3>=1.3,<2.0",
+        "futures; python_version < '3'",
+        "six",
+    ],
     extras_require={
         "marshmallow": ["marshmallow>=2.15.1,<4"],
+        "msgpack": ["msgpack>=0.6"],
         "schematics": ["schematics>=2.1.0,<3"],
     },
     packages=["dynamorm", "dynamorm.types"],
@@ -14,7 +14,7 @@ from dynamorm import (
     ProjectKeys,
     ProjectInclude,
 )
-from dynamorm import local
+from dynamorm import local, ratelimit
 from dynamorm.table import DynamoTable3
 
 log = logging.getLogger(__name__)
@@ -258,6 +258,124 @@ def TestModelTwo_table(request, TestModelTwo, dynamo_local):
     request.addfinalizer(TestModelTwo.Table.delete)
 
 
+@pytest.fixture(scope="session")
+def OtherModel():
+    """Provides a second model, with its own table, to mix with TestModel in batch operations"""
+
+    if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+        from marshmallow import fields
+
+        class OtherModel(DynaModel):
+            class Table:
+                name = "jelly"
+                hash_key = "name"
+                read = 5
+                write = 5
+
+            class Schema:
+                name = fields.String(required=True)
+                flavour = fields.String()
+                jars = fields.Integer()
+
+    else:
+        from schematics import types
+
+        class OtherModel(DynaModel):
+            class Table:
+                name = "jelly"
+                hash_key = "name"
+                read = 5
+                write = 5
+
+            class Schema:
+                name = types.StringType(required=True)
+                flavour = types.StringType()
+                jars = types.IntType()
+
+    return OtherModel
+
+
+@pytest.fixture(scope="function")
+def OtherModel_entries(request, OtherModel, dynamo_local):
+    """Used with OtherModel, creates and deletes the table and populates entries"""
+    OtherModel.Table.create_table()
+    request.addfinalizer(OtherModel.Table.delete)
+    OtherModel.put_batch(
+        {"name": "grape", "flavour": "purple", "jars": 3},
+        {"name": "strawberry", "flavour": "red", "jars": 5},
+    )
+
+
+@pytest.fixture(scope="session")
+def Limited():
+    """Provides a rate limited model"""
+
+    if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+        from marshmallow import fields
+
+        class Limited(DynaModel):
+            class Table:
+                name = "limited"
+                hash_key = "foo"
+                read = 10
+                write = 4
+                rate_limit = 0.5
+
+            class ByBar(GlobalIndex):
+                name = "by-bar"
+                hash_key = "bar"
+                read = 2
+                write = 2
+                projection = ProjectAll()
+
+            class Schema:
+                foo = fields.String(required=True)
+                bar = fields.String()
+
+    else:
+        from schematics import types
+
+        class Limited(DynaModel):
+            class Table:
+                name = "limited"
+                hash_key = "foo"
+                read = 10
+                write = 4
+                rate_limit = 0.5
+
+            class ByBar(GlobalIndex):
+                name = "by-bar"
+                hash_key = "bar"
+                read = 2
+                write = 2
+                projection = ProjectAll()
+
+            class Schema:
+                foo = types.StringType(required=True)
+                bar = types.StringType()
+
+    return Limited
+
+
+@pytest.fixture(scope="function")
+def Limited_limiter(request, Limited):
+    """Used with Limited, provides its rate limiter and resets the shared buckets & estimates after the test"""
+
+    def reset():
+        ratelimit._buckets.clear()
+        ratelimit._estimates.clear()
+
+    request.addfinalizer(reset)
+    return Limited.Table.rate_limiter
+
+
+@pytest.fixture(scope="function")
+def Limited_table(request, Limited, Limited_limiter, dynamo_local):
+    """Used with Limited, creates and deletes the table around the test"""
+    Limited.Table.create_table()
+    request.addfinalizer(Limited.Table.delete)
+
+
 @pytest.fixture(scope="session")
 def dynamo_local(request):
     """Connect to a local dynamo instance"""
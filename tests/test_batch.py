@@ -0,0 +1,326 @@
+"""These tests require dynamo local running"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from dynamorm import batch_get, batch_write, write_buffer
+from dynamorm.batch import BatchWriter, ParallelBatchWriter, active_write_buffer
+from dynamorm.exceptions import InvalidSchemaField, ValidationError
+
+
+def test_batch_get(TestModel, TestModel_entries, OtherModel, OtherModel_entries):
+    results = batch_get(
+        {
+            TestModel: [
+                {"foo": "first", "bar": "one"},
+                {"foo": "first", "bar": "three"},
+                # duplicates are only requested once
+                {"foo": "first", "bar": "three"},
+                # missing items are simply not returned
+                {"foo": "first", "bar": "nope"},
+            ],
+            OtherModel: [{"name": "grape"}],
+        }
+    )
+
+    assert sorted(item.bar for item in results[TestModel]) == ["one", "three"]
+    assert all(isinstance(item, TestModel) for item in results[TestModel])
+
+    assert len(results[OtherModel]) == 1
+    assert results[OtherModel][0].jars == 3
+
+
+def test_batch_get_many_keys(TestModel, TestModel_entries_xlarge):
+    """More keys than fit into a single request are split over multiple requests"""
+    keys = [{"foo": "first", "bar": str(i)} for i in range(250)]
+    results = batch_get({TestModel: keys})
+    assert len(results[TestModel]) == 250
+
+
+def test_batch_get_unprocessed_keys(OtherModel, mocker):
+    """Keys that DynamoDB does not process are retried, with backoff"""
+    resource = mocker.MagicMock()
+    resource.batch_get_item.side_effect = [
+        {
+            "Responses": {"jelly": [{"name": "grape"}]},
+            "UnprocessedKeys": {"jelly": {"Keys": [{"name": "strawberry"}]}},
+        },
+        {"Responses": {"jelly": [{"name": "strawberry"}]}, "UnprocessedKeys": {}},
+    ]
+    mocker.patch.object(
+        OtherModel.Table.__class__,
+        "resource",
+        new_callable=mocker.PropertyMock,
+        return_value=resource,
+    )
+    sleep = mocker.patch("dynamorm.batch.time.sleep")
+
+    results = batch_get({OtherModel: [{"name": "grape"}, {"name": "strawberry"}]})
+
+    assert sorted(item.name for item in results[OtherModel]) == ["grape", "strawberry"]
+    assert resource.batch_get_item.call_count == 2
+    assert resource.batch_get_item.call_args_list[1] == mocker.call(
+        RequestItems={"jelly": {"Keys": [{"name": "strawberry"}]}}
+    )
+    sleep.assert_called_once_with(0.05)
+
+
+def test_batch_get_invalid_field(TestModel, OtherModel):
+    with pytest.raises(InvalidSchemaField):
+        batch_get({TestModel: [{"invalid": "nope"}], OtherModel: [{"name": "grape"}]})
+
+
+def test_batch_write(TestModel, TestModel_entries, OtherModel, OtherModel_entries):
+    first_two = TestModel.get(foo="first", bar="two")
+
+    with batch_write() as batch:
+        batch.put(TestModel(foo="second", bar="one", baz="new"))
+        batch.put(OtherModel, {"name": "apricot", "flavour": "orange"})
+        batch.delete(first_two)
+        batch.delete(OtherModel, {"name": "grape"})
+
+        # nothing is written until the context exits
+        assert OtherModel.get(name="apricot") is None
+
+    assert TestModel.get(foo="second", bar="one").baz == "new"
+    assert TestModel.get(foo="first", bar="two") is None
+    assert OtherModel.get(name="apricot").flavour == "orange"
+    assert OtherModel.get(name="grape") is None
+
+
+def test_batch_write_last_write_wins(OtherModel, OtherModel_entries):
+    with batch_write() as batch:
+        for jars in range(30):
+            batch.put(OtherModel, {"name": "grape", "jars": jars})
+        batch.put(OtherModel, {"name": "raspberry"})
+        batch.delete(OtherModel, {"name": "raspberry"})
+
+    assert OtherModel.get(name="grape").jars == 29
+    assert OtherModel.get(name="raspberry") is None
+
+
+def test_batch_write_many(OtherModel, OtherModel_entries):
+    with batch_write() as batch:
+        for i in range(60):
+            batch.put(OtherModel, {"name": str(i)})
+
+    assert len(list(OtherModel.scan())) == 62
+
+
+def test_batch_write_exception_discards(OtherModel, OtherModel_entries):
+    with pytest.raises(RuntimeError):
+        with batch_write() as batch:
+            batch.put(OtherModel, {"name": "apricot"})
+            raise RuntimeError("nope")
+
+    assert OtherModel.get(name="apricot") is None
+
+
+def test_batch_write_validation(OtherModel):
+    if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+        pytest.skip("Marshmallow does marshalling and not validation when serializing")
+
+    with pytest.raises(ValidationError):
+        with batch_write() as batch:
+            batch.put(OtherModel, {"flavour": "no name"})
+
+
+def test_parallel_batch_write(OtherModel, OtherModel_entries):
+    with batch_write(concurrency=4) as batch:
+        assert isinstance(batch, ParallelBatchWriter)
+        for i in range(260):
+            batch.put(OtherModel, {"name": str(i), "jars": i})
+        batch.delete(OtherModel, {"name": "grape"})
+
+    assert len(list(OtherModel.scan().recursive())) == 261
+    assert OtherModel.get(name="259").jars == 259
+
+    assert batch.stats.written == 261
+    assert batch.stats.requests >= 11
+    assert batch.stats.items_per_second > 0
+
+
+def test_batch_write_unprocessed_items(OtherModel, mocker):
+    """Items that DynamoDB does not process are retried, with backoff"""
+    client = mocker.MagicMock()
+    client.batch_write_item.side_effect = [
+        {
+            "UnprocessedItems": {
+                "jelly": [{"PutRequest": {"Item": {"name": "strawberry"}}}]
+            }
+        },
+        {"UnprocessedItems": {}},
+    ]
+    mocker.patch.object(BatchWriter, "_client", return_value=client)
+    sleep = mocker.patch("dynamorm.batch.time.sleep")
+
+    with batch_write() as batch:
+        batch.put(OtherModel, {"name": "grape"})
+        batch.put(OtherModel, {"name": "strawberry"})
+
+    assert client.batch_write_item.call_count == 2
+    assert client.batch_write_item.call_args_list[1] == mocker.call(
+        RequestItems={"jelly": [{"PutRequest": {"Item": {"name": "strawberry"}}}]}
+    )
+    sleep.assert_called_once_with(0.05)
+
+    assert batch.stats.written == 2
+    assert batch.stats.requests == 2
+    assert batch.stats.retried == 1
+
+
+def test_parallel_batch_write_exception(OtherModel, mocker):
+    """Exceptions raised on the worker threads are re-raised when the writes are flushed"""
+    client = mocker.MagicMock()
+    client.batch_write_item.side_effect = RuntimeError("boom")
+    mocker.patch.object(BatchWriter, "_client", return_value=client)
+
+    batch = batch_write(concurrency=2)
+    batch.put(OtherModel, {"name": "grape"})
+    with pytest.raises(RuntimeError):
+        batch.flush()
+
+
+def test_parallel_batch_write_last_write_wins(OtherModel, mocker):
+    """A write to a key that is still in flight waits for the earlier request, even while it retries"""
+    sent = []
+
+    def batch_write_item(RequestItems):
+        names = [
+            request["PutRequest"]["Item"]["name"] for request in RequestItems["jelly"]
+        ]
+        if "grape" in names and not sent:
+            # the first request is slow, and leaves grape unprocessed
+            time.sleep(0.2)
+            sent.append(names)
+            return {
+                "UnprocessedItems": {
+                    "jelly": [{"PutRequest": {"Item": {"name": "grape", "jars": 1}}}]
+                }
+            }
+        sent.append(names)
+        return {"UnprocessedItems": {}}
+
+    client = mocker.MagicMock()
+    client.batch_write_item.side_effect = batch_write_item
+    mocker.patch.object(BatchWriter, "_client", return_value=client)
+    mocker.patch("dynamorm.batch.Backoff.sleep")
+
+    with batch_write(concurrency=4) as batch:
+        for jars in (1, 2):
+            batch.put(OtherModel, {"name": "grape", "jars": jars})
+            for i in range(24):
+                batch.put(OtherModel, {"name": "{0}-{1}".format(jars, i)})
+
+    grapes = [names for names in sent if "grape" in names]
+    assert len(grapes) == 3
+    # the retry of the first write completed before the second write was sent
+    assert grapes[1] == ["grape"]
+    assert len(grapes[2]) == 25
+
+
+def test_write_buffer(TestModel, TestModel_entries, OtherModel, OtherModel_entries):
+    with write_buffer(max_delay=60) as buffer:
+        assert active_write_buffer() is buffer
+
+        for count in (1, 2, 3):
+            thing = TestModel(foo="second", bar="one", baz="buffered", count=count)
+            thing.save()
+        OtherModel.put({"name": "apricot", "jars": 1})
+
+        # writes with extra arguments are not buffered
+        OtherModel.put({"name": "lime"}, ReturnValues="NONE")
+        assert OtherModel.get(name="lime") is not None
+
+        # nothing else is written until the buffer is flushed
+        assert TestModel.get(foo="second", bar="one") is None
+        assert OtherModel.get(name="apricot") is None
+
+        buffer.flush()
+        assert OtherModel.get(name="apricot").jars == 1
+
+        OtherModel.put({"name": "apricot", "jars": 2})
+
+    assert active_write_buffer() is None
+    assert TestModel.get(foo="second", bar="one").count == 3
+    assert OtherModel.get(name="apricot").jars == 2
+
+    assert buffer.stats.written == 3
+    assert buffer.stats.requests == 2
+    assert buffer.stats.coalesced == 2
+
+
+def test_write_buffer_max_delay(OtherModel, OtherModel_entries):
+    with write_buffer(max_delay=0.1):
+        OtherModel.put({"name": "apricot"})
+
+        deadline = time.time() + 5
+        while OtherModel.get(name="apricot") is None:
+            assert time.time() < deadline
+            time.sleep(0.05)
+
+
+def test_write_buffer_other_threads(OtherModel, OtherModel_entries):
+    """Writes from other threads are not added to the buffer"""
+    seen = []
+
+    def other():
+        seen.append(active_write_buffer())
+        OtherModel.put({"name": "lime"})
+
+    with write_buffer(max_delay=60):
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+
+        assert seen == [None]
+        assert OtherModel.get(name="lime") is not None
+
+
+def test_write_buffer_error(OtherModel, mocker):
+    """Errors when flushing from the background thread are re-raised by the next write"""
+    client = mocker.MagicMock()
+    client.batch_write_item.side_effect = RuntimeError("boom")
+    mocker.patch.object(BatchWriter, "_client", return_value=client)
+
+    with pytest.raises(RuntimeError):
+        with write_buffer(max_delay=0.01):
+            OtherModel.put({"name": "apricot"})
+            while not client.batch_write_item.called:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            OtherModel.put({"name": "lime"})
+
+
+def test_write_buffer_error_keeps_writes(OtherModel, mocker):
+    """Writes that failed to be sent from the background thread are kept, and sent by the next flush"""
+    failing = [True]
+
+    def batch_write_item(**kwargs):
+        if failing:
+            raise RuntimeError("boom")
+        return {}
+
+    client = mocker.MagicMock()
+    client.batch_write_item.side_effect = batch_write_item
+    mocker.patch.object(BatchWriter, "_client", return_value=client)
+
+    with write_buffer(max_delay=0.01) as buffer:
+        OtherModel.put({"name": "apricot"})
+        while not client.batch_write_item.called:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+        with pytest.raises(RuntimeError):
+            OtherModel.put({"name": "lime"})
+
+        del failing[:]
+        buffer.flush()
+        assert not buffer.pending
+
+    assert client.batch_write_item.call_args[1]["RequestItems"] == {
+        OtherModel.Table.name: [{"PutRequest": {"Item": {"name": "apricot"}}}]
+    }
@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+import pytest
+import six
+from boto3.dynamodb.types import Binary
+
+from dynamorm import capacity
+from dynamorm.exceptions import ItemTooLarge
+
+
+@pytest.mark.parametrize(
+    "value, size",
+    [
+        ("", 0),
+        ("abc", 3),
+        (six.u("\u00e9t\u00e9"), 5),
+        (True, 1),
+        (None, 1),
+        (Binary(b"\x00\x01"), 2),
+        (0, 2),
+        (1, 2),
+        (12, 2),
+        (123, 3),
+        (-123, 4),
+        (Decimal("1000000"), 2),
+        (Decimal("0.5"), 2),
+        (1.25, 3),
+        ([], 3),
+        (["a", 1], 3 + 2 + 3),
+        ({"a": "bc"}, 3 + 1 + 2 + 1),
+        ({"a": {"b": []}}, 3 + 1 + (3 + 1 + 3 + 1) + 1),
+        (set(["ab", "c"]), 3),
+    ],
+)
+def test_attribute_size(value, size):
+    assert capacity.attribute_size(value) == size
+
+
+def test_item_size():
+    assert capacity.item_size({"id": "abc", "count": 12, "gone": None}) == 5 + 7
+    with pytest.raises(TypeError):
+        capacity.item_size({"id": object()})
+
+
+def test_estimate(TestModel):
+    item = {
+        "foo": "first",
+        "bar": "one",
+        "baz": "x",
+        "count": 1,
+        "things": ["x" * 5000],
+    }
+    estimate = TestModel.estimate(item)
+
+    assert estimate.size == capacity.item_size(item)
+    assert estimate.write_units == 5
+    assert estimate.read_units == 2
+    assert estimate.eventual_read_units == 1.0
+
+    # the bar index projects everything, baz only the keys & count, and the item isn't in by_date since it has no when
+    assert estimate.index_write_units == {"bar": 5, "baz": 1}
+    assert estimate.total_write_units == 11
+
+    # instances are estimated from what save would write
+    assert TestModel.estimate(TestModel(**item)).size == estimate.size
+
+
+def test_item_size_thresholds(TestModel, TestModel_table, monkeypatch, caplog):
+    item = {"foo": "first", "bar": "one", "baz": "x" * 2000}
+
+    monkeypatch.setattr(TestModel.Table, "item_size_warning", 1024)
+    TestModel.put(item)
+    assert "consumes 2 write capacity units" in caplog.text
+
+    monkeypatch.setattr(TestModel.Table, "item_size_limit", 1500)
+    with pytest.raises(ItemTooLarge):
+        TestModel.put(dict(item, bar="two"))
+    with pytest.raises(ItemTooLarge):
+        TestModel.put_batch(dict(item, bar="three"))
+
+    assert TestModel.get(foo="first", bar="one") is not None
+    assert TestModel.get(foo="first", bar="two") is None
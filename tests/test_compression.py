@@ -0,0 +1,153 @@
+import os
+import zlib
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import Binary
+
+from dynamorm import DynaModel
+from dynamorm.exceptions import ValidationError
+from dynamorm.types import compression
+from dynamorm.types.compression import LazyValue
+
+
+def is_marshmallow():
+    return "marshmallow" in (os.getenv("SERIALIZATION_PKG") or "")
+
+
+class ReverseCodec(object):
+    """A codec that doesn't compress, to check that codecs are pluggable"""
+
+    def compress(self, data):
+        return data[::-1]
+
+    def decompress(self, data):
+        return data[::-1]
+
+
+@pytest.fixture
+def Document(request):
+    if is_marshmallow():
+        from marshmallow import fields, validate
+        from dynamorm.types._marshmallow import Compressed
+
+        class Document(DynaModel):
+            class Table:
+                name = "documents"
+                hash_key = "id"
+                read = 5
+                write = 5
+
+            class Schema:
+                id = fields.String(required=True)
+                body = Compressed(fields.Dict())
+                text = Compressed(
+                    fields.String(validate=validate.Length(max=1000)),
+                    codec=ReverseCodec(),
+                )
+
+    else:
+        from schematics import types
+        from dynamorm.types._schematics import CompressedType
+
+        class Document(DynaModel):
+            class Table:
+                name = "documents"
+                hash_key = "id"
+                read = 5
+                write = 5
+
+            class Schema:
+                id = types.StringType(required=True)
+                body = CompressedType(types.DictType(types.BaseType))
+                text = CompressedType(
+                    types.StringType(max_length=1000), codec=ReverseCodec()
+                )
+
+    return Document
+
+
+def test_codecs():
+    assert compression.get_codec("zlib") is compression.CODECS["zlib"]
+    codec = ReverseCodec()
+    assert compression.get_codec(codec) is codec
+    with pytest.raises(ValueError):
+        compression.get_codec("nope")
+
+    data = {"a": [1, Decimal(2), Decimal("2.5")], "b": "text"}
+    for name in compression.CODECS:
+        codec = compression.get_codec(name)
+        compressed = compression.compress(data, codec)
+        assert isinstance(compressed, Binary)
+        assert compression.decompress(compressed, codec) == {
+            "a": [1, 2, 2.5],
+            "b": "text",
+        }
+
+
+def test_compressed_fields(Document):
+    assert Document.Schema.dynamorm_field_types() == {
+        "id": "S",
+        "body": "B",
+        "text": "B",
+    }
+
+    body = {"rows": [{"n": i, "name": "row {0}".format(i)} for i in range(100)]}
+    doc = Document(id="one", body=body, text="hello")
+    item = doc.to_dict()
+
+    assert isinstance(item["body"], Binary)
+    assert zlib.decompress(item["body"].value).startswith(b'{"rows":')
+    assert item["text"] == Binary(b'"olleh"')
+
+    with pytest.raises(ValidationError):
+        Document(id="one", text="x" * 1001)
+
+    # values read from the table are only decompressed when they're accessed
+    loaded = Document.new_from_raw(item)
+    assert isinstance(loaded.__dict__["body"], LazyValue)
+    assert loaded.body == body
+    assert loaded.__dict__["body"] == body
+    assert loaded.text == "hello"
+
+    # and when they're not accessed the compressed value is written back as is
+    untouched = Document.new_from_raw(item, trusted=True)
+    assert isinstance(untouched.__dict__["body"], LazyValue)
+    assert Document.Schema.dynamorm_dump(untouched._validated_data) == item
+
+
+def test_compressed_passthrough(Document, mocker):
+    """Values that were never accessed are dumped without being decompressed and compressed again"""
+    body = {"rows": [{"n": i, "name": "row {0}".format(i)} for i in range(100)]}
+    item = Document(id="one", body=body, text="hello").to_dict()
+
+    decompress = mocker.spy(compression.CODECS["zlib"], "decompress")
+    compress = mocker.spy(compression.CODECS["zlib"], "compress")
+    for trusted in (False, True):
+        loaded = Document.new_from_raw(item, trusted=trusted)
+        assert loaded.to_dict() == item
+        assert isinstance(loaded.__dict__["body"], LazyValue)
+    assert not decompress.called
+    assert not compress.called
+
+    # once a value has been accessed it's compressed from the value, which may have been changed
+    loaded.body["rows"].append({"n": 100})
+    dumped = loaded.to_dict()["body"]
+    assert zlib.decompress(dumped.value).endswith(b'{"n":100}]}')
+
+
+def test_compressed_table(Document, dynamo_local, request):
+    Document.Table.create_table()
+    request.addfinalizer(Document.Table.delete)
+
+    body = {"rows": [{"n": i, "name": "row {0}".format(i)} for i in range(100)]}
+    Document(id="one", body=body, text="hello").save()
+
+    doc = Document.get(id="one")
+    assert doc.body == body
+    assert doc.text == "hello"
+
+    doc.text = "goodbye"
+    doc.save(partial=True)
+    assert Document.get(id="one").text == "goodbye"
+    assert Document.get(id="one").body == body
@@ -0,0 +1,139 @@
+"""These tests require dynamo local running"""
+
+import json
+import os
+import textwrap
+
+import pytest
+
+from dynamorm.__main__ import main
+from dynamorm.importer import import_file, load_model, model_path
+
+
+def is_marshmallow():
+    return "marshmallow" in (os.getenv("SERIALIZATION_PKG") or "")
+
+
+@pytest.fixture
+def jelly_module(tmpdir, monkeypatch):
+    """An importable module with a model for the OtherModel table, so it can be loaded by the worker processes"""
+    if is_marshmallow():
+        fields = "from marshmallow.fields import String, Integer"
+    else:
+        fields = "from schematics.types import StringType as String, IntType as Integer"
+
+    tmpdir.join("jelly_models.py").write(
+        textwrap.dedent(
+            """
+            from dynamorm import DynaModel
+            {0}
+
+
+            class Jelly(DynaModel):
+                class Table:
+                    name = "jelly"
+                    hash_key = "name"
+                    read = 5
+                    write = 5
+
+                class Schema:
+                    name = String(required=True)
+                    flavour = String()
+                    jars = Integer()
+            """
+        ).format(fields)
+    )
+    monkeypatch.syspath_prepend(str(tmpdir))
+    return "jelly_models:Jelly"
+
+
+def test_load_model(jelly_module):
+    model = load_model(jelly_module)
+    assert model.__name__ == "Jelly"
+    assert load_model("jelly_models.Jelly") is model
+    assert model_path(model) == jelly_module
+
+
+def test_import_ndjson(OtherModel, OtherModel_entries, tmpdir):
+    path = tmpdir.join("jelly.ndjson")
+    path.write(
+        "\n".join(
+            [json.dumps({"name": str(i), "jars": i}) for i in range(30)]
+            + ["", "{not json", "[1, 2]"]
+        )
+        + "\n"
+    )
+    rejects = tmpdir.join("rejects.ndjson")
+    reported = []
+
+    stats = import_file(
+        OtherModel,
+        str(path),
+        processes=0,
+        chunk_size=7,
+        rejects_path=str(rejects),
+        progress=reported.append,
+    )
+
+    assert stats.written == 30
+    assert stats.failed_validation == 2
+    assert reported == [stats]
+    assert OtherModel.get(name="29").jars == 29
+
+    rejected = [json.loads(line) for line in rejects.readlines()]
+    assert [row["line"] for row in rejected] == [32, 33]
+    assert rejected[0]["row"] == "{not json\n"
+    assert rejected[1]["error"] == "Rows must be objects"
+
+
+def test_import_invalid_rows(OtherModel, OtherModel_entries, tmpdir):
+    if is_marshmallow():
+        pytest.skip("Marshmallow does marshalling and not validation when serializing")
+
+    path = tmpdir.join("jelly.ndjson")
+    path.write('{"name": "apricot"}\n{"flavour": "nameless"}\n')
+
+    stats = import_file(OtherModel, str(path), processes=0)
+    assert stats.written == 1
+    assert stats.failed_validation == 1
+
+
+def test_import_csv(OtherModel, OtherModel_entries, tmpdir):
+    path = tmpdir.join("jelly.csv")
+    path.write("name,flavour,jars\napricot,orange,4\nlime,,\n")
+
+    stats = import_file(OtherModel, str(path), processes=0, rate_limit=0.5)
+    assert stats.written == 2
+
+    assert OtherModel.get(name="apricot").jars == 4
+    assert OtherModel.get(name="lime").to_dict().get("flavour") is None
+
+    # the rate limit only applies during the import
+    assert OtherModel.Table.rate_limiter is None
+
+
+def test_import_command(OtherModel, OtherModel_entries, jelly_module, tmpdir):
+    """The command line validates rows in worker processes"""
+    path = tmpdir.join("jelly.ndjson")
+    path.write("".join(json.dumps({"name": str(i)}) + "\n" for i in range(100)))
+
+    assert main(["import", jelly_module, str(path), "--processes", "2", "--quiet"]) == 0
+    assert len(list(OtherModel.scan())) == 102
+
+    path.write('{"name": "apricot"}\n"nope"\n')
+    rejects = tmpdir.join("rejects.ndjson")
+    assert (
+        main(
+            [
+                "import",
+                jelly_module,
+                str(path),
+                "--processes",
+                "2",
+                "--rejects",
+                str(rejects),
+            ]
+        )
+        == 1
+    )
+    assert len(rejects.readlines()) == 1
@@ -2,11 +2,16 @@ import os
 import pytest
 
 from dynamorm.model import DynaModel
+from dynamorm.session import Session
 from dynamorm.indexes import GlobalIndex, LocalIndex, ProjectAll, ProjectInclude
+from dynamorm.signals import post_init
+from dynamorm.table import remove_nones
 from dynamorm.exceptions import (
+    ConditionFailed,
     DynaModelException,
     HashKeyExists,
     InvalidSchemaField,
+    InvalidTableAttribute,
     MissingTableAttribute,
     ValidationError,
 )
@@ -666,6 +671,92 @@ def test_model_mixin():
     assert isinstance(MyModel.Schema.dynamorm_fields()["bar"], String)
 
 
+def test_schema_metadata_cached():
+    """Schema fields & types are built once per schema class, and not shared with subclasses"""
+
+    class Base(DynaModel):
+        class Table:
+            name = "table"
+            hash_key = "foo"
+            read = 1
+            write = 1
+
+        class Schema:
+            foo = String(required=True)
+
+    assert Base.Schema.dynamorm_fields() is Base.Schema.dynamorm_fields()
+    assert Base.Schema.dynamorm_field_types() == {"foo": "S"}
+
+    class ChildSchema(Base.Schema):
+        count = Number()
+
+    assert sorted(ChildSchema.dynamorm_fields()) == ["count", "foo"]
+    assert ChildSchema.dynamorm_field_types() == {"foo": "S", "count": "N"}
+    assert sorted(Base.Schema.dynamorm_fields()) == ["foo"]
+
+
+def test_generated_functions():
+    """The load & dump functions generated for a schema give the same results, and errors, as the library"""
+    from decimal import Decimal
+
+    class Model(DynaModel):
+        class Table:
+            name = "table"
+            hash_key = "foo"
+            read = 1
+            write = 1
+
+        class Schema:
+            foo = String(required=True)
+            count = Number()
+
+    assert Model.Schema.__dict__["_dynamorm_load"] is not None
+    assert Model.Schema.__dict__["_dynamorm_dump"] is not None
+
+    items = [
+        {"foo": "one", "count": Decimal(2)},
+        {"foo": "one", "count": 2, "unknown": True},
+        {"count": 2},
+        {"foo": "one", "count": "nope"},
+    ]
+    for item in items:
+        for partial in (False, True):
+            for native, function in (
+                (True, Model.Schema.dynamorm_load),
+                (False, Model.Schema.dynamorm_dump),
+            ):
+                try:
+                    expected = Model.Schema.dynamorm_validate(
+                        dict(item), partial=partial, native=native
+                    )
+                except Exception as exc:
+                    # marshmallow doesn't validate when dumping, so invalid values can raise other exceptions
+                    with pytest.raises(type(exc)) as excinfo:
+                        function(dict(item), partial=partial)
+                    assert str(excinfo.value) == str(exc)
+                else:
+                    assert function(dict(item), partial=partial) == expected
+
+    assert Model(foo="one", count=Decimal(2)).to_dict() == {"foo": "one", "count": 2}
+
+
+def test_generated_functions_disabled():
+    class Model(DynaModel):
+        class Table:
+            name = "table"
+            hash_key = "foo"
+            read = 1
+            write = 1
+
+        class Schema:
+            dynamorm_codegen = False
+
+            foo = String(required=True)
+
+    assert "_dynamorm_load" not in Model.Schema.__dict__
+    assert Model(foo="one").to_dict() == {"foo": "one"}
+
+
 def test_table_config(TestModel, dynamo_local):
     class MyModel(DynaModel):
         class Table:
@@ -751,3 +842,163 @@ def test_query_with_id_and_recursive(TestModel, TestModel_entries_xlarge, dynamo
     https://github.com/NerdWalletOSS/dynamorm/pull/63/
     """
     assert len(list(TestModel.query(foo="first").recursive())) == 4000
+
+
+def test_compact_instances():
+    class Model(DynaModel):
+        dynamorm_compact = True
+
+        class Table:
+            name = "table"
+            hash_key = "foo"
+            read = 1
+            write = 1
+
+        class Schema:
+            foo = String(required=True)
+            count = Number()
+
+    post_init_raw = []
+    post_init.connect(
+        lambda sender, instance, partial, raw: post_init_raw.append(raw),
+        sender=Model,
+        weak=False,
+    )
+
+    instance = Model(foo="one", count=2)
+    assert not hasattr(instance, "__dict__")
+    assert "foo" in Model.__slots__
+    assert instance.to_dict() == {"foo": "one", "count": 2}
+    assert post_init_raw == [{"foo": "one", "count": 2}]
+
+    # the raw data is dropped once the instance is loaded, and only fields can be set
+    assert not hasattr(instance, "_raw")
+    with pytest.raises(AttributeError):
+        instance.other = True
+
+    for loaded in (
+        Model.new_from_raw({"foo": "two", "count": 3}, trusted=True),
+        Model.new_from_raw_page([{"foo": "two", "count": 3}])[0],
+    ):
+        assert (loaded.foo, loaded.count) == ("two", 3)
+        loaded.count = 4
+        assert loaded.to_dict() == {"foo": "two", "count": 4}
+
+    class Child(Model):
+        class Schema(Model.Schema):
+            extra = String()
+
+    child = Child(foo="three", extra="yes")
+    assert not hasattr(child, "__dict__")
+    assert Child.__slots__ == ("extra",)
+    assert (child.foo, child.extra) == ("three", "yes")
+
+
+def test_trusted_load_defaults():
+    """Trusted loads fill in the load defaults of missing fields, like validated loads do"""
+
+    class Model(DynaModel):
+        class Table:
+            name = "table"
+            hash_key = "foo"
+            read = 1
+            write = 1
+
+        if is_marshmallow():
+
+            class Schema:
+                foo = String(required=True)
+                color = String(missing="purple")
+                count = Number(missing=lambda: 1)
+                other = String()
+
+        else:
+
+            class Schema:
+                foo = String(required=True)
+                color = String(default="purple")
+                count = Number(default=lambda: 1)
+                other = String()
+
+    for raw in ({"foo": "one"}, {"foo": "one", "color": "orange", "count": 2}):
+        validated = Model.new_from_raw(dict(raw))
+        trusted = Model.new_from_raw(dict(raw), trusted=True)
+        assert (trusted.color, trusted.count) == (validated.color, validated.count)
+        # marshmallow leaves fields without a default off of validated instances, where trusted loads set them to None
+        assert remove_nones(trusted.to_dict()) == remove_nones(validated.to_dict())
+
+    loaded = Model.new_from_raw({"foo": "one"}, trusted=True)
+    assert (loaded.color, loaded.count) == ("purple", 1)
+
+
+def test_version_field(dynamo_local, request):
+    class Model(DynaModel):
+        class Table:
+            name = "versioned"
+            hash_key = "foo"
+            read = 1
+            write = 1
+            version_field = "version"
+
+        class Schema:
+            foo = String(required=True)
+            baz = String()
+            version = Number()
+
+    Model.Table.create_table()
+    request.addfinalizer(Model.Table.delete)
+
+    model = Model(foo="one", baz="a")
+    model.save()
+    assert model.version == 1
+
+    # another writer that read the same version can't overwrite the item
+    stale = Model.get(foo="one")
+    model.baz = "b"
+    model.save()
+    assert model.version == 2
+    stale.baz = "c"
+    with pytest.raises(ConditionFailed):
+        stale.save()
+    with pytest.raises(ConditionFailed):
+        stale.update(baz="c")
+
+    # a new instance can't replace an item that has a version
+    with pytest.raises(ConditionFailed):
+        Model(foo="one", baz="d").save()
+
+    model.update(baz="e", conditions=dict(baz="b"))
+    assert model.version == 3
+    model.baz = "f"
+    model.save(partial=True)
+    assert model.version == 4
+
+    stored = Model.get(foo="one", consistent=True)
+    assert (stored.baz, stored.version) == ("f", 4)
+
+    # sessions check the versions of the instances they write
+    with Session(transactional=True):
+        stored = Model.get(foo="one")
+        stored.baz = "g"
+    assert stored.version == 5
+    with pytest.raises(ConditionFailed):
+        with Session() as session:
+            model.baz = "h"
+            session.add(model)
+    assert Model.get(foo="one", consistent=True).baz == "g"
+
+
+def test_version_field_type():
+    with pytest.raises(InvalidTableAttribute):
+
+        class Model(DynaModel):
+            class Table:
+                name = "versioned"
+                hash_key = "foo"
+                read = 1
+                write = 1
+                version_field = "version"
+
+            class Schema:
+                foo = String(required=True)
+                version = String()
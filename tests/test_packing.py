@@ -0,0 +1,126 @@
+import os
+from decimal import Decimal
+
+import pytest
+import six
+from boto3.dynamodb.types import Binary
+
+from dynamorm import DynaModel
+from dynamorm.types import packing
+from dynamorm.types.compression import LazyValue
+
+
+def is_marshmallow():
+    return "marshmallow" in (os.getenv("SERIALIZATION_PKG") or "")
+
+
+@pytest.fixture
+def Service(request):
+    if is_marshmallow():
+        from marshmallow import fields
+        from dynamorm.types._marshmallow import Packed
+
+        class Service(DynaModel):
+            class Table:
+                name = "services"
+                hash_key = "name"
+                read = 5
+                write = 5
+
+            class Schema:
+                name = fields.String(required=True)
+                config = Packed(fields.Dict())
+                history = Packed(fields.List(fields.Dict()), codec="zlib")
+
+    else:
+        from schematics import types
+        from dynamorm.types._schematics import PackedType
+
+        class Service(DynaModel):
+            class Table:
+                name = "services"
+                hash_key = "name"
+                read = 5
+                write = 5
+
+            class Schema:
+                name = types.StringType(required=True)
+                config = PackedType(types.DictType(types.BaseType))
+                history = PackedType(
+                    types.ListType(types.DictType(types.BaseType)), codec="zlib"
+                )
+
+    return Service
+
+
+@pytest.mark.parametrize(
+    "value, packed",
+    [
+        (None, b"\xc0"),
+        (True, b"\xc3"),
+        (5, b"\x05"),
+        (-1, b"\xff"),
+        (200, b"\xcc\xc8"),
+        (-200, b"\xd1\xff\x38"),
+        (70000, b"\xce\x00\x01\x11\x70"),
+        (1.5, b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00"),
+        (six.u("\u00e9"), b"\xa2\xc3\xa9"),
+        (b"\x00", b"\xc4\x01\x00"),
+        ([1, [2]], b"\x92\x01\x91\x02"),
+        ({"a": None}, b"\x81\xa1a\xc0"),
+    ],
+)
+def test_packb(value, packed):
+    assert packing.packb(value) == packed
+    assert packing.unpackb(packed) == value
+
+
+def test_pack_documents():
+    document = {
+        "name": "x" * 300,
+        "ports": list(range(20)),
+        "limits": dict(("limit{0}".format(i), i * 1000) for i in range(20)),
+        "ratio": Decimal("0.25"),
+        "retries": Decimal(3),
+        "nested": {"deep": {"deeper": [{"on": True, "off": False}]}},
+    }
+    packed = packing.packb(document)
+    assert packing.unpackb(packed) == dict(document, ratio=0.25, retries=3)
+    assert packing.MSGPACK.loads(packing.MSGPACK.dumps(document)) == dict(
+        document, ratio=0.25, retries=3
+    )
+
+
+def test_msgpack_compatible():
+    msgpack = pytest.importorskip("msgpack")
+    document = {"a": [1, -200, 70000, 1.5, "x" * 40, b"\x00"], "b": {"c": None}}
+    assert msgpack.packb(document, use_bin_type=True) == packing.packb(document)
+    assert msgpack.unpackb(packing.packb(document), raw=False) == document
+
+
+def test_packed_fields(Service, dynamo_local, request):
+    assert Service.Schema.dynamorm_field_types() == {
+        "name": "S",
+        "config": "B",
+        "history": "B",
+    }
+
+    config = {"replicas": 3, "env": {"DEBUG": "0"}, "ports": [80, 443]}
+    history = [{"version": i, "by": "deploy"} for i in range(50)]
+    item = Service(name="api", config=config, history=history).to_dict()
+
+    assert item["config"] == Binary(packing.packb(config))
+    assert isinstance(item["history"], Binary)
+    assert len(item["history"].value) < len(packing.packb(history))
+
+    loaded = Service.new_from_raw(item)
+    assert isinstance(loaded.__dict__["config"], LazyValue)
+    assert loaded.config == config
+    assert loaded.history == history
+
+    Service.Table.create_table()
+    request.addfinalizer(Service.Table.delete)
+    Service(name="api", config=config, history=history).save()
+    service = Service.get(name="api")
+    assert service.config == config
+    assert service.history == history
@@ -0,0 +1,150 @@
+import os
+import time
+
+import pytest
+
+from dynamorm import DynaModel
+from dynamorm.exceptions import InvalidTableAttribute
+from dynamorm.ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+
+if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
+    from marshmallow.fields import String
+else:
+    from schematics.types import StringType as String
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=100, capacity=10)
+
+    # the bucket starts out full
+    assert bucket.acquire(10) == 0
+
+    # and then we need to wait for it to refill
+    start = time.time()
+    assert bucket.acquire(5) > 0
+    assert time.time() - start >= 0.04
+
+
+def test_token_bucket_debt():
+    """Acquiring more than the capacity leaves the bucket in debt"""
+    bucket = TokenBucket(rate=100, capacity=10)
+    assert bucket.acquire(30) == 0
+    assert bucket.tokens == -20
+
+    bucket.adjust(-20)
+    assert bucket.tokens >= 0
+
+
+def test_file_token_bucket(tmpdir):
+    path = str(tmpdir.join("bucket"))
+    one = FileTokenBucket(path, rate=100, capacity=10)
+    two = FileTokenBucket(path, rate=100, capacity=10)
+
+    assert one.acquire(10) == 0
+    # the second bucket shares the state of the first, so it has to wait
+    assert two.acquire(5) > 0
+
+
+def test_invalid_rate_limit():
+    for rate_limit in (-1, 0.0, 1.5):
+        with pytest.raises(InvalidTableAttribute):
+
+            class Model(DynaModel):
+                class Table:
+                    name = "table"
+                    hash_key = "foo"
+                    read = 1
+                    write = 1
+
+                Table.rate_limit = rate_limit
+
+                class Schema:
+                    foo = String(required=True)
+
+
+def test_rate_limiter_buckets(Limited, Limited_limiter):
+    limiter = Limited_limiter
+    assert isinstance(limiter, RateLimiter)
+
+    assert limiter.bucket("read").rate == 5
+    assert limiter.bucket("write").rate == 2
+    assert limiter.bucket("read", "by-bar").rate == 1
+
+    # buckets are shared by every model using the same table...
+    class Other(DynaModel):
+        class Table:
+            name = "limited"
+            hash_key = "foo"
+            read = 10
+            write = 4
+            rate_limit = 0.5
+
+        class Schema:
+            foo = String(required=True)
+
+    assert Other.Table.rate_limiter.bucket("read") is limiter.bucket("read")
+
+    # ...so they must agree on the rate
+    class Mismatched(DynaModel):
+        class Table:
+            name = "limited"
+            hash_key = "foo"
+            read = 10
+            write = 4
+            rate_limit = 0.9
+
+        class Schema:
+            foo = String(required=True)
+
+    with pytest.raises(ValueError):
+        Mismatched.Table.rate_limiter.bucket("read")
+
+
+def test_rate_limiter_record(Limited, Limited_limiter):
+    limiter = Limited_limiter
+    table_bucket = limiter.bucket("write")
+    index_bucket = limiter.bucket("write", "by-bar")
+
+    estimated = limiter.acquire("write", "put")
+    assert estimated == 1
+    assert table_bucket.tokens == pytest.approx(1, abs=0.1)
+    assert index_bucket.tokens == pytest.approx(1, abs=0.1)
+
+    limiter.record(
+        "write",
+        "put",
+        estimated,
+        {
+            "TableName": "limited",
+            "CapacityUnits": 4.0,
+            "Table": {"CapacityUnits": 2.0},
+            "GlobalSecondaryIndexes": {"by-bar": {"CapacityUnits": 2.0}},
+        },
+    )
+
+    # our estimate of 1 was refunded and the 2 units consumed were taken, from both the table & the index
+    assert table_bucket.tokens == pytest.approx(0, abs=0.1)
+    assert index_bucket.tokens == pytest.approx(-1, abs=0.1)
+
+    # and our estimate moved towards what we observed
+    assert limiter.estimate("write", "put") == pytest.approx(1.2)
+
+
+def test_rate_limited_requests(Limited, Limited_table):
+    Limited.put({"foo": "one", "bar": "bar"})
+    assert Limited.get(foo="one").bar == "bar"
+    assert len(list(Limited.ByBar.query(bar="bar"))) == 1
+
+    Limited.put_stream({"foo": str(i)} for i in range(5))
+    assert len(list(Limited.scan())) == 6
+
+
+def test_rate_limited_put_batch(Limited, Limited_table, mocker):
+    record = mocker.spy(Limited.Table.rate_limiter, "record")
+    Limited.put_batch({"foo": "one", "bar": "bar"}, {"foo": "two", "bar": "bar"})
+    assert len(list(Limited.scan())) == 2
+
+    # the capacity consumed by the batch corrects the estimates of the rate limiter
+    mode, operation, estimated, consumed = record.call_args_list[0][0][:4]
+    assert (mode, operation) == ("write", "batch_write")
+    assert consumed["TableName"] == "limited"
@@ -0,0 +1,128 @@
+import pytest
+
+from dynamorm import Session
+from dynamorm.batch import BatchWriter
+from dynamorm.session import active_session
+from dynamorm.transactions import Transaction
+
+
+@pytest.fixture
+def count_calls(monkeypatch):
+    def count_calls(obj, name):
+        calls = []
+        original = getattr(obj, name)
+
+        def wrapper(*args, **kwargs):
+            calls.append((args, kwargs))
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(obj, name, wrapper)
+        return calls
+
+    return count_calls
+
+
+def test_identity_map(TestModel, TestModel_entries, dynamo_local, count_calls):
+    gets = count_calls(TestModel.Table, "get")
+
+    with Session() as session:
+        assert active_session() is session
+        one = TestModel.get(foo="first", bar="one")
+        assert TestModel.get(foo="first", bar="one") is one
+        assert session.get(TestModel, foo="first", bar="one") is one
+        assert TestModel.get(foo="first", bar="missing") is None
+        assert TestModel.get(foo="first", bar="missing") is None
+        assert len(gets) == 2
+
+        # query, scan & get_batch results return the instances that are already known
+        results = dict((item.bar, item) for item in TestModel.query(foo="first"))
+        assert results["one"] is one
+        assert next(TestModel.scan(bar="two")) is results["two"]
+
+        batch_gets = count_calls(TestModel.Table, "get_batch_pages")
+        batch = list(
+            TestModel.get_batch(
+                [
+                    {"foo": "first", "bar": "one"},
+                    {"foo": "first", "bar": "three"},
+                    {"foo": "first", "bar": "missing"},
+                ]
+            )
+        )
+        assert batch == [one, results["three"]]
+        assert batch_gets == []
+
+    assert active_session() is None
+    assert TestModel.get(foo="first", bar="one") is not one
+
+
+def test_commit(TestModel, TestModel_entries, dynamo_local, count_calls):
+    with Session() as session:
+        one = TestModel.get(foo="first", bar="one")
+        two = TestModel.get(foo="first", bar="two")
+        TestModel.get(foo="first", bar="three")
+        assert session.dirty == []
+
+        one.baz = "changed"
+        assert session.dirty == [one]
+        session.add(TestModel(foo="second", bar="one", baz="new", count=1))
+        session.delete(two)
+        assert TestModel.get(foo="first", bar="two") is None
+
+        puts = count_calls(TestModel.Table, "put")
+        writes = count_calls(BatchWriter, "_send")
+
+    # all of the writes are sent in a single batch request
+    assert puts == []
+    assert len(writes) == 1
+    assert TestModel.get(foo="first", bar="one").baz == "changed"
+    assert TestModel.get(foo="first", bar="two") is None
+    assert TestModel.get(foo="second", bar="one").baz == "new"
+
+
+def test_commit_transactional(TestModel, TestModel_entries, dynamo_local, count_calls):
+    with Session(transactional=True) as session:
+        one = TestModel.get(foo="first", bar="one")
+        one.count = 1
+        session.delete(TestModel.get(foo="first", bar="two"))
+
+        transactions = count_calls(Transaction, "commit")
+        session.commit()
+        assert len(transactions) == 1
+        assert session.dirty == []
+
+    assert len(transactions) == 1
+    assert TestModel.get(foo="first", bar="one").count == 1
+    assert TestModel.get(foo="first", bar="two") is None
+
+
+def test_direct_writes(TestModel, TestModel_entries, dynamo_local, count_calls):
+    with Session() as session:
+        one = TestModel.get(foo="first", bar="one")
+        one.baz = "saved"
+        one.save()
+        assert session.dirty == []
+
+        new = TestModel(foo="second", bar="one", baz="new", count=1)
+        new.save()
+        assert TestModel.get(foo="second", bar="one") is new
+
+        new.delete()
+        assert TestModel.get(foo="second", bar="one") is None
+
+        writes = count_calls(BatchWriter, "_send")
+
+    assert writes == []
+
+
+def test_rollback(TestModel, TestModel_entries, dynamo_local):
+    with pytest.raises(RuntimeError):
+        with Session() as session:
+            one = TestModel.get(foo="first", bar="one")
+            one.baz = "changed"
+            session.delete(TestModel.get(foo="first", bar="two"))
+            raise RuntimeError("oops")
+
+    assert active_session() is None
+    assert TestModel.get(foo="first", bar="one").baz == "bbq"
+    assert TestModel.get(foo="first", bar="two") is not None
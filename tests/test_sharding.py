@@ -0,0 +1,231 @@
+import os
+import random
+import string
+
+import pytest
+
+from dynamorm import DynaModel, batch_write
+from dynamorm import sharding
+from dynamorm.exceptions import HashKeyExists, InvalidTableAttribute, ItemTooLarge
+
+
+def is_marshmallow():
+    return "marshmallow" in (os.getenv("SERIALIZATION_PKG") or "")
+
+
+def random_text(length, seed=1):
+    rand = random.Random(seed)
+    return "".join(rand.choice(string.ascii_letters) for _ in range(length))
+
+
+@pytest.fixture
+def Document(request, dynamo_local):
+    if is_marshmallow():
+        from marshmallow import fields
+
+        class Document(DynaModel):
+            class Table:
+                name = "sharded_documents"
+                hash_key = "folder"
+                range_key = "name"
+                read = 5
+                write = 5
+                shard_items = True
+                shard_size = 4096
+
+            class Schema:
+                folder = fields.String(required=True)
+                name = fields.String(required=True)
+                title = fields.String()
+                body = fields.String()
+                tags = fields.List(fields.String())
+
+    else:
+        from schematics import types
+
+        class Document(DynaModel):
+            class Table:
+                name = "sharded_documents"
+                hash_key = "folder"
+                range_key = "name"
+                read = 5
+                write = 5
+                shard_items = True
+                shard_size = 4096
+
+            class Schema:
+                folder = types.StringType(required=True)
+                name = types.StringType(required=True)
+                title = types.StringType()
+                body = types.StringType()
+                tags = types.ListType(types.StringType)
+
+    Document.Table.create_table()
+    request.addfinalizer(Document.Table.delete)
+    return Document
+
+
+def raw_rows(Document):
+    return sorted(
+        Document.Table.table.scan(ConsistentRead=True)["Items"],
+        key=lambda row: row["name"],
+    )
+
+
+def test_split_and_join(Document):
+    item = {
+        "folder": "alice",
+        "name": "notes",
+        "title": "Notes",
+        "body": random_text(20000),
+    }
+    main, chunks = sharding.split_item(Document.Table, item, "token")
+
+    assert main == {
+        "folder": "alice",
+        "name": "notes",
+        "title": "Notes",
+        sharding.CHUNKS_ATTRIBUTE: len(chunks),
+        sharding.TOKEN_ATTRIBUTE: "token",
+    }
+    assert len(chunks) > 1
+    assert [chunk["name"] for chunk in chunks] == [
+        sharding.chunk_range_key("notes", i) for i in range(len(chunks))
+    ]
+    assert all(sharding.is_chunk(Document.Table, chunk) for chunk in chunks)
+
+    assert sharding.join_item(main, chunks) == item
+    # chunks from another write of the item don't match
+    assert sharding.join_item(main, chunks[:-1]) is None
+    assert sharding.join_item(dict(main, _dynamorm_token="other"), chunks) is None
+
+
+def test_shard_items_requires_string_range_key(TestModel):
+    from dynamorm.table import DynamoTable3
+
+    class Table(DynamoTable3):
+        name = "nope"
+        hash_key = "foo"
+        read = 1
+        write = 1
+        shard_items = True
+
+    with pytest.raises(InvalidTableAttribute):
+        Table(schema=TestModel.Schema)
+
+
+def test_sharded_items(Document):
+    body = random_text(20000)
+    Document(folder="alice", name="notes", title="Notes", body=body).save()
+    Document(folder="alice", name="notes2", title="Small").save()
+
+    rows = raw_rows(Document)
+    chunks = [row for row in rows if sharding.is_chunk(Document.Table, row)]
+    assert len(chunks) == len(rows) - 2 > 1
+
+    doc = Document.get(folder="alice", name="notes")
+    assert doc.body == body
+    assert doc.title == "Notes"
+    assert Document.get(folder="alice", name="notes2").title == "Small"
+
+    # reads skip the chunk rows and join the sharded items
+    assert [
+        (d.name, getattr(d, "body", None)) for d in Document.query(folder="alice")
+    ] == [
+        ("notes", body),
+        ("notes2", None),
+    ]
+    assert sorted(d.name for d in Document.scan()) == ["notes", "notes2"]
+    assert [
+        d.body for d in Document.get_batch([{"folder": "alice", "name": "notes"}])
+    ] == [body]
+
+    with pytest.raises(HashKeyExists):
+        Document.put_unique({"folder": "alice", "name": "notes", "body": body})
+
+    # writing a smaller sharded item deletes the chunks that are no longer used, and a small one all of them
+    Document(folder="alice", name="notes", body=random_text(8000, seed=2)).save()
+    assert 1 < len(raw_rows(Document)) - 2 < len(chunks)
+    assert Document.get(folder="alice", name="notes").body == random_text(8000, seed=2)
+
+    Document(folder="alice", name="notes", body="short").save()
+    assert len(raw_rows(Document)) == 2
+    assert Document.get(folder="alice", name="notes").body == "short"
+
+    # large items put in a batch are sharded too
+    Document.put_batch({"folder": "alice", "name": "batched", "body": body})
+    assert Document.get(folder="alice", name="batched").body == body
+    Document.get(folder="alice", name="batched").delete()
+
+    # deletes remove the chunk rows as well
+    Document(folder="alice", name="notes", body=body).save()
+    Document.get(folder="alice", name="notes").delete()
+    assert [row["name"] for row in raw_rows(Document)] == ["notes2"]
+
+
+def test_get_does_not_read_siblings(Document, mocker):
+    body = random_text(20000)
+    Document(folder="alice", name="2020", body=body).save()
+    Document(folder="alice", name="2020-01", body=random_text(20000, seed=2)).save()
+    Document(folder="alice", name="2021", title="Small").save()
+
+    call_limited = type(Document.Table).call_limited
+    calls = []
+    read = []
+
+    def record(table, mode, operation, *args, **kwargs):
+        response = call_limited(table, mode, operation, *args, **kwargs)
+        calls.append(operation)
+        read.extend(response.get("Items", []))
+        if "Item" in response:
+            read.append(response["Item"])
+        return response
+
+    mocker.patch.object(type(Document.Table), "call_limited", record)
+
+    assert Document.get(folder="alice", name="2020").body == body
+    assert calls == ["get", "query"]
+    assert not [row for row in read if row["name"].startswith("2020-")]
+
+    # items that were never sharded are read with a single GetItem
+    del calls[:]
+    del read[:]
+    assert Document.get(folder="alice", name="2021").title == "Small"
+    assert calls == ["get"]
+    assert [row["name"] for row in read] == ["2021"]
+
+
+def test_batch_write_sharded_items(Document):
+    body = random_text(20000)
+
+    # a large put replaces the small put of the same key that is still pending
+    with batch_write() as batch:
+        batch.put(Document, {"folder": "alice", "name": "notes", "title": "Small"})
+        batch.put(Document, {"folder": "alice", "name": "notes", "body": body})
+    doc = Document.get(folder="alice", name="notes")
+    assert doc.body == body
+    assert getattr(doc, "title", None) is None
+
+    # as does a pending delete
+    with batch_write() as batch:
+        batch.delete(Document, {"folder": "alice", "name": "notes"})
+        batch.put(
+            Document, {"folder": "alice", "name": "notes", "title": "New", "body": body}
+        )
+    doc = Document.get(folder="alice", name="notes")
+    assert (doc.title, doc.body) == ("New", body)
+    assert len(raw_rows(Document)) > 2
+
+
+def test_sharded_item_size_limit(Document, monkeypatch):
+    monkeypatch.setattr(Document.Table, "item_size_limit", 5000)
+    body = random_text(20000)
+
+    # the limit applies to the rows a sharded item is split into, rather than the whole item
+    Document(folder="alice", name="notes", body=body).save()
+    assert Document.get(folder="alice", name="notes").body == body
+
+    monkeypatch.setattr(Document.Table, "item_size_limit", 1000)
+    with pytest.raises(ItemTooLarge):
+        Document(folder="alice", name="other", body=body).save()
+    assert Document.get(folder="alice", name="other") is None
@@ -1,7 +1,14 @@
+import gc
 import os
 
 from dynamorm.model import DynaModel
-from dynamorm.signals import model_prepared
+from dynamorm.signals import (
+    Signal,
+    model_prepared,
+    pre_init,
+    reset_signal_stats,
+    signal_stats,
+)
 
 if "marshmallow" in (os.getenv("SERIALIZATION_PKG") or ""):
     from marshmallow.fields import String
@@ -30,3 +37,76 @@ def test_model_prepared():
             silly = String(required=True)
 
     assert receiver.calls == [SillyModel]
+
+
+def test_skip_without_receivers():
+    class Sender(object):
+        pass
+
+    class Other(object):
+        pass
+
+    signal = Signal("dynamorm.test")
+
+    def receiver(sender, **kwargs):
+        receiver.calls.append((sender, kwargs))
+
+    receiver.calls = []
+
+    assert signal.send(Sender, value=1) == []
+    assert (signal.stats.sends, signal.stats.skipped) == (1, 1)
+
+    signal.connect(receiver, sender=Sender)
+    assert signal.send(Sender, value=2) == [(receiver, None)]
+    assert signal.send(Other, value=3) == []
+    assert receiver.calls == [(Sender, {"value": 2})]
+    assert (signal.stats.sends, signal.stats.skipped, signal.stats.receivers) == (
+        3,
+        2,
+        1,
+    )
+
+    # receivers connected to any sender are called for every sender
+    signal.connect(receiver)
+    assert signal.send(Other, value=4) == [(receiver, None)]
+
+    signal.disconnect(receiver)
+    assert signal.send(Sender, value=5) == []
+    assert len(receiver.calls) == 2
+
+    # weakly referenced receivers stop being sent to once they're collected
+    calls = []
+
+    def weak_receiver(sender):
+        calls.append(sender)
+
+    signal.connect(weak_receiver, sender=Sender)
+    signal.send(Sender)
+    assert calls == [Sender]
+    del weak_receiver
+    gc.collect()
+    assert signal.send(Sender) == []
+
+    signal.stats.reset()
+    assert signal.stats.sends == 0
+
+
+def test_signal_stats():
+    reset_signal_stats()
+    stats = signal_stats()
+    assert stats["dynamorm.pre_init"] is pre_init.stats
+    assert stats["dynamorm.model_prepared"].sends == 0
+
+    class StatsModel(DynaModel):
+        class Table:
+            name = "stats"
+            hash_key = "foo"
+            read = 1
+            write = 1
+
+        class Schema:
+            foo = String(required=True)
+
+    StatsModel(foo="one")
+    assert stats["dynamorm.model_prepared"].sends == 1
+    assert (pre_init.stats.sends, pre_init.stats.skipped) == (1, 1)
@@ -0,0 +1,194 @@
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from dynamorm import DynaModel
+from dynamorm.exceptions import DynaModelException, ValidationError
+from dynamorm.types import simple
+from dynamorm.types.simple import Field
+
+try:
+    from typing import Optional
+except ImportError:  # pragma: no cover
+    Optional = None
+
+
+def make_model():
+    class Thing(DynaModel):
+        class Table:
+            name = "simple"
+            hash_key = "id"
+            read = 5
+            write = 5
+
+        class Schema:
+            # the annotations are written out so that the tests also run on python 2
+            __annotations__ = {
+                "id": str,
+                "name": Optional[str] if Optional else "Optional[str]",
+                "count": int,
+                "when": datetime.datetime,
+            }
+            count = 0
+            when = None
+            tags = Field(list, default=list)
+            color = Field(
+                str,
+                default="purple",
+                validators=[lambda value: value in ("purple", "orange")],
+            )
+
+    return Thing
+
+
+def test_simple_schema_detected():
+    Thing = make_model()
+    assert issubclass(Thing.Schema, simple.Schema)
+    assert list(Thing.Schema.dynamorm_fields()) == [
+        "id",
+        "name",
+        "count",
+        "when",
+        "tags",
+        "color",
+    ]
+    assert Thing.Schema.dynamorm_field_types() == {
+        "id": "S",
+        "name": "S",
+        "count": "N",
+        "when": "S",
+        "tags": "S",
+        "color": "S",
+    }
+
+
+def test_simple_schema_coercion():
+    Thing = make_model()
+    thing = Thing(id="one", count=Decimal(3), when="2020-01-02T03:04:05")
+
+    assert thing.count == 3 and isinstance(thing.count, int)
+    assert thing.when == datetime.datetime(2020, 1, 2, 3, 4, 5)
+    assert thing.name is None
+    assert thing.tags == []
+    assert thing.color == "purple"
+
+    assert thing.to_dict() == {
+        "id": "one",
+        "name": None,
+        "count": 3,
+        "when": "2020-01-02T03:04:05",
+        "tags": [],
+        "color": "purple",
+    }
+
+
+def test_simple_schema_validation():
+    Thing = make_model()
+    with pytest.raises(ValidationError) as excinfo:
+        Thing(count="nope", color="red")
+
+    assert excinfo.value.errors == {
+        "id": ["This field is required."],
+        "count": ["Not a valid int."],
+        "color": ["Invalid value."],
+    }
+
+    # partial validation doesn't require fields or fill in defaults
+    thing = Thing(partial=True, count=Decimal(1))
+    assert thing.id is None
+    assert thing.color is None
+
+
+def test_simple_schema_types():
+    class Schema(simple.Schema):
+        flag = Field(bool)
+        ratio = Field(float)
+        amount = Field(Decimal)
+        day = Field(datetime.date)
+        key = Field(uuid.UUID)
+
+    key = uuid.uuid4()
+    validated = Schema.dynamorm_validate(
+        {
+            "flag": "true",
+            "ratio": Decimal("0.5"),
+            "amount": 1.5,
+            "day": "2020-01-02",
+            "key": str(key),
+        },
+        native=True,
+    )
+    assert validated == {
+        "flag": True,
+        "ratio": 0.5,
+        "amount": Decimal("1.5"),
+        "day": datetime.date(2020, 1, 2),
+        "key": key,
+    }
+    assert Schema.dynamorm_validate(validated)["key"] == str(key)
+
+    with pytest.raises(ValidationError):
+        Schema.dynamorm_validate({"flag": "maybe"})
+
+    with pytest.raises(DynaModelException):
+
+        class Invalid(simple.Schema):
+            nope = Field(set)
+
+
+def test_simple_schema_records():
+    Thing = make_model()
+    record = Thing.Schema(id="one", count=2)
+
+    assert record.count == 2
+    assert not hasattr(record, "__dict__")
+    assert record == Thing.Schema(id="one", count=Decimal(2))
+    assert record.to_dict(native=True)["color"] == "purple"
+
+    with pytest.raises(AttributeError):
+        record.other = 1
+
+
+def test_simple_schema_dataclass():
+    dataclasses = pytest.importorskip("dataclasses")
+
+    @dataclasses.dataclass
+    class ThingSchema:
+        __annotations__ = {"id": str, "count": int}
+        count = dataclasses.field(
+            default=1, metadata={"validators": [lambda value: value > 0]}
+        )
+
+    class Thing(DynaModel):
+        class Table:
+            name = "simple"
+            hash_key = "id"
+            read = 5
+            write = 5
+
+        Schema = ThingSchema
+
+    assert Thing(id="one").count == 1
+    with pytest.raises(ValidationError):
+        Thing(id="one", count=0)
+    with pytest.raises(ValidationError):
+        Thing(count=2)
+
+
+def test_simple_model_table(dynamo_local, request):
+    Thing = make_model()
+    Thing.Table.create_table()
+    request.addfinalizer(Thing.Table.delete)
+
+    Thing(id="one", count=3, tags=["a"], when=datetime.datetime(2020, 1, 1)).save()
+    Thing.put({"id": "two", "color": "orange"})
+
+    one = Thing.get(id="one")
+    assert one.count == 3 and isinstance(one.count, int)
+    assert one.when == datetime.datetime(2020, 1, 1)
+    assert one.tags == ["a"]
+
+    assert Thing.get(id="two", trusted=True).color == "orange"
+    assert sorted(thing.id for thing in Thing.scan()) == ["one", "two"]
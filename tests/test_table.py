@@ -1,4 +1,5 @@
 """These tests require dynamo local running"""
+
 import datetime
 import dateutil.tz
 import os
@@ -9,6 +10,14 @@ import pytest
 
 from dynamorm import Q
 
+from dynamorm.signals import (
+    post_batch_delete,
+    post_batch_save,
+    post_delete,
+    post_page_load,
+    pre_batch_save,
+    pre_delete,
+)
 from dynamorm.table import DynamoTable3, QueryIterator, ScanIterator
 from dynamorm.exceptions import (
     HashKeyExists,
@@ -81,6 +90,38 @@ def test_put_batch(TestModel, TestModel_table, dynamo_local):
     assert second_one.baz == "bbq" and second_one.count == 456
 
 
+def test_put_stream(TestModel, TestModel_table, dynamo_local):
+    """Streaming items from a generator should work"""
+
+    def items():
+        for i in range(60):
+            yield {"foo": "stream", "bar": str(i), "baz": "baz", "count": i}
+
+    summary = TestModel.put_stream(items())
+    assert summary.written == 60
+    assert summary.failed_validation == 0
+    assert TestModel.get(foo="stream", bar="59").count == 59
+
+
+def test_put_stream_invalid(TestModel, TestModel_table, dynamo_local):
+    """Items that fail validation are skipped and counted"""
+    if is_marshmallow():
+        pytest.skip("Marshmallow does marshalling and not validation when serializing")
+
+    invalid = []
+    summary = TestModel.put_stream(
+        [
+            {"foo": "stream", "bar": "1", "baz": "baz"},
+            {"foo": "stream", "bar": "2"},
+            {"foo": "stream", "bar": "3", "baz": "baz"},
+        ],
+        on_invalid=lambda item, exc: invalid.append(item),
+    )
+    assert summary.written == 2
+    assert summary.failed_validation == 1
+    assert invalid == [{"foo": "stream", "bar": "2"}]
+
+
 def test_get_batch(TestModel, TestModel_entries, dynamo_local):
     items = TestModel.get_batch(
         keys=({"foo": "first", "bar": "one"}, {"foo": "first", "bar": "three"}),
@@ -279,6 +320,22 @@ def test_update_conditions(TestModel, TestModel_entries, dynamo_local):
     update_should_fail_with_condition([Q(count__gt=200), ~Q(count=222)])
 
 
+def test_update_many(TestModel, TestModel_entries, dynamo_local):
+    keys = [{"foo": "first", "bar": bar} for bar in ("one", "two", "three")]
+    failed = TestModel.update_many(
+        keys, conditions=dict(baz="bbq"), baz="archived", count__plus=1, concurrency=2
+    )
+
+    # the key whose condition failed is returned, and doesn't stop the others
+    assert [key for key, _ in failed] == [{"foo": "first", "bar": "two"}]
+    assert all(isinstance(exc, ConditionFailed) for _, exc in failed)
+
+    items = dict((item.bar, item) for item in TestModel.query(foo="first"))
+    assert (items["one"].baz, items["one"].count) == ("archived", 112)
+    assert (items["two"].baz, items["two"].count) == ("wtf", 222)
+    assert (items["three"].baz, items["three"].count) == ("archived", 334)
+
+
 def test_update_validation(TestModel, TestModel_entries, dynamo_local):
     if is_marshmallow():
         pytest.skip("Marshmallow does marshalling and not validation when serializing")
@@ -524,6 +581,131 @@ def test_delete_with_hash(TestModelTwo, TestModelTwo_table, dynamo_local):
     assert result is None
 
 
+def test_delete_batch(TestModel, TestModel_entries, dynamo_local):
+    TestModel.delete_batch(
+        [{"foo": "first", "bar": "one"}, {"foo": "first", "bar": "three"}]
+    )
+
+    results = list(TestModel.query(foo="first"))
+    assert [result.bar for result in results] == ["two"]
+
+
+def test_delete_batch_signals(TestModel, TestModel_entries_xlarge, dynamo_local):
+    """post_delete is sent once each chunk of keys has been deleted, rather than at the end"""
+    received = []
+    pending = []
+
+    def pre_receiver(sender, instance):
+        pending.append(instance.bar)
+
+    def post_receiver(sender, instance):
+        # every key queued so far is either in the current chunk, or has been sent already
+        received.append((sender, instance.bar, len(pending)))
+
+    keys = [{"foo": "first", "bar": str(i)} for i in range(60)]
+    pre_delete.connect(pre_receiver, sender=TestModel)
+    post_delete.connect(post_receiver, sender=TestModel)
+    try:
+        TestModel.delete_batch(keys, concurrency=1, signals=True)
+    finally:
+        pre_delete.disconnect(pre_receiver, sender=TestModel)
+        post_delete.disconnect(post_receiver, sender=TestModel)
+
+    assert [bar for _, bar, _ in received] == [str(i) for i in range(60)]
+    assert all(sender is TestModel for sender, _, _ in received)
+    # with a concurrency of 1 keys are deleted, and signalled, 25 at a time
+    assert [queued for _, _, queued in received[::25]] == [25, 50, 60]
+    assert TestModel.get(foo="first", bar="0") is None
+
+
+def test_batch_signals(TestModel, TestModel_table, dynamo_local):
+    """The batch signals are sent once for each batch, with all of its items or keys"""
+    received = []
+
+    def receiver(name):
+        def receive(sender, **kwargs):
+            received.append((name, sender, kwargs))
+
+        return receive
+
+    receivers = [
+        (signal, receiver(signal.name.split(".")[1]))
+        for signal in (
+            pre_batch_save,
+            post_batch_save,
+            post_batch_delete,
+            post_page_load,
+        )
+    ]
+    for signal, receive in receivers:
+        signal.connect(receive, sender=TestModel)
+    try:
+        items = [
+            {"foo": "batch", "bar": str(i), "baz": "baz", "count": i} for i in range(3)
+        ]
+        TestModel.put_batch(*items)
+        assert [(name, sender) for name, sender, _ in received] == [
+            ("pre_batch_save", TestModel),
+            ("post_batch_save", TestModel),
+        ]
+        assert [item["bar"] for item in received[1][2]["items"]] == ["0", "1", "2"]
+        del received[:]
+
+        keys = [{"foo": "batch", "bar": str(i)} for i in range(3)]
+        assert sorted(item.bar for item in TestModel.get_batch(keys)) == ["0", "1", "2"]
+        assert [name for name, _, _ in received] == ["post_page_load"]
+        assert sorted(item.bar for item in received[0][2]["instances"]) == [
+            "0",
+            "1",
+            "2",
+        ]
+        del received[:]
+
+        results = TestModel.query(foo="batch")
+        assert [item.bar for item in results] == ["0", "1", "2"]
+        assert [name for name, _, _ in received] == ["post_page_load"]
+        assert len(received[0][2]["instances"]) == 3
+        del received[:]
+
+        TestModel.query(foo="batch").delete()
+        # deleting through results only reads the keys, without loading instances
+        assert [name for name, _, _ in received] == ["post_batch_delete"]
+        assert received[0][2]["keys"] == keys
+    finally:
+        for signal, receive in receivers:
+            signal.disconnect(receive, sender=TestModel)
+
+    assert list(TestModel.query(foo="batch")) == []
+
+
+def test_query_delete(TestModel, TestModel_entries, dynamo_local):
+    stats = TestModel.query(foo="first", bar__begins_with="t").delete()
+    assert stats.written == 2
+
+    results = list(TestModel.query(foo="first"))
+    assert [result.bar for result in results] == ["one"]
+
+
+def test_query_delete_partly_consumed(TestModel, TestModel_entries, dynamo_local):
+    """Deleting through an iterator that has been partly read still deletes every matching item"""
+    results = TestModel.query(foo="first").specific_attributes(["baz"])
+    assert next(results).baz == "bbq"
+
+    stats = results.delete()
+    assert stats.written == 3
+    assert list(TestModel.query(foo="first")) == []
+
+    # the iterator itself is untouched
+    assert [result.baz for result in results] == ["bbq", "wtf"]
+
+
+def test_scan_delete(TestModel, TestModel_entries_xlarge, dynamo_local):
+    """Deleting through a scan deletes all pages of matching items"""
+    stats = TestModel.scan().delete()
+    assert stats.written == 4000
+    assert TestModel.scan().count() == 0
+
+
 def test_native_types(TestModel, TestModel_table, dynamo_local):
     DT = datetime.datetime(2017, 7, 28, 16, 18, 15, 48, tzinfo=dateutil.tz.tzutc())
 
@@ -553,6 +735,90 @@ def test_native_types(TestModel, TestModel_table, dynamo_local):
         )
 
 
+def test_trusted_reads(TestModel, TestModel_table, dynamo_local, monkeypatch):
+    DT = datetime.datetime(2017, 7, 28, 16, 18, 15, 48, tzinfo=dateutil.tz.tzutc())
+    item = {
+        "foo": "first",
+        "bar": "one",
+        "baz": "lol",
+        "count": 123,
+        "child": {"sub": 1},
+        "things": ["a", "b"],
+        "when": DT,
+        "created": DT,
+    }
+    TestModel.put(item)
+
+    validated = TestModel.get(foo="first", bar="one")
+    trusted = TestModel.get(foo="first", bar="one", trusted=True)
+    assert trusted.to_dict() == validated.to_dict()
+    assert trusted.count == 123 and isinstance(trusted.count, int)
+    assert trusted.when == DT
+    assert trusted.created == validated.created
+
+    # write an item that does not pass validation, as if it was written by something else
+    TestModel.Table.put({"foo": "first", "bar": "two", "count": Decimal(2)})
+
+    with pytest.raises(ValidationError):
+        TestModel.get(foo="first", bar="two")
+
+    # trusted reads don't validate, missing fields are set to None
+    invalid = TestModel.get(foo="first", bar="two", trusted=True)
+    assert (invalid.count, invalid.baz) == (2, None)
+
+    # but you can still validate on demand
+    with pytest.raises(ValidationError):
+        invalid.validate()
+
+    assert len(list(TestModel.query(foo="first").trusted())) == 2
+    assert len(list(TestModel.scan().trusted())) == 2
+    with pytest.raises(ValidationError):
+        list(TestModel.scan())
+
+    # and reads can be trusted by default
+    monkeypatch.setattr(TestModel.Table, "trusted_reads", True)
+    assert TestModel.get(foo="first", bar="two").count == 2
+    assert len(list(TestModel.scan())) == 2
+    with pytest.raises(ValidationError):
+        list(TestModel.scan().trusted(False))
+
+
+def test_page_validation(TestModel, TestModel_entries, dynamo_local, mocker):
+    # write items that do not pass validation, as if they were written by something else
+    TestModel.Table.put({"foo": "first", "bar": "four", "count": Decimal(4)})
+    TestModel.Table.put({"foo": "first", "bar": "five", "count": "nope"})
+
+    load_many = mocker.spy(TestModel.Schema, "dynamorm_load_many")
+    page = TestModel.new_from_raw_page(TestModel.Table.query(foo="first")["Items"])
+    assert load_many.call_count == 1
+    assert sorted(type(item).__name__ for item in page) == [
+        "TestModel",
+        "TestModel",
+        "TestModel",
+        "ValidationError",
+        "ValidationError",
+    ]
+
+    with pytest.raises(ValidationError):
+        list(TestModel.query(foo="first"))
+
+    assert len(list(TestModel.query(foo="first").on_invalid("skip"))) == 3
+
+    results = TestModel.query(foo="first").on_invalid("collect")
+    assert sorted(item.bar for item in results) == ["one", "three", "two"]
+    assert sorted(error.raw["bar"] for error in results.invalid_items) == [
+        "five",
+        "four",
+    ]
+
+    errors = []
+    assert len(list(TestModel.scan().on_invalid(errors.append))) == 3
+    assert len(errors) == 2
+
+    with pytest.raises(ValueError):
+        TestModel.scan().on_invalid("ignore")
+
+
 def test_indexes_query(TestModel, TestModel_entries, dynamo_local):
     results = list(TestModel.ByBaz.query(baz="bbq"))
     assert len(results) == 2
@@ -0,0 +1,173 @@
+import os
+
+import pytest
+
+from dynamorm import DynaModel, Session
+from dynamorm.tracking import REMOVE, SET, ChangeTracker, TrackedDict, TrackedList
+
+
+def is_marshmallow():
+    return "marshmallow" in (os.getenv("SERIALIZATION_PKG") or "")
+
+
+@pytest.fixture
+def Service(request, dynamo_local):
+    if is_marshmallow():
+        from marshmallow import fields
+
+        class Service(DynaModel):
+            dynamorm_track_changes = True
+
+            class Table:
+                name = "tracked_services"
+                hash_key = "name"
+                read = 5
+                write = 5
+
+            class Schema:
+                name = fields.String(required=True)
+                owner = fields.String()
+                config = fields.Dict()
+                tags = fields.List(fields.String())
+
+    else:
+        from schematics import types
+
+        class Service(DynaModel):
+            dynamorm_track_changes = True
+
+            class Table:
+                name = "tracked_services"
+                hash_key = "name"
+                read = 5
+                write = 5
+
+            class Schema:
+                name = types.StringType(required=True)
+                owner = types.StringType()
+                config = types.DictType(types.BaseType)
+                tags = types.ListType(types.StringType)
+
+    Service.Table.create_table()
+    request.addfinalizer(Service.Table.delete)
+    return Service
+
+
+def test_record():
+    tracker = ChangeTracker()
+    tracker.record(("config", "limits", "cpu"))
+    tracker.record(("config", "debug"), REMOVE)
+    assert list(tracker.changes.items()) == [
+        (("config", "limits", "cpu"), SET),
+        (("config", "debug"), REMOVE),
+    ]
+
+    # changes inside of a path that is set are covered by it
+    tracker.record(("config", "limits"))
+    tracker.record(("config", "limits", "memory"))
+    assert list(tracker.changes.items()) == [
+        (("config", "debug"), REMOVE),
+        (("config", "limits"), SET),
+    ]
+
+    # keys that can't be written as a path set their parent
+    tracker.record(("owner",))
+    tracker.record(("owner", "a__b"), REMOVE)
+    tracker.record(("tags", 0))
+    assert tracker.changes[("owner",)] == SET
+    assert tracker.changes[("tags",)] == SET
+
+    tracker.clear()
+    assert len(tracker) == 0
+
+
+def test_tracked_values(Service):
+    service = Service(
+        name="api", config={"limits": {"cpu": 1}, "ports": [{"port": 80}]}
+    )
+    assert isinstance(service.config, TrackedDict)
+    assert isinstance(service.config["ports"], TrackedList)
+    assert len(service._changes) == 0
+
+    service.config["limits"]["cpu"] = 2
+    service.config["ports"][0]["port"] = 443
+    assert list(service._changes) == [("config", "limits", "cpu"), ("config", "ports")]
+
+    # copies of tracked values are plain values
+    import copy
+
+    assert type(copy.deepcopy(service.config)) is dict
+    assert type(copy.copy(service.config["ports"])) is list
+
+
+def test_partial_save(Service):
+    Service(
+        name="api",
+        owner="ops",
+        config={"limits": {"cpu": 1, "memory": 2}, "debug": True},
+        tags=["a"],
+    ).save()
+
+    service = Service.get(name="api")
+    assert len(service._changes) == 0
+
+    # another writer changes a key that the partial save doesn't touch
+    Service.get(name="api").update(config__limits__memory=4)
+
+    service.config["limits"]["cpu"] = 2
+    del service.config["debug"]
+    service.tags.append("b")
+    assert service._changes.updates(service) == {
+        "config__limits__cpu": 2,
+        "config__debug__remove": True,
+        "tags": ["a", "b"],
+    }
+    service.save(partial=True)
+    assert len(service._changes) == 0
+
+    stored = Service.get(name="api", consistent=True)
+    assert stored.owner == "ops"
+    assert stored.config == {"limits": {"cpu": 2, "memory": 4}}
+    assert stored.tags == ["a", "b"]
+
+    # deleting a field removes it, and setting a field sets the whole value
+    del service.owner
+    service.config = {"limits": {"cpu": 3}}
+    service.save(partial=True)
+    stored = Service.get(name="api", consistent=True)
+    assert getattr(stored, "owner", None) is None
+    assert stored.config == {"limits": {"cpu": 3}}
+
+    # nothing to save when nothing changed
+    assert service.save(partial=True) is None
+
+
+def test_update_remove(Service):
+    service = Service(name="api", owner="ops", config={"a": {"b": 1, "c": 2}})
+    service.save()
+
+    service.update(config__a__b__remove=True)
+    assert service.config == {"a": {"c": 2}}
+    service.update(owner__remove=True)
+    assert getattr(service, "owner", None) is None
+    assert len(service._changes) == 0
+
+    stored = Service.get(name="api", consistent=True)
+    assert stored.config == {"a": {"c": 2}}
+    assert getattr(stored, "owner", None) is None
+
+
+def test_session_updates(Service):
+    """Transactional sessions write the changed paths of tracked instances as updates"""
+    Service(name="api", owner="ops", config={"limits": {"cpu": 1, "memory": 2}}).save()
+
+    with Session(transactional=True):
+        service = Service.get(name="api")
+        service.config["limits"]["cpu"] = 2
+
+        # another writer changes a key that the session doesn't touch
+        Service.update_item(name="api", config__limits__memory=4)
+
+    assert len(service._changes) == 0
+    stored = Service.get(name="api", consistent=True)
+    assert stored.config == {"limits": {"cpu": 2, "memory": 4}}
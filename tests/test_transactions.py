@@ -0,0 +1,142 @@
+"""These tests require dynamo local running"""
+
+import botocore.exceptions
+import pytest
+
+from dynamorm import Q, transact_get, transaction
+from dynamorm.exceptions import (
+    ConditionFailed,
+    TransactionCanceled,
+    TransactionConditionFailed,
+)
+from dynamorm.transactions import TRANSACT_ITEMS_LIMIT, chunk_token
+
+
+def test_transaction(TestModel, TestModel_entries, OtherModel, OtherModel_entries):
+    with transaction() as txn:
+        txn.put(
+            OtherModel,
+            {"name": "apricot", "jars": 1},
+            conditions=dict(name__not_exists=True),
+        )
+        txn.update(
+            TestModel,
+            foo="first",
+            bar="one",
+            conditions=dict(count=111),
+            count__plus=1,
+            baz="txn",
+        )
+        txn.delete(OtherModel, {"name": "grape"})
+        txn.condition_check(
+            TestModel,
+            {"foo": "first", "bar": "two"},
+            conditions=Q(count__gt=200) & Q(baz="wtf"),
+        )
+
+    assert OtherModel.get(name="apricot").jars == 1
+    assert OtherModel.get(name="grape") is None
+
+    one = TestModel.get(foo="first", bar="one")
+    assert (one.count, one.baz) == (112, "txn")
+
+
+def test_transaction_condition_failed(
+    TestModel, TestModel_entries, OtherModel, OtherModel_entries
+):
+    with pytest.raises(TransactionConditionFailed) as excinfo:
+        with transaction() as txn:
+            txn.put(OtherModel, {"name": "apricot"})
+            txn.condition_check(
+                TestModel, {"foo": "first", "bar": "two"}, conditions=dict(count=1)
+            )
+
+    # it is a ConditionFailed, like failed conditions on any other write
+    assert isinstance(excinfo.value, ConditionFailed)
+    assert excinfo.value.failed[0][:2] == (TestModel, "ConditionCheck")
+    assert [reason["Code"] for _, _, reason in excinfo.value.reasons] == [
+        "None",
+        "ConditionalCheckFailed",
+    ]
+
+    # nothing was written
+    assert OtherModel.get(name="apricot") is None
+
+
+def test_transaction_exception_discards(OtherModel, OtherModel_entries):
+    with pytest.raises(RuntimeError):
+        with transaction() as txn:
+            txn.put(OtherModel, {"name": "apricot"})
+            raise RuntimeError("nope")
+
+    assert OtherModel.get(name="apricot") is None
+
+
+def test_transaction_token(OtherModel, mocker):
+    client = mocker.MagicMock()
+    mocker.patch.object(
+        OtherModel.Table.__class__,
+        "resource",
+        new_callable=mocker.PropertyMock,
+        return_value=mocker.MagicMock(meta=mocker.MagicMock(client=client)),
+    )
+
+    with transaction(token="abc", chunked=True) as txn:
+        for i in range(TRANSACT_ITEMS_LIMIT + 1):
+            txn.put(OtherModel, {"name": str(i)})
+
+    tokens = [
+        call[1]["ClientRequestToken"]
+        for call in client.transact_write_items.call_args_list
+    ]
+    assert tokens == ["abc", chunk_token("abc", 1)]
+    assert chunk_token("abc", 1) != "abc"
+
+
+def test_transaction_too_large(OtherModel):
+    with pytest.raises(ValueError):
+        with transaction() as txn:
+            for i in range(TRANSACT_ITEMS_LIMIT + 1):
+                txn.put(OtherModel, {"name": str(i)})
+
+
+def test_transaction_canceled(OtherModel, mocker):
+    """Cancellations that aren't caused by conditions are not ConditionFailed"""
+    client = mocker.MagicMock()
+    client.transact_write_items.side_effect = botocore.exceptions.ClientError(
+        {
+            "Error": {"Code": "TransactionCanceledException", "Message": "nope"},
+            "CancellationReasons": [{"Code": "TransactionConflict"}],
+        },
+        "TransactWriteItems",
+    )
+    mocker.patch.object(
+        OtherModel.Table.__class__,
+        "resource",
+        new_callable=mocker.PropertyMock,
+        return_value=mocker.MagicMock(meta=mocker.MagicMock(client=client)),
+    )
+
+    with pytest.raises(TransactionCanceled) as excinfo:
+        with transaction() as txn:
+            txn.put(OtherModel, {"name": "apricot"})
+
+    assert not isinstance(excinfo.value, ConditionFailed)
+    assert excinfo.value.failed == [
+        (OtherModel, "Put", {"Code": "TransactionConflict"})
+    ]
+
+
+def test_transact_get(TestModel, TestModel_entries, OtherModel, OtherModel_entries):
+    one, grape, missing = transact_get(
+        [
+            (TestModel, {"foo": "first", "bar": "one"}),
+            (OtherModel, {"name": "grape"}),
+            (OtherModel, {"name": "nope"}),
+        ]
+    )
+
+    assert isinstance(one, TestModel)
+    assert one.count == 111
+    assert grape.jars == 3
+    assert missing is None